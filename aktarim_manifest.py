@@ -0,0 +1,129 @@
+import hashlib
+import logging
+import os
+import sqlite3
+
+from is_birimi import baglanti_ac
+
+
+# Ayrıştırma veya düzenleme kuralları değiştiğinde artırılır; eski sürümle
+# aktarılmış dosyalar bir sonraki seçimde yeniden işlenir
+ISLEM_HATTI_SURUMU = 1
+
+
+def dosya_ozeti(file_path):
+    """Dosya içeriğinin SHA-256 özetini döndürür"""
+    ozet = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for blok in iter(lambda: f.read(1024 * 1024), b''):
+            ozet.update(blok)
+    return ozet.hexdigest()
+
+
+def dosya_anahtari(file_path):
+    return os.path.normcase(os.path.abspath(file_path))
+
+
+class AktarimManifest:
+    """
+    İçeri aktarılan PDF'lerin (yol, boyut, mtime, içerik özeti) -> taşınmaz kimlik kayıtları
+
+    Daha önce aktarılmış bir dosya önce yalnızca stat bilgisiyle, o tutmazsa
+    içerik özetiyle tanınır; PDF açılmaz.
+    """
+
+    def __init__(self, db_path="veritabani.db"):
+        self.db_path = db_path
+
+    def ayir(self, dosyalar):
+        """
+        Dosyaları bilinen ve yeni olarak ayırır
+
+        Returns:
+            tuple: ([(dosya, tasinmaz_kimlik)], [yeni dosyalar], {dosya: sha256})
+        """
+        bilinenler = []
+        yeniler = []
+        ozetler = {}
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        try:
+            for file_path in dosyalar:
+                try:
+                    bilgi = os.stat(file_path)
+                except OSError:
+                    # Hata mesajını aktarım aşaması verir
+                    yeniler.append(file_path)
+                    continue
+
+                anahtar = dosya_anahtari(file_path)
+                cursor.execute("""
+                    SELECT tasinmaz_kimlik FROM aktarim_manifest
+                    WHERE dosya_yolu = ? AND boyut = ? AND mtime_ns = ? AND islem_surumu = ?
+                """, (anahtar, bilgi.st_size, bilgi.st_mtime_ns, ISLEM_HATTI_SURUMU))
+                kayit = cursor.fetchone()
+
+                if kayit is None:
+                    # Taşınmış, kopyalanmış veya dokunulmuş dosya: içerikle ara
+                    ozet = dosya_ozeti(file_path)
+                    ozetler[file_path] = ozet
+                    cursor.execute("""
+                        SELECT tasinmaz_kimlik FROM aktarim_manifest
+                        WHERE sha256 = ? AND islem_surumu = ?
+                    """, (ozet, ISLEM_HATTI_SURUMU))
+                    kayit = cursor.fetchone()
+                    if kayit is not None:
+                        cursor.execute("""
+                            UPDATE aktarim_manifest
+                            SET dosya_yolu = ?, boyut = ?, mtime_ns = ?
+                            WHERE sha256 = ?
+                        """, (anahtar, bilgi.st_size, bilgi.st_mtime_ns, ozet))
+
+                if kayit is not None and self.kayitli_mi(cursor, kayit[0]):
+                    bilinenler.append((file_path, kayit[0]))
+                else:
+                    yeniler.append(file_path)
+
+            conn.commit()
+
+        finally:
+            conn.close()
+
+        return bilinenler, yeniler, ozetler
+
+    def kayitli_mi(self, cursor, tasinmaz_kimlik):
+        """Taşınmazın verileri hâlâ veritabanında mı"""
+        cursor.execute("""
+            SELECT 1 FROM tapu_verileri
+            WHERE tasinmaz_kimlik = ?
+            LIMIT 1
+        """, (tasinmaz_kimlik,))
+        return cursor.fetchone() is not None
+
+    def kaydet(self, file_path, tasinmaz_kimlik, ozet=None, is_birimi=None):
+        """
+        Aktarılan (veya zaten kayıtlı bulunan) dosyayı manifeste yazar
+
+        is_birimi verilirse kayıt belgenin verileriyle aynı işlemde yazılır.
+        """
+        try:
+            bilgi = os.stat(file_path)
+            ozet = ozet or dosya_ozeti(file_path)
+
+            conn = baglanti_ac(self.db_path, is_birimi)
+            try:
+                conn.execute("""
+                    INSERT OR REPLACE INTO aktarim_manifest
+                    (sha256, dosya_yolu, boyut, mtime_ns, tasinmaz_kimlik, islem_surumu, aktarim_tarihi)
+                    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """, (ozet, dosya_anahtari(file_path), bilgi.st_size, bilgi.st_mtime_ns,
+                      tasinmaz_kimlik, ISLEM_HATTI_SURUMU))
+                conn.commit()
+            finally:
+                conn.close()
+            return True
+
+        except Exception as e:
+            logging.error(f"Aktarım manifesti kaydetme hatası: {str(e)}")
+            return False
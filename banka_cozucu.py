@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+import tempfile
+from difflib import SequenceMatcher
+
+
+def normalize_et(text):
+    """Metni normalize eder (büyük harfe çevirir ve Türkçe karakterleri sadeleştirir)"""
+    if not text:
+        return ""
+    text = text.upper()
+    text = text.replace('İ', 'I').replace('Ü', 'U').replace('Ö', 'O').replace('Ş', 'S').replace('Ç', 'C').replace('Ğ', 'G')
+    return text
+
+
+def trigramlar(metin):
+    return {metin[i:i + 3] for i in range(len(metin) - 2)}
+
+
+def bankalari_ekle(banks_json_path, yeni_bankalar):
+    """
+    Yeni bankaları dosyadaki kayıtlarla birleştirip atomik olarak yazar
+
+    Okuma-birleştirme-yazma kilitsizdir; aynı dosyaya tek bir yazıcıdan (ör.
+    toplu aktarımın yazıcı iş parçacığı) çağrılmalıdır.
+    """
+    if not yeni_bankalar:
+        return True
+
+    bankalar = {}
+    try:
+        with open(banks_json_path, 'r', encoding='utf-8') as file:
+            mevcut = json.load(file)
+        if isinstance(mevcut, dict):
+            bankalar.update(mevcut)
+    except Exception:
+        pass
+    bankalar.update(yeni_bankalar)
+    return bankalari_yaz(banks_json_path, bankalar)
+
+
+def bankalari_yaz(banks_json_path, bankalar):
+    """Banka bilgilerini geçici dosyaya yazıp yerine taşır"""
+    gecici = None
+    try:
+        dizin = os.path.dirname(os.path.abspath(banks_json_path))
+        fd, gecici = tempfile.mkstemp(dir=dizin, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump(bankalar, file, ensure_ascii=False, indent=4)
+        os.replace(gecici, banks_json_path)
+        return True
+    except Exception as e:
+        logging.error(f"Banka bilgileri kaydetme hatası: {str(e)}")
+        if gecici and os.path.exists(gecici):
+            os.remove(gecici)
+        return False
+
+
+class BankaCozucu:
+    """
+    VKN ve banka adı çözümleyici
+
+    VKN'ler sözlükten, benzer adlar trigram dizinindeki adaylar arasından
+    SequenceMatcher ile bulunur. Sonuçlar ham metin başına saklanır; yeni
+    bankalar yeni_bankalar'da biriktirilip kaydet() ile topluca ve atomik
+    yazılır. Süreç havuzunda çözümleyici dosyaya yazmaz; yeni_bankalar
+    sonuçla birlikte yazıcıya döner ve orada bankalari_ekle ile kaydedilir.
+    """
+
+    # Trigram ön elemesi bu eşik ve üzerinde kayıpsızdır: ortak trigramı
+    # olmayan iki metnin eşleşen blokları en fazla 2 karakterdir ve aralarında
+    # en az bir eşleşmeyen karakter bulunur; bu durumda oran ancak 2 karakterden
+    # kısa metinlerde 0.9'u geçebilir (onlar tam taramayla aranır).
+    TRIGRAM_ESIGI = 0.9
+    ONBELLEK_SINIRI = 50000
+
+    def __init__(self, banks_json_path='banks.json', varsayilan_bankalar=None, esik=0.95):
+        self.banks_json_path = banks_json_path
+        self.esik = esik
+        self.bankalar = {}       # vkn -> banka adı
+        self.adlar = {}          # normalize ad -> banka adı
+        self.ad_listesi = []     # normalize adlar, ekleme sırasıyla
+        self.trigram_dizini = {}  # trigram -> ad_listesi sıraları
+        self.onbellek = {}       # (metin, eşik) -> banka adı veya None
+        self.yeni_bankalar = {}  # kaydedilmemiş vkn -> banka adı
+
+        for vkn, ad in self.yukle(varsayilan_bankalar or {}).items():
+            self.bankalar[vkn] = ad
+            self.ad_ekle(normalize_et(ad), ad, uzerine_yaz=False)
+
+    def yukle(self, varsayilan_bankalar):
+        """JSON dosyasından banka bilgilerini yükler, hata durumunda varsayılan listeyi kullanır"""
+        try:
+            if os.path.exists(self.banks_json_path):
+                with open(self.banks_json_path, 'r', encoding='utf-8') as file:
+                    yuklenen = json.load(file)
+                # Yüklenen verinin geçerli olup olmadığını kontrol et
+                if isinstance(yuklenen, dict) and yuklenen:
+                    return yuklenen
+                raise ValueError("Geçersiz banka verisi formatı")
+
+            # Dosya yoksa varsayılan listeyi kullan ve kaydet
+            self.dosyaya_yaz(varsayilan_bankalar)
+            return dict(varsayilan_bankalar)
+
+        except Exception as e:
+            logging.error(f"Banka bilgileri yüklenirken hata: {str(e)}")
+            logging.info("Varsayılan banka listesi kullanılıyor ve kaydediliyor")
+            self.dosyaya_yaz(varsayilan_bankalar)
+            return dict(varsayilan_bankalar)
+
+    def ad_ekle(self, normalize_ad, ad, uzerine_yaz=True):
+        if normalize_ad in self.adlar:
+            if uzerine_yaz:
+                self.adlar[normalize_ad] = ad
+            return
+
+        self.adlar[normalize_ad] = ad
+        sira = len(self.ad_listesi)
+        self.ad_listesi.append(normalize_ad)
+        for trigram in trigramlar(normalize_ad):
+            self.trigram_dizini.setdefault(trigram, []).append(sira)
+
+    def vkn_bul(self, vkn):
+        return self.bankalar.get(vkn)
+
+    def ekle(self, vkn, ad):
+        """Yeni bankayı bellekte ekler; dosyaya kaydet() ile yazılır"""
+        if not vkn or not ad or vkn in self.bankalar:
+            return False
+
+        self.bankalar[vkn] = ad
+        self.ad_ekle(normalize_et(ad), ad)
+        # Yeni ad önceki sorgular için daha iyi bir eşleşme olabilir
+        self.onbellek.clear()
+        self.yeni_bankalar[vkn] = ad
+        return True
+
+    def adaylar(self, metin, esik):
+        """Benzerliği eşiği geçebilecek adların sıraları (ekleme sırasıyla)"""
+        sorgu = trigramlar(metin)
+        if esik < self.TRIGRAM_ESIGI or not sorgu:
+            return range(len(self.ad_listesi))
+
+        siralar = set()
+        for trigram in sorgu:
+            siralar.update(self.trigram_dizini.get(trigram, ()))
+        return sorted(siralar)
+
+    def benzer_banka(self, metin, esik=None):
+        """Normalize metne oranı eşikten büyük en benzer banka adı; yoksa None"""
+        esik = self.esik if esik is None else esik
+        anahtar = (metin, esik)
+        if anahtar in self.onbellek:
+            return self.onbellek[anahtar]
+
+        metin = normalize_et(metin)
+        en_iyi = None
+        en_iyi_oran = 0
+        for sira in self.adaylar(metin, esik):
+            normalize_ad = self.ad_listesi[sira]
+            eslestirici = SequenceMatcher(None, metin, normalize_ad)
+            # Üst sınırlar eşiği geçemiyorsa tam oranı hesaplama
+            alt_sinir = max(esik, en_iyi_oran)
+            if eslestirici.real_quick_ratio() <= alt_sinir or eslestirici.quick_ratio() <= alt_sinir:
+                continue
+            oran = eslestirici.ratio()
+            if oran > esik and oran > en_iyi_oran:
+                en_iyi_oran = oran
+                en_iyi = self.adlar[normalize_ad]
+
+        if len(self.onbellek) >= self.ONBELLEK_SINIRI:
+            self.onbellek.clear()
+        self.onbellek[anahtar] = en_iyi
+        return en_iyi
+
+    def kaydet(self):
+        """Eklenen bankaları dosyaya yazar; dosyadaki diğer kayıtlar korunur"""
+        if not bankalari_ekle(self.banks_json_path, self.yeni_bankalar):
+            return False
+        self.yeni_bankalar = {}
+        return True
+
+    def dosyaya_yaz(self, bankalar):
+        return bankalari_yaz(self.banks_json_path, bankalar)
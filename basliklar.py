@@ -1,9 +1,18 @@
-import fitz  # PyMuPDF kütüphanesi
 import re
-import json
 from typing import Dict, Any
 import logging
 import sqlite3
+from takbis_belge import TakbisBelgesi
+from veritabani_sema import sema_guncelle
+from toplu_yazici import TopluYazici
+from filigran import FILIGRAN_METNI_DESENI
+
+
+BASLIK_EKLE_SQL = """
+    INSERT INTO baslik_bilgileri 
+    (tasinmaz_kimlik, baslik, sayfa_no, y_koordinat, auto_detected)
+    VALUES (?, ?, ?, ?, ?)
+"""
 
 class FitzTapuAnalyzer:
     def __init__(self, db_path=None, tasinmaz_kimlik=None):
@@ -11,8 +20,9 @@ class FitzTapuAnalyzer:
         self.db_path = db_path or 'veritabani.db'
         self.tasinmaz_kimlik = tasinmaz_kimlik
         
-        # Başlık tablosunu oluştur
-        self.create_baslik_table()
+        # Başlık tablosunu oluştur (başlıklar yalnızca taşınmaz kimliği varsa kaydedilir)
+        if self.tasinmaz_kimlik:
+            self.create_baslik_table()
         
         # Tapu belgesinde arayacağımız başlıklar
         self.header_order = [
@@ -26,33 +36,12 @@ class FitzTapuAnalyzer:
             "TAŞINMAZA AİT ŞERH BEYAN İRTİFAK BİLGİLERİ"
         ]
         self.found_headers = {}  # Bulunan başlıkların bilgilerini tutacak
+        self.baslik_kayitlari = []  # Kaydedilecek (başlık, sayfa, y) bilgileri
         self.header_characteristics = None  # Başlık karakteristiklerini tutacak
 
     def create_baslik_table(self):
         """Başlık bilgileri için tablo oluştur"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-        
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS baslik_bilgileri (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    tasinmaz_kimlik TEXT,
-                    baslik TEXT,
-                    sayfa_no INTEGER,
-                    y_koordinat REAL,
-                    auto_detected BOOLEAN DEFAULT FALSE,
-                    tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-        
-            conn.commit()
-        
-        except Exception as e:
-            logging.error(f"Başlık tablosu oluşturma hatası: {str(e)}")
-        finally:
-            if conn:
-                conn.close()
+        sema_guncelle(self.db_path)
 
     def save_header_to_db(self, header, page_num, y_coord, auto_detected=False):
         """Başlık bilgilerini veritabanına kaydet"""
@@ -60,11 +49,7 @@ class FitzTapuAnalyzer:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
         
-            cursor.execute("""
-                INSERT INTO baslik_bilgileri 
-                (tasinmaz_kimlik, baslik, sayfa_no, y_koordinat, auto_detected)
-                VALUES (?, ?, ?, ?, ?)
-            """, (self.tasinmaz_kimlik, header, page_num, y_coord, auto_detected))
+            cursor.execute(BASLIK_EKLE_SQL, self.baslik_satiri(header, page_num, y_coord, auto_detected))
         
             conn.commit()
             return True
@@ -76,9 +61,37 @@ class FitzTapuAnalyzer:
             if conn:
                 conn.close()
 
+    def baslik_satiri(self, header, page_num, y_coord, auto_detected=False):
+        """baslik_bilgileri tablosuna yazılacak satırı oluşturur"""
+        return (self.tasinmaz_kimlik, header, page_num, y_coord, auto_detected)
+
+    def basliklari_kaydet(self, kayitlar=None, yazici=None):
+        """
+        Bulunan (veya verilen) başlık kayıtlarını veritabanına yazar
+
+        yazici verilirse satırlar yalnızca onun tamponuna eklenir; yazma işlemi
+        yazıcının sahibine kalır.
+        """
+        if kayitlar is None:
+            kayitlar = self.baslik_kayitlari
+        satirlar = [self.baslik_satiri(header, page_num, y_coord) for header, page_num, y_coord in kayitlar]
+
+        if yazici is not None:
+            yazici.ekle_hepsi(BASLIK_EKLE_SQL, satirlar)
+            return True
+
+        try:
+            yazici = TopluYazici(self.db_path)
+            yazici.ekle_hepsi(BASLIK_EKLE_SQL, satirlar)
+            yazici.bosalt()
+            return True
+        except Exception as e:
+            logging.error(f"Başlık kaydetme hatası: {str(e)}")
+            return False
+
     def clean_text(self, text: str) -> str:
         """Metindeki gereksiz karakterleri temizler"""
-        text = re.sub(r'BİLGİ AMAÇLIDIR', '', text, flags=re.IGNORECASE)
+        text = FILIGRAN_METNI_DESENI.sub('', text)
         text = re.sub(r'\s{2,}', ' ', text)  # Çoklu boşlukları temizle
         text = text.replace('- ', '')  # Kesme işaretli kelimeleri birleştir
         return text.strip()
@@ -148,90 +161,80 @@ class FitzTapuAnalyzer:
             not pattern_matches
         ])
 
-    def analyze_pdf(self, pdf_path: str) -> Dict[str, Any]:
+    def analyze_pdf(self, pdf_path: str, belge=None) -> Dict[str, Any]:
         """PDF'i analiz eder ve başlıkları bulur"""
+        kendi_belgesi = belge is None
         try:
             logging.basicConfig(level=logging.INFO)
 
-            doc = fitz.open(pdf_path)
+            if kendi_belgesi:
+                belge = TakbisBelgesi(pdf_path)
         
             # Önce bilinen başlıkları bul
-            for page_num, page in enumerate(doc, 1):
-                blocks = page.get_text("dict")["blocks"]
-            
-                for block in blocks:
-                    if "lines" not in block:
+            for page_num, sayfa in enumerate(belge.sayfalar, 1):
+                for span in sayfa.fitz_spanlari():
+                    text = span["text"].strip()
+                    if not text:
                         continue
                 
-                    for line in block["lines"]:
-                        for span in line["spans"]:
-                            text = span["text"].strip()
-                            if not text:
-                                continue
+                    clean_text = self.clean_text(text)
+                
+                    # Bilinen başlıkları kontrol et
+                    for header in self.header_order:
+                        if header in clean_text:
+                            y_coord = span["origin"][1]  # Y koordinatını al
                         
-                            clean_text = self.clean_text(text)
+                            # Başlık bilgilerini kayıt listesine ekle
+                            self.baslik_kayitlari.append((header, page_num, y_coord))
                         
-                            # Bilinen başlıkları kontrol et
-                            for header in self.header_order:
-                                if header in clean_text:
-                                    y_coord = span["origin"][1]  # Y koordinatını al
-                                
-                                    # Başlık bilgilerini veritabanına kaydet
-                                    if self.tasinmaz_kimlik:
-                                        self.save_header_to_db(header, page_num, y_coord)
-                                
-                                    self.found_headers[header] = {
-                                        'page': page_num,
-                                        'text': clean_text,
-                                        'position': {
-                                            'x': span["origin"][0],
-                                            'y': y_coord
-                                        },
-                                        'font': span["font"],
-                                        'font_size': span["size"]
-                                    }
+                            self.found_headers[header] = {
+                                'page': page_num,
+                                'text': clean_text,
+                                'position': {
+                                    'x': span["origin"][0],
+                                    'y': y_coord
+                                },
+                                'font': span["font"],
+                                'font_size': span["size"]
+                            }
 
             # Başlık karakteristiklerini öğren
             self.header_characteristics = self.detect_header_characteristics()
 
-            # Benzer formatta olan yeni başlıkları bul
+            # Benzer formatta olan yeni başlıkları bul (span'ler ilk geçişten hazır)
             if self.header_characteristics:
-                for page_num, page in enumerate(doc, 1):
-                    blocks = page.get_text("dict")["blocks"]
-                
-                    for block in blocks:
-                        if "lines" not in block:
+                for page_num, sayfa in enumerate(belge.sayfalar, 1):
+                    for span in sayfa.fitz_spanlari():
+                        text = span["text"].strip()
+                        if not text:
                             continue
                     
-                        for line in block["lines"]:
-                            for span in line["spans"]:
-                                text = span["text"].strip()
-                                if not text:
-                                    continue
-                            
-                                clean_text = self.clean_text(text)
-                            
-                                # Eğer bu metin zaten bilinen bir başlık değilse ve başlık formatına uyuyorsa
-                                if (clean_text not in self.found_headers and                 
-                                    self.is_potential_header(clean_text, span["font"], span["size"], span["origin"][0])):
-                                
-                                    y_coord = span["origin"][1]  # Y koordinatını al
-                                
-                                    # Otomatik tespit edilen başlığı veritabanına kaydet
-                                    if self.tasinmaz_kimlik:
-                                        self.save_header_to_db(clean_text, page_num, y_coord)
-                                
-                                    self.found_headers[clean_text] = {
-                                        'page': page_num,
-                                        'text': clean_text,
-                                        'position': {
-                                            'x': span["origin"][0],
-                                            'y': y_coord
-                                        },
-                                        'font': span["font"],
-                                        'font_size': span["size"],
-                                        'auto_detected': True  # Otomatik tespit edildiğini belirt
-                                    }
+                        clean_text = self.clean_text(text)
+                    
+                        # Eğer bu metin zaten bilinen bir başlık değilse ve başlık formatına uyuyorsa
+                        if (clean_text not in self.found_headers and                 
+                            self.is_potential_header(clean_text, span["font"], span["size"], span["origin"][0])):
+                        
+                            y_coord = span["origin"][1]  # Y koordinatını al
+                        
+                            # Otomatik tespit edilen başlığı kayıt listesine ekle
+                            self.baslik_kayitlari.append((clean_text, page_num, y_coord))
+                        
+                            self.found_headers[clean_text] = {
+                                'page': page_num,
+                                'text': clean_text,
+                                'position': {
+                                    'x': span["origin"][0],
+                                    'y': y_coord
+                                },
+                                'font': span["font"],
+                                'font_size': span["size"],
+                                'auto_detected': True  # Otomatik tespit edildiğini belirt
+                            }
+
+            # Başlık bilgilerini veritabanına kaydet
+            if self.tasinmaz_kimlik:
+                self.basliklari_kaydet()
 
             logging.info("\nBulunan Başlıklar:")
             for header, info in self.found_headers.items():
@@ -259,5 +262,5 @@ class FitzTapuAnalyzer:
                 'message': f'Hata oluştu: {str(e)}'
             }
         finally:
-            if 'doc' in locals():
-                doc.close()
+            if kendi_belgesi and belge is not None:
+                belge.close()
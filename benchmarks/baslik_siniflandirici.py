@@ -0,0 +1,157 @@
+"""
+Başlık sınıflandırıcı karşılaştırması
+
+Derlenmiş BaslikSiniflandirici ile eski is_header algoritmasını aynı satırlar
+üzerinde çalıştırır, sonuçların birebir aynı olduğunu doğrular ve süreleri yazar.
+
+Kullanım:
+    python benchmarks/baslik_siniflandirici.py [satır_sayısı] [veritabani.db]
+
+Veritabanı verilirse tapu_verileri satırları, verilmezse üretilmiş satırlar kullanılır.
+"""
+import os
+import random
+import sqlite3
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from takbisduzenle import BASLIK_TIPLERI, SAYFA_BIR_BASLIKLARI, IPOTEK_YAZIMLARI, BaslikSiniflandirici
+
+
+def similar(a, b):
+    return SequenceMatcher(None, str(a).lower(), str(b).lower()).ratio()
+
+
+def eski_is_header(row):
+    """Önceki TapuProcessor.is_header algoritması (referans)"""
+    first_cell = str(row.get('hucreno_1', '')).strip().lower()
+    if first_cell and any(variant.lower() == first_cell for variant in IPOTEK_YAZIMLARI):
+        other_cells_empty = all(
+            not str(row.get(f'hucreno_{i}', '')).strip()
+            for i in range(2, 9)
+        )
+        if other_cells_empty:
+            return True
+
+    if not any(str(value).strip() for value in row.values() if value is not None):
+        return False
+
+    first_cell = str(row.get('hucreno_1', '')).strip()
+    for header in SAYFA_BIR_BASLIKLARI:
+        if similar(first_cell, header) > 0.8:
+            return True
+
+    for header_type, patterns in BASLIK_TIPLERI.items():
+        matches = 0
+        for column, expected_values in patterns.items():
+            if column not in row:
+                continue
+            cell_value = str(row[column]).strip().lower()
+            if not cell_value:
+                continue
+            for expected in expected_values:
+                if similar(cell_value, expected.lower()) > 0.8:
+                    matches += 1
+                    break
+        if matches >= 2:
+            return True
+
+    return False
+
+
+def bozulmus(metin, rastgele):
+    """Metinde küçük yazım/OCR hataları üretir"""
+    metin = list(metin)
+    for _ in range(rastgele.randint(0, 2)):
+        if not metin:
+            break
+        i = rastgele.randrange(len(metin))
+        islem = rastgele.random()
+        if islem < 0.4:
+            metin[i] = rastgele.choice('abcçdeıiİoöuüsşlmnr .-/')
+        elif islem < 0.7:
+            del metin[i]
+        else:
+            metin.insert(i, rastgele.choice('abc '))
+    metin = ''.join(metin)
+    return metin.upper() if rastgele.random() < 0.2 else metin
+
+
+def satir_uret(sayi, tohum=1):
+    rastgele = random.Random(tohum)
+    basliklar = [kalip for kalip in BASLIK_TIPLERI.values()]
+    veriler = [
+        'Ahmet YILMAZ', 'AYŞE KAYA (SN:12345678)', '1/4', '125000,00 TL', 'Ankara',
+        'Çankaya Tapu Müdürlüğü - 12-03-2015 10:22 - 4455', 'Konut', '', ' ', None,
+        'TÜRKİYE İŞ BANKASI A.Ş.', 'Yıllık %12', '1. Derece', 'Süresiz',
+    ]
+    satirlar = []
+    for rowid in range(1, sayi + 1):
+        row = {'rowid': rowid, 'sayfano': rastgele.randint(1, 9), 'satirno': rastgele.randint(1, 40)}
+        secim = rastgele.random()
+        for i in range(1, 12):
+            row[f'hucreno_{i}'] = rastgele.choice(veriler)
+        if secim < 0.1:
+            row['hucreno_1'] = bozulmus(rastgele.choice(SAYFA_BIR_BASLIKLARI), rastgele)
+        elif secim < 0.3:
+            kalip = rastgele.choice(basliklar)
+            for column, expected_values in kalip.items():
+                if rastgele.random() < 0.7:
+                    row[column] = bozulmus(rastgele.choice(expected_values), rastgele)
+        elif secim < 0.35:
+            row['hucreno_1'] = rastgele.choice(IPOTEK_YAZIMLARI)
+            for i in range(2, 9):
+                row[f'hucreno_{i}'] = rastgele.choice(['', ' ', None, 'x'])
+        row['baslikontrol'] = 'HAYIR'
+        satirlar.append(row)
+    return satirlar
+
+
+def veritabani_satirlari(db_path, sayi):
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.execute(f"SELECT rowid, * FROM tapu_verileri LIMIT {int(sayi)}")
+        columns = [description[0] for description in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def main():
+    sayi = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    satirlar = veritabani_satirlari(sys.argv[2], sayi) if len(sys.argv) > 2 else satir_uret(sayi)
+
+    baslangic = time.perf_counter()
+    eski = [eski_is_header(row) for row in satirlar]
+    eski_sure = time.perf_counter() - baslangic
+
+    baslangic = time.perf_counter()
+    siniflandirici = BaslikSiniflandirici()
+    derleme_sure = time.perf_counter() - baslangic
+
+    baslangic = time.perf_counter()
+    yeni = [siniflandirici.baslik_mi(row) for row in satirlar]
+    yeni_sure = time.perf_counter() - baslangic
+
+    farklar = [row['rowid'] for row, a, b in zip(satirlar, eski, yeni) if a != b]
+
+    print(f"Satır sayısı      : {len(satirlar)}")
+    print(f"Başlık sayısı     : {sum(eski)}")
+    print(f"Eski is_header    : {eski_sure * 1000:.1f} ms")
+    print(f"Derleme           : {derleme_sure * 1000:.1f} ms")
+    print(f"Sınıflandırıcı    : {yeni_sure * 1000:.1f} ms")
+    if yeni_sure:
+        print(f"Hızlanma          : {eski_sure / yeni_sure:.1f}x")
+
+    if farklar:
+        print(f"UYUMSUZ SONUÇ ({len(farklar)} satır), ilk rowid'ler: {farklar[:10]}")
+        return 1
+    print("Sonuçlar birebir aynı")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Filigran temizleme karşılaştırması
+
+filigran modülündeki ortak işlevleri modüllerdeki eski karakter/kelime
+döngüleriyle aynı hücreler üzerinde çalıştırır, sonuçların birebir aynı
+olduğunu doğrular ve süreleri yazar.
+
+Kullanım:
+    python benchmarks/filigran.py [hücre_sayısı]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filigran import (
+    filigran_harfi_mi, filigran_harflerini_ayikla, filigran_temizle_hepsi,
+    rakam_arasi_filigran_temizle
+)
+
+FILIGRAN_HARFLER = ["B", "İ", "L", "G", "İ", "A", "M", "A", "Ç", "L", "I", "D", "R"]
+
+
+def eski_analyze_and_clean_filigran(text):
+    """Önceki TableAnalyzer.analyze_and_clean_filigran (referans)"""
+    if not text:
+        return ""
+    for kelime in ["BİLGİ AMAÇLIDIR", "BİLGİ  AMAÇLIDIR", "BİLGİAMAÇLIDIR"]:
+        text = text.replace(kelime, '')
+    cleaned_words = []
+    for word in text.split():
+        if word not in FILIGRAN_HARFLER and not (len(word) == 1 and word.upper() in FILIGRAN_HARFLER):
+            cleaned_words.append(word)
+    return re.sub(r'\s+', ' ', ' '.join(cleaned_words)).strip()
+
+
+def eski_clean_filigran(text):
+    """Önceki TableAnalyzer.clean_filigran (referans)"""
+    if not text:
+        return ""
+    cleaned_text = ""
+    for word in text.split():
+        if word not in FILIGRAN_HARFLER:
+            cleaned_text += word + " "
+    return " ".join(cleaned_text.split())
+
+
+def eski_temizle_filigran(text):
+    """Önceki TesisProcessor.yevmiye_guncelle içindeki temizle_filigran (referans)"""
+    if not text:
+        return ""
+    temiz_metin = ""
+    i = 0
+    while i < len(text):
+        if (i > 0 and i < len(text) - 1 and
+                text[i] in FILIGRAN_HARFLER and
+                (text[i-1].isdigit() or text[i-1] in ':./-') and
+                (text[i+1].isdigit() or text[i+1] in ':./-')):
+            i += 1
+        else:
+            temiz_metin += text[i]
+            i += 1
+    for kelime in ["BİLGİ", "AMAÇLIDIR", "BİLGİ AMAÇLIDIR"]:
+        temiz_metin = temiz_metin.replace(kelime, "")
+    return temiz_metin.strip()
+
+
+def eski_is_filigran_harf(text):
+    """Önceki IpotekKoordinatExtractor.is_filigran_harf (referans)"""
+    text = text.strip().upper()
+    return len(text) == 1 and (text in set("BİLGİ AMAÇLIDIR") or text in set(FILIGRAN_HARFLER))
+
+
+def hucre_uret(sayi, tohum=1):
+    rastgele = random.Random(tohum)
+    parcalar = [
+        'Ahmet', 'YILMAZ', 'AYŞE', 'Konut', '1/4', '12-03-2015', '10:22', '4455', 'TL',
+        'B', 'İ', 'L', 'G', 'A', 'M', 'Ç', 'I', 'D', 'R', 'a', 'ı', 'i', 'ç', 'x',
+        'BİLGİ AMAÇLIDIR', 'BİLGİ  AMAÇLIDIR', 'BİLGİAMAÇLIDIR', '12B.03L.2015', '10İ:22',
+    ]
+    hucreler = []
+    for _ in range(sayi):
+        hucre = ' '.join(rastgele.choice(parcalar) for _ in range(rastgele.randint(0, 10)))
+        if rastgele.random() < 0.3:
+            hucre = hucre.replace(' ', rastgele.choice(['', '  ', '\n']))
+        hucreler.append(hucre)
+    return hucreler
+
+
+def olc(ad, islev, hucreler):
+    baslangic = time.perf_counter()
+    sonuc = islev(hucreler)
+    return ad, time.perf_counter() - baslangic, sonuc
+
+
+def main():
+    sayi = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    hucreler = hucre_uret(sayi)
+
+    karsilastirmalar = [
+        ('analyze_and_clean_filigran',
+         lambda h: [eski_analyze_and_clean_filigran(x) for x in h],
+         lambda h: filigran_temizle_hepsi(h)),
+        ('clean_filigran',
+         lambda h: [eski_clean_filigran(x) for x in h],
+         lambda h: [filigran_harflerini_ayikla(x) for x in h]),
+        ('temizle_filigran (yevmiye)',
+         lambda h: [eski_temizle_filigran(x) for x in h],
+         lambda h: [rakam_arasi_filigran_temizle(x) for x in h]),
+        ('is_filigran_harf',
+         lambda h: [[eski_is_filigran_harf(k) for k in x.split()] for x in h],
+         lambda h: [[filigran_harfi_mi(k) for k in x.split()] for x in h]),
+    ]
+
+    uyumsuz = 0
+    print(f"Hücre sayısı: {len(hucreler)}")
+    for ad, eski, yeni in karsilastirmalar:
+        _, eski_sure, eski_sonuc = olc(ad, eski, hucreler)
+        _, yeni_sure, yeni_sonuc = olc(ad, yeni, hucreler)
+        farklar = sum(1 for a, b in zip(eski_sonuc, yeni_sonuc) if a != b)
+        uyumsuz += farklar
+        hizlanma = f"{eski_sure / yeni_sure:.1f}x" if yeni_sure else "-"
+        durum = "aynı" if not farklar else f"UYUMSUZ ({farklar})"
+        print(f"{ad:<28} eski {eski_sure * 1000:8.1f} ms  yeni {yeni_sure * 1000:8.1f} ms  {hizlanma:>6}  {durum}")
+
+    return 1 if uyumsuz else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
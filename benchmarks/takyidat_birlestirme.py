@@ -0,0 +1,174 @@
+"""
+Takyidat birleştirme karşılaştırması
+
+CokluInceleme.merge_takyidats'ı önceki tam taramalı algoritmayla aynı
+taşınmazlar üzerinde çalıştırır, birleştirme sonucunun (anahtarlar, sıraları
+ve kayıtlar) birebir aynı olduğunu doğrular ve süreleri yazar.
+
+Kullanım:
+    python benchmarks/takyidat_birlestirme.py [bağımsız_bölüm_sayısı]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from takbisler_inceleme import CokluInceleme
+
+
+def eski_merge_takyidats(inceleme, properties):
+    """Önceki CokluInceleme.merge_takyidats (referans)"""
+    merged = {}
+    is_bagimsiz_bolum = properties[0]['Taşınmaz Bölümü'].get('bb_nitelik') and properties[0]['Taşınmaz Bölümü'].get('blok_kat_girisi_bbno')
+
+    for prop in properties:
+        bb_no = inceleme.get_bb_no(prop) if is_bagimsiz_bolum else None
+        ada_parsel = prop['Taşınmaz Bölümü']['ada_parsel']
+
+        for takyidat in prop['Şerh Beyan İrtifak Bölümü']:
+            if (takyidat['takyidat_baslik'] == 'MÜLKİYETE AİT REHİN BİLGİLERİ' and
+                    not takyidat['hucreno_2'].strip()):
+                continue
+
+            takyidat_baslik = takyidat['takyidat_baslik']
+            yevmiye = takyidat['takyidat_1']
+            tarih = takyidat['takyidat_2']
+            lokasyon = takyidat['takyidat_3']
+            content = takyidat['hucreno_2']
+
+            if takyidat_baslik in inceleme.OZEL_BASLIKLAR:
+                unique_key = f"{bb_no if bb_no else ada_parsel}_{content}"
+                if takyidat_baslik not in merged:
+                    merged[takyidat_baslik] = {}
+                merged[takyidat_baslik][unique_key] = {
+                    'content': takyidat,
+                    'bb_numbers': {bb_no} if bb_no else None,
+                    'ada_parseller': {ada_parsel} if not bb_no else None,
+                    'yevmiye': yevmiye,
+                    'tarih': tarih,
+                    'lokasyon': lokasyon
+                }
+                continue
+
+            simplified_content = content.lower().replace(" ", "")[:100]
+            key = f"{simplified_content}_{tarih}_{lokasyon}"
+
+            if takyidat_baslik not in merged:
+                merged[takyidat_baslik] = {}
+
+            matching_key = None
+            for existing_key in merged[takyidat_baslik].keys():
+                existing_data = merged[takyidat_baslik][existing_key]
+                existing_simplified = existing_data['content']['hucreno_2'].lower().replace(" ", "")[:100]
+                try:
+                    similarity = sum(a == b for a, b in zip(simplified_content, existing_simplified)) / max(len(simplified_content), len(existing_simplified))
+                except ZeroDivisionError:
+                    similarity = 0
+                if similarity > 0.90 and tarih == existing_data['tarih'] and lokasyon == existing_data['lokasyon']:
+                    matching_key = existing_key
+                    break
+
+            if matching_key:
+                key = matching_key
+            else:
+                merged[takyidat_baslik][key] = {
+                    'content': takyidat,
+                    'bb_numbers': set() if is_bagimsiz_bolum else None,
+                    'ada_parseller': set() if not is_bagimsiz_bolum else None,
+                    'yevmiye': yevmiye,
+                    'tarih': tarih,
+                    'lokasyon': lokasyon
+                }
+
+            if is_bagimsiz_bolum and bb_no:
+                merged[takyidat_baslik][key]['bb_numbers'].add(bb_no)
+            elif not is_bagimsiz_bolum:
+                merged[takyidat_baslik][key]['ada_parseller'].add(ada_parsel)
+
+    return merged
+
+
+def bozulmus(metin, rastgele):
+    """Metnin birkaç karakterini değiştirir, siler veya ekler"""
+    harfler = list(metin)
+    for _ in range(rastgele.randint(0, 12)):
+        islem = rastgele.random()
+        sira = rastgele.randrange(len(harfler) + 1)
+        if islem < 0.6 and sira < len(harfler):
+            harfler[sira] = rastgele.choice('abcçdeğı_ 0123')
+        elif islem < 0.8 and sira < len(harfler):
+            del harfler[sira]
+        else:
+            harfler.insert(sira, rastgele.choice('xyz'))
+    return ''.join(harfler)
+
+
+def tasinmazlar_uret(sayi, tohum=1):
+    rastgele = random.Random(tohum)
+    sablonlar = [
+        "Kat Mülkiyeti Kanununa Göre Yönetim Planı",
+        "İpotek Lehine Banka A.Ş. Adına 1. Derece",
+        "Belediye Lehine Yol Terki Şerhi",
+        "Haciz: Vergi Dairesi Müdürlüğü'nün Borç Yazısı ile",
+        "Ab", "", "Kira Şerhi _ 3 yıl",
+    ]
+    sablonlar += [f"Tedbir Şerhi Dosya {i} / Mahkeme Kararı ile" for i in range(40)]
+    basliklar = [
+        'TAŞINMAZA AİT ŞERH BEYAN İRTİFAK BİLGİLERİ',
+        'MÜLKİYETE AİT ŞERH BEYAN İRTİFAK BİLGİLERİ',
+        'MÜLKİYETE AİT REHİN BİLGİLERİ',
+        'EKLENTİ BİLGİLERİ',
+    ]
+    tarihler = ['01-02-2010', '05-06-2015', '_', None]
+    lokasyonlar = ['Ankara', 'Çankaya_', '']
+
+    properties = []
+    for bb in range(1, sayi + 1):
+        takyidatlar = []
+        for _ in range(rastgele.randint(3, 12)):
+            takyidatlar.append({
+                'takyidat_baslik': rastgele.choice(basliklar),
+                'hucreno_2': bozulmus(rastgele.choice(sablonlar), rastgele),
+                'takyidat_1': str(rastgele.randint(1, 9999)),
+                'takyidat_2': rastgele.choice(tarihler),
+                'takyidat_3': rastgele.choice(lokasyonlar),
+            })
+        properties.append({
+            'Taşınmaz Bölümü': {
+                'bb_nitelik': 'Mesken',
+                'blok_kat_girisi_bbno': f"A/1/{bb}",
+                'ada_parsel': '101/5',
+            },
+            'Şerh Beyan İrtifak Bölümü': takyidatlar,
+        })
+    return properties
+
+
+def main():
+    sayi = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    inceleme = CokluInceleme()
+    properties = tasinmazlar_uret(sayi)
+
+    baslangic = time.perf_counter()
+    eski = eski_merge_takyidats(inceleme, properties)
+    eski_sure = time.perf_counter() - baslangic
+
+    baslangic = time.perf_counter()
+    yeni = inceleme.merge_takyidats(properties)
+    yeni_sure = time.perf_counter() - baslangic
+
+    ayni = (
+        list(eski) == list(yeni)
+        and all(list(eski[baslik].items()) == list(yeni[baslik].items()) for baslik in eski)
+    )
+    kayit_sayisi = sum(len(kayitlar) for kayitlar in yeni.values())
+    print(f"Bağımsız bölüm: {sayi}, birleşmiş kayıt: {kayit_sayisi}")
+    print(f"eski {eski_sure * 1000:8.1f} ms  yeni {yeni_sure * 1000:8.1f} ms  "
+          f"{eski_sure / yeni_sure:.1f}x  {'aynı' if ayni else 'UYUMSUZ'}")
+    return 0 if ayni else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
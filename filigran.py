@@ -0,0 +1,71 @@
+"""
+"BİLGİ AMAÇLIDIR" filigranı temizleme işlevleri
+
+Filigran, metne tek başına duran harfler, sayıların arasına karışmış harfler
+veya tam kelime olarak karışır. Tüm modüller bu işlevleri kullanır.
+"""
+import re
+
+FILIGRAN_METNI = "BİLGİ AMAÇLIDIR"
+
+# Filigranın harfleri (büyük harf)
+FILIGRAN_HARFLERI = frozenset("BİLGİAMAÇLIDIR")
+
+# upper() ile filigran harfine dönüşen tek karakterler de dahil
+FILIGRAN_HARFLERI_BUYUK_KUCUK = FILIGRAN_HARFLERI | frozenset("bilgamçıdr")
+
+# Tam filigran yazımları (tek, çift ve boşluksuz)
+FILIGRAN_KELIMESI = re.compile(r"BİLGİ {0,2}AMAÇLIDIR")
+
+# Büyük/küçük harf duyarsız tam filigran metni
+FILIGRAN_METNI_DESENI = re.compile(FILIGRAN_METNI, re.IGNORECASE)
+
+# Metnin başına karışmış tek filigran harfi
+BASTAKI_FILIGRAN = re.compile(r"^[BİLGAMÇIDR]\s*")
+
+# Sayı veya tarih/saat ayraçları arasına karışmış tek filigran harfi
+RAKAM_ARASI_FILIGRAN = re.compile(r"(?<=[\d:./-])[BİLGAMÇIDR](?=[\d:./-])")
+
+
+def filigran_harfi_mi(kelime, buyuk_kucuk=True):
+    """Kelime tek başına bir filigran harfi mi"""
+    kelime = kelime.strip()
+    if len(kelime) != 1:
+        return False
+    return kelime in (FILIGRAN_HARFLERI_BUYUK_KUCUK if buyuk_kucuk else FILIGRAN_HARFLERI)
+
+
+def filigran_harflerini_ayikla(metin, buyuk_kucuk=False):
+    """Tek başına duran filigran harflerini çıkarır, boşlukları tekilleştirir"""
+    if not metin:
+        return ""
+    harfler = FILIGRAN_HARFLERI_BUYUK_KUCUK if buyuk_kucuk else FILIGRAN_HARFLERI
+    return ' '.join([kelime for kelime in metin.split() if kelime not in harfler])
+
+
+def filigran_temizle(metin):
+    """Tam filigran yazımlarını ve tek başına duran filigran harflerini (büyük/küçük) temizler"""
+    if not metin:
+        return ""
+    metin = FILIGRAN_KELIMESI.sub('', metin)
+    return ' '.join([kelime for kelime in metin.split() if kelime not in FILIGRAN_HARFLERI_BUYUK_KUCUK])
+
+
+def filigran_temizle_hepsi(hucreler):
+    """filigran_temizle'nin hücre listesi için toplu hali"""
+    harfler = FILIGRAN_HARFLERI_BUYUK_KUCUK
+    sub = FILIGRAN_KELIMESI.sub
+    return [
+        ' '.join([kelime for kelime in sub('', hucre).split() if kelime not in harfler]) if hucre else ""
+        for hucre in hucreler
+    ]
+
+
+def rakam_arasi_filigran_temizle(metin):
+    """Sayıların/ayraçların arasına karışmış filigran harflerini ve filigran kelimelerini temizler"""
+    if not metin:
+        return ""
+    metin = RAKAM_ARASI_FILIGRAN.sub('', metin)
+    for kelime in ("BİLGİ", "AMAÇLIDIR", FILIGRAN_METNI):
+        metin = metin.replace(kelime, "")
+    return metin.strip()
@@ -0,0 +1,324 @@
+import logging
+import sqlite3
+import re
+from decimal import Decimal, InvalidOperation
+
+import openpyxl
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+from filigran import BASTAKI_FILIGRAN, filigran_harflerini_ayikla
+
+
+def clean_name(adi_soyadi):
+    if not adi_soyadi:
+        return ""
+
+    # SN numarasını temizle
+    adi_soyadi = re.sub(r'\(SN:\d+L?\d*\)', '', adi_soyadi)
+
+    # İki nokta formatını düzelt
+    parts = adi_soyadi.split(':')
+    if len(parts) == 2:
+        isim = parts[0].strip()
+        baba = parts[1].strip()
+    
+        # İsim ve baba adı kısımlarından filigran harflerini temizle
+        isim = filigran_harflerini_ayikla(isim)
+        baba = filigran_harflerini_ayikla(baba)
+    
+        # Temizlenmiş formatı birleştir
+        adi_soyadi = f"{isim} {baba}"
+
+    # Fazla boşlukları temizle
+    adi_soyadi = ' '.join(adi_soyadi.split())
+
+    return adi_soyadi.strip()
+
+
+def clean_pay_payda(pay_payda_str):
+    if not pay_payda_str:
+        return '0/1'
+    
+    # Filigran harflerini temizle    
+    text = BASTAKI_FILIGRAN.sub('', str(pay_payda_str))
+
+    # Tüm boşlukları kaldır
+    text = ''.join(text.split())
+
+    # Pay/payda formatını düzelt
+    if '/' in text:
+        parts = text.split('/')
+        if len(parts) == 2:
+            # İlk kısım pay
+            pay = re.sub(r'[^\d]', '', parts[0])
+            # İkinci kısım payda + ek sayılar
+            payda = re.sub(r'[^\d]', '', parts[1])
+        
+            if pay and payda:
+                return f"{pay}/{payda}"
+
+    return '0/1'
+
+
+def hisse_verilerini_al(db_path="veritabani.db", tasinmaz_kimlik=None):
+    """Hisse tablosu için mülkiyet satırlarını döndürür"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    try:
+        # Ana sorguyu oluştur
+        base_query = """
+            SELECT DISTINCT 
+                tv.tasinmaz_kimlik,
+                tv.hucreno_2,
+                tv.hucreno_4,
+                tv.hucreno_5,
+                tv.hucreno_6,
+                t.il_ilce,
+                t.mahalle,
+                t.ada_parsel,
+                t.zemintipi,
+                t.ana_tasinmaz_nitelik,
+                t.bb_nitelik,
+                t.blok_kat_girisi_bbno
+            FROM tapu_verileri tv
+            LEFT JOIN tasinmaz t ON tv.tasinmaz_kimlik = t.tasinmaz_no
+            WHERE tv.takyidat_baslik = 'MÜLKİYET BİLGİLERİ'
+        """
+
+        if tasinmaz_kimlik:
+            base_query += " AND tv.tasinmaz_kimlik = ?"
+            cursor.execute(base_query, (tasinmaz_kimlik,))
+        else:
+            base_query += " ORDER BY tv.tasinmaz_kimlik"
+            cursor.execute(base_query)
+
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def varsayilan_dosya_adi(tasinmaz_kimlik=None):
+    """Excel dosya adını belirle"""
+    if tasinmaz_kimlik:
+        return f"Hisse_Tablosu_{tasinmaz_kimlik}.xlsx"
+    return "Hisse_Tablosu.xlsx"
+
+
+def hisse_tablosu_olustur(data, file_path):
+    """Hisse detay tablosunu Excel dosyası olarak kaydeder"""
+    # Excel oluştur
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Hisse Detay"
+
+    # Stil tanımlamaları
+    header_font = Font(name='Calibri', bold=True, size=11)
+    cell_font = Font(name='Calibri', size=10)
+    header_fill = PatternFill(start_color="E2EFDA", end_color="E2EFDA", fill_type="solid")
+    alt_row_fill = PatternFill(start_color="F5F5F5", end_color="F5F5F5", fill_type="solid")
+
+    border = Border(
+        left=Side(style='thin', color='000000'),
+        right=Side(style='thin', color='000000'),
+        top=Side(style='thin', color='000000'),
+        bottom=Side(style='thin', color='000000')
+    )
+
+    # Başlık stili
+    title_font = Font(name='Calibri', bold=True, size=14)
+    title_alignment = Alignment(horizontal='center', vertical='center')
+
+    # Sütun genişlikleri
+    column_widths = {
+        'A': 8,   # Sıra No
+        'B': 40,  # Adı Soyadı
+        'C': 15,  # Pay/Payda
+        'D': 12,  # Pay
+        'E': 12,  # Payda
+        'F': 12,  # Oran
+        'G': 20,  # Hisseye Düşen
+        'H': 24,  # Toplam Yüzölçüm
+        'I': 24,  # Yasal Değer
+        'J': 24   # Mevcut Değer
+    }
+
+    # Sütun hizalamaları
+    alignments = {
+        'A': Alignment(horizontal='center', vertical='center'),  # Sıra No
+        'B': Alignment(horizontal='left', vertical='center'),    # Adı Soyadı
+        'C': Alignment(horizontal='center', vertical='center'),  # Pay/Payda
+        'D': Alignment(horizontal='center', vertical='center'),  # Pay
+        'E': Alignment(horizontal='center', vertical='center'),  # Payda
+        'F': Alignment(horizontal='center', vertical='center'),  # Oran
+        'G': Alignment(horizontal='right', vertical='center'),   # Hisseye Düşen
+        'H': Alignment(horizontal='right', vertical='center'),   # Toplam Yüzölçüm
+        'I': Alignment(horizontal='right', vertical='center'),   # Yasal Değer
+        'J': Alignment(horizontal='right', vertical='center')    # Mevcut Değer
+    }
+
+    # Sütun genişliklerini ayarla
+    for col, width in column_widths.items():
+        ws.column_dimensions[col].width = width
+
+    current_row = 1
+    current_tasinmaz = None
+    hisse_count = 0
+
+    # Her kayıt için
+    for row in data:
+        tasinmaz_kimlik = row[0]
+    
+        # Yeni taşınmaz başlangıcı
+        if current_tasinmaz != tasinmaz_kimlik:
+            # İlk kayıt değilse 2 boş satır ekle
+            if current_tasinmaz is not None:
+                current_row += 2
+
+            current_tasinmaz = tasinmaz_kimlik
+            hisse_count = 0
+
+            # Başlık oluştur
+            il_ilce = (row[5] or '').split('/')
+            if len(il_ilce) != 2:
+                il_ilce = ['', '']
+    
+            mahalle = row[6] or ''
+            ada_parsel = (row[7] or '').split('/')
+            if len(ada_parsel) != 2:
+                ada_parsel = ['', '']
+    
+            zemin_tipi = row[8] or ''
+            ana_nitelik = row[9] or ''
+            bb_nitelik = row[10] or ''
+
+            # Başlık oluştur
+            if not zemin_tipi or zemin_tipi not in ["KatIrtifaki", "KatMulkiyeti", "KatIr", "KatM"]:
+                baslik = (f"{il_ilce[0].strip().title()} İli {il_ilce[1].strip().title()} İlçesi "
+                          f"{mahalle.strip()} {ada_parsel[0].strip()} Ada {ada_parsel[1].strip()} "
+                          f"Parsel {ana_nitelik.strip()} Nitelikli Gayrimenkul Hisse Detay Tablosu")
+            else:
+                bb_bilgisi = row[11] if row[11] else ''
+                formatted_bb = ""
+
+                if bb_bilgisi:
+                    parts = bb_bilgisi.split('/')
+
+                    blok_kismi = ""
+                    if parts[0].strip() and parts[0].strip() != "-":
+                        blok_kismi = f"{parts[0].strip()} Blok "
+
+                    kat = parts[1].strip() if len(parts) > 1 else ""
+                    kat_text = ""
+                    if kat:
+                        if '+' in kat or 'BODRUM' in kat.upper():
+                            kat_text = f"{kat} Kat"
+                        else:
+                            kat_text = f"{kat}. Kat"
+
+                    giris_kismi = ""
+                    if len(parts) > 2 and parts[2].strip() and parts[2].strip() != "-":
+                        giris_kismi = f" {parts[2].strip()}. Giriş"
+
+                    bb_no = parts[3].strip() if len(parts) > 3 else ""
+
+                    formatted_bb = f"{blok_kismi}{kat_text}{giris_kismi} {bb_no} Nolu Bağımsız Bölüm"
+
+                baslik = (f"{il_ilce[0].strip().title()} İli {il_ilce[1].strip().title()} İlçesi "
+                          f"{mahalle.strip()} {ada_parsel[0].strip()} Ada {ada_parsel[1].strip()} "
+                          f"Parsel {bb_nitelik.strip()} Nitelikli {formatted_bb} Hisse Detay Tablosu")
+
+            # Başlık formatı
+            ws.merge_cells(f'A{current_row}:J{current_row}')
+            ws[f'A{current_row}'] = baslik
+            ws[f'A{current_row}'].font = title_font
+            ws[f'A{current_row}'].alignment = title_alignment
+            ws.row_dimensions[current_row].height = 35
+
+            current_row += 1
+
+            # Tablo başlıkları
+            headers = [
+                "Sıra No", "Adı Soyadı", "Pay/Payda", "Pay", "Payda", "Oran",
+                "Hissesine Düşen (m²)", "Toplam Yüzölçüm (m²)", 
+                "Yasal Değer (TL)", "Mevcut Değer (TL)"
+            ]
+    
+            for col, header in enumerate(headers, 1):
+                cell = ws.cell(row=current_row, column=col)
+                cell.value = header
+                cell.font = header_font
+                cell.fill = header_fill
+                cell.border = border
+                cell.alignment = alignments[chr(64 + col)]
+
+            current_row += 1
+
+        # Hisse verilerini işle
+        try:
+            hisse_count += 1
+
+            # Adı soyadı temizleme
+            adi_soyadi = clean_name(row[1])
+
+            # Pay/payda temizleme ve ayrıştırma
+            pay_payda = clean_pay_payda(row[2])
+        
+            try:
+                pay, payda = pay_payda.split('/')
+                pay_num = Decimal(pay.strip())
+                payda_num = Decimal(payda.strip())
+                oran = pay_num / payda_num if payda_num != 0 else Decimal('0')
+            except (ValueError, InvalidOperation):
+                pay_num = Decimal('0')
+                payda_num = Decimal('1')
+                oran = Decimal('0')
+
+            # Zemin tipine göre alan değerlerini ayarla
+            if zemin_tipi in ["KatIrtifaki", "KatMulkiyeti", "KatIrtif", "KatMulki"]:
+                hisse_alan = "-"
+                toplam_alan = "-"
+            else:
+                hisse_alan = str(row[3]).strip().replace('.', ',') if row[3] else '0'
+                toplam_alan = str(row[4]).strip().replace('.', ',') if row[4] else '0'
+
+            # Veri satırı
+            row_data = [
+                hisse_count,
+                adi_soyadi,
+                f"'{pay_payda}",
+                int(pay_num),
+                int(payda_num),
+                f"{oran:.5f}".replace('.', ','),
+                hisse_alan,
+                toplam_alan,
+                "",
+                ""
+            ]
+
+            # Veri satırı formatı
+            for col, value in enumerate(row_data, 1):
+                cell = ws.cell(row=current_row, column=col)
+                cell.value = value
+                cell.font = cell_font
+                cell.border = border
+                cell.alignment = alignments[chr(64 + col)]
+
+                # Alternatif satır renklendirmesi
+                if current_row % 2 == 0:
+                    cell.fill = alt_row_fill
+
+                # Sayısal değerler için format
+                if col in [4, 5, 6] and isinstance(value, (int, float, Decimal)):  # Pay, Payda, Oran sütunları
+                    cell.number_format = '#,##0.00'
+                elif col in [7, 8] and value != "-":  # Alan sütunları, tire olmayan değerler için
+                    if isinstance(value, (int, float, Decimal)) or (isinstance(value, str) and value.replace(',', '').replace('.', '').isdigit()):
+                        cell.number_format = '#,##0.00'
+
+            current_row += 1
+
+        except Exception as e:
+            logging.error(f"Satır işleme hatası: {str(e)}\nVeri: {row}")
+            continue
+
+    wb.save(file_path)
+    return file_path
@@ -1,17 +1,52 @@
-import os
-import pdfplumber
-import json
 import logging
 import re
-import sqlite3
+import time
 from difflib import SequenceMatcher
+from takbis_belge import TakbisBelgesi
+from banka_cozucu import BankaCozucu, normalize_et
+from filigran import FILIGRAN_HARFLERI, filigran_harfi_mi, filigran_harflerini_ayikla
+from veritabani_sema import sema_guncelle
+from is_birimi import baglanti_ac
+
+
+IPOTEK_EKLE_SQL = '''
+    INSERT INTO ipotek_verileri (
+        tapu_tarih,
+        tasinmaz_kimlik,
+        sayfa_no,
+        alacakli,
+        musterek_mi,
+        borc,
+        faiz,
+        derece_sira,
+        sure,
+        tesis_tarih,
+        tasinmaz,
+        hisse_pay_payda,
+        borclu_malik,
+        sn_bilgisi,
+        malik_borc,
+        tescil_tarih,
+        terkin
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Banka VKN/ad listesinin varsayılan dosyası
+BANKA_DOSYASI = 'banks.json'
+
+# is_ipotek_page her iki kuralda da en az bir tablo başlığı arar. Başlıkların
+# kökleri fitz metninde hiç geçmiyorsa sayfa pdfplumber ile incelenmez.
+IPOTEK_ON_ELEME = re.compile('Alacakl|Bor|Faiz|Derece|Tesis')
 
 
 class IpotekKoordinatExtractor:
-    def __init__(self, db_path=None, banks_json_path=None):
+    def __init__(self, db_path=None, banks_json_path=None, is_birimi=None):
         # Veritabanı yolunu parametre olarak al
         self.db_path = db_path or 'veritabani.db'
-        self.banks_json_path = banks_json_path or 'banks.json'
+        # Verilirse tüm yazmalar iş biriminin işleminde yapılır; hatalar
+        # iş biriminin geri alınması için yükseltilir
+        self.is_birimi = is_birimi
+        self.banks_json_path = banks_json_path or BANKA_DOSYASI
 
         # Düzeltilecek kısaltmalar sözlüğü
         self.format_fixes = {
@@ -90,21 +125,13 @@ class IpotekKoordinatExtractor:
             '7960069236': 'Türkiye Finans Katılım Bankası A.Ş.'
         }
 
-        # JSON dosyasından banka bilgilerini yükle
-        self.banks = self.load_banks()
-
-
-        # Banka isimlerinin normalize edilmiş hallerini hazırla
-        self.bank_names = {}
-        for vkn, name in self.banks.items():
-            normalized_name = self.normalize_text(name)
-            if normalized_name not in self.bank_names:
-                self.bank_names[normalized_name] = name
+        # JSON dosyasından banka bilgilerini yükle; VKN sözlüğü ve ad dizini çözümleyicide tutulur
+        self.banka_cozucu = self.load_banks()
+        self.banks = self.banka_cozucu.bankalar
+        self.bank_names = self.banka_cozucu.adlar
 
         # Filigran karakterleri
-        self.filigran_karakterler = {
-            "B", "İ", "L", "G", "İ", "A", "M", "A", "Ç", "L", "I", "D", "R"
-        }
+        self.filigran_karakterler = FILIGRAN_HARFLERI
         
         # İpotek alanları için koordinat bölgeleri
         self.ipotek_alanlari = {
@@ -126,28 +153,12 @@ class IpotekKoordinatExtractor:
             'terkin': {'x0': 720, 'x1': 800, 'y0': 200, 'y1': 260}
         }
 
+        # Son veri_cikar çağrısının sayfa sınıflandırma istatistiği
+        self.sayfa_istatistigi = None
+
     def load_banks(self):
         """JSON dosyasından banka bilgilerini yükler, hata durumunda varsayılan listeyi kullanır"""
-        try:
-            if os.path.exists(self.banks_json_path):
-                with open(self.banks_json_path, 'r', encoding='utf-8') as file:
-                    loaded_banks = json.load(file)
-                    # Yüklenen verinin geçerli olup olmadığını kontrol et
-                    if isinstance(loaded_banks, dict) and loaded_banks:
-                        return loaded_banks
-                    else:
-                        raise ValueError("Geçersiz banka verisi formatı")
-            else:
-                # Dosya yoksa varsayılan listeyi kullan ve kaydet
-                self.save_banks(self.default_banks)
-                return self.default_banks
-
-        except Exception as e:
-            logging.error(f"Banka bilgileri yüklenirken hata: {str(e)}")
-            logging.info("Varsayılan banka listesi kullanılıyor ve kaydediliyor")
-            # Hata durumunda varsayılan listeyi kullan ve kaydet
-            self.save_banks(self.default_banks)
-            return self.default_banks
+        return BankaCozucu(self.banks_json_path, self.default_banks)
 
     def extract_bank_name(self, text):
         """Metinden banka adını çıkar ve temizle"""
@@ -168,8 +179,7 @@ class IpotekKoordinatExtractor:
                 cleaned_text = cleaned_text.replace(baslik, '').strip()
         
             # Kelimeleri ayır ve filigranları temizle
-            words = cleaned_text.split()
-            cleaned_words = [word for word in words if not self.is_filigran_harf(word)]
+            cleaned_words = filigran_harflerini_ayikla(cleaned_text, buyuk_kucuk=True).split()
         
             # Her kelimenin ilk harfini büyük yap
             cleaned_words = [word.capitalize() if not word.endswith('.') else word.upper() 
@@ -211,13 +221,8 @@ class IpotekKoordinatExtractor:
             for baslik in basliklar:
                 text = text.replace(baslik, '').strip()
         
-            # Filigran temizliği
-            words = text.split()
-            cleaned_words = [word for word in words if not self.is_filigran_harf(word)]
-            text = ' '.join(cleaned_words)
-        
-            # Fazla boşlukları temizle
-            text = ' '.join(text.split())
+            # Filigran temizliği, fazla boşluklar da tekilleşir
+            text = filigran_harflerini_ayikla(text, buyuk_kucuk=True)
         
             # Kısaltmaları düzelt
             for k, v in self.format_fixes.items():
@@ -231,16 +236,7 @@ class IpotekKoordinatExtractor:
     def find_similar_bank(self, normalized_text, similarity_threshold=0.95):
         """Benzer banka ismi ara"""
         try:
-            best_match = None
-            best_ratio = 0
-        
-            for bank_name in self.bank_names:
-                ratio = self.similar(normalized_text, bank_name)
-                if ratio > similarity_threshold and ratio > best_ratio:
-                    best_ratio = ratio
-                    best_match = self.bank_names[bank_name]
-        
-            return best_match
+            return self.banka_cozucu.benzer_banka(normalized_text, similarity_threshold)
         except Exception as e:
             logging.error(f"Banka benzerlik kontrolü hatası: {str(e)}")
             return None
@@ -248,60 +244,32 @@ class IpotekKoordinatExtractor:
     def add_new_bank(self, vkn, bank_name):
         """Yeni banka bilgisini ekle"""
         try:
-            if not vkn or not bank_name:
-                return False
-            
-            if vkn not in self.banks:
-                # Banks sözlüğüne ekle
-                self.banks[vkn] = bank_name
-            
-                # Bank_names sözlüğünü güncelle
-                normalized_name = self.normalize_text(bank_name)
-                self.bank_names[normalized_name] = bank_name
-            
-                # JSON dosyasına kaydet
-                if self.save_banks(self.banks):
-                    logging.info(f"Yeni banka başarıyla eklendi: {vkn} - {bank_name}")
-                    return True
-                else:
-                    logging.error("Banka JSON kaydetme hatası")
-                    return False
+            # JSON dosyasına belge sonunda topluca yazılır (save_banks)
+            if self.banka_cozucu.ekle(vkn, bank_name):
+                logging.info(f"Yeni banka eklendi: {vkn} - {bank_name}")
+                return True
             return False
         except Exception as e:
             logging.error(f"Yeni banka ekleme hatası: {str(e)}")
             return False
 
-    def save_banks(self, banks_data):
-        """Banka bilgilerini JSON dosyasına kaydet"""
-        try:
-            with open(self.banks_json_path, 'w', encoding='utf-8') as file:
-                json.dump(banks_data, file, ensure_ascii=False, indent=4)
-            return True
-        except Exception as e:
-            logging.error(f"Banka bilgileri kaydetme hatası: {str(e)}")
-            return False
+    def save_banks(self):
+        """Eklenen banka bilgilerini JSON dosyasına tek seferde, atomik olarak kaydet"""
+        return self.banka_cozucu.kaydet()
+
+    def baglan(self):
+        return baglanti_ac(self.db_path, self.is_birimi)
 
     def create_takbis_tarih_table(self):
         """Takbis tarih tablosunu oluşturur"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS takbis_tarih (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            tapu_tarih TEXT,
-            tasinmaz_kimlik TEXT,
-            kayit_tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        # İş birimi şemayı işlemi başlatırken günceller
+        if self.is_birimi is None:
+            sema_guncelle(self.db_path)
 
     def save_takbis_tarih(self, tapu_tarih, tasinmaz_kimlik):
         """Tapu tarih ve taşınmaz kimlik bilgilerini kaydeder"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.baglan()
             cursor = conn.cursor()
             
             # Önce tablonun var olduğundan emin olalım
@@ -337,43 +305,20 @@ class IpotekKoordinatExtractor:
             
         except Exception as e:
             logging.error(f"Takbis tarih kaydetme hatası: {str(e)}")
+            if self.is_birimi is not None:
+                raise
             return False
 
     def create_database(self):
         """Veritabanı ve ipotek_verileri tablosunu oluşturur"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS ipotek_verileri (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            tapu_tarih TEXT,
-            tasinmaz_kimlik TEXT,
-            sayfa_no INTEGER,
-            alacakli TEXT,
-            musterek_mi TEXT,
-            borc TEXT,
-            faiz TEXT,
-            derece_sira TEXT,
-            sure TEXT,
-            tesis_tarih TEXT,
-            tasinmaz TEXT,
-            hisse_pay_payda TEXT,
-            borclu_malik TEXT,
-            sn_bilgisi TEXT,
-            malik_borc TEXT,
-            tescil_tarih TEXT,
-            terkin TEXT
-        )
-        ''')
-        
-        conn.commit()
-        return conn
+        if self.is_birimi is None:
+            sema_guncelle(self.db_path)
+        return self.baglan()
 
     def check_existing_data(self, tasinmaz_kimlik):
         """Taşınmaza ait ipotek verisinin olup olmadığını kontrol et"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.baglan()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -387,12 +332,14 @@ class IpotekKoordinatExtractor:
             return count > 0
         except Exception as e:
             logging.error(f"Veri kontrol hatası: {str(e)}")
+            if self.is_birimi is not None:
+                raise
             return False
 
     def delete_existing_data(self, tasinmaz_kimlik):
         """Var olan ipotek verilerini sil"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.baglan()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -405,6 +352,8 @@ class IpotekKoordinatExtractor:
             return True
         except Exception as e:
             logging.error(f"Veri silme hatası: {str(e)}")
+            if self.is_birimi is not None:
+                raise
             return False
 
     def save_to_database(self, results):
@@ -416,33 +365,14 @@ class IpotekKoordinatExtractor:
             tapu_tarih = results['tapu_bilgileri']['tarih']
             tasinmaz_kimlik = results['tapu_bilgileri']['tasinmaz_kimlik']
         
+            satirlar = []
             for ipotek_bilgi in results['ipotek_bilgileri']:
                 ipotek = ipotek_bilgi.get('ipotek', {})  # get metodu ile None durumunu engelle
                 hisse = ipotek_bilgi.get('hisse', {})
                 sayfa_no = ipotek_bilgi.get('sayfa_no')
             
                 # Tüm alanları kontrol et ve None ise boş string ata
-                cursor.execute('''
-                INSERT INTO ipotek_verileri (
-                    tapu_tarih,
-                    tasinmaz_kimlik,
-                    sayfa_no,
-                    alacakli,
-                    musterek_mi,
-                    borc,
-                    faiz,
-                    derece_sira,
-                    sure,
-                    tesis_tarih,
-                    tasinmaz,
-                    hisse_pay_payda,
-                    borclu_malik,
-                    sn_bilgisi,
-                    malik_borc,
-                    tescil_tarih,
-                    terkin
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+                satirlar.append((
                     tapu_tarih or '',
                     tasinmaz_kimlik or '',
                     sayfa_no or 0,
@@ -461,31 +391,25 @@ class IpotekKoordinatExtractor:
                     hisse.get('tescil_tarih', ''),
                     hisse.get('terkin', '')
                 ))
-        
+
+            cursor.executemany(IPOTEK_EKLE_SQL, satirlar)
             conn.commit()
             conn.close()
             return True
             
         except Exception as e:
             logging.error(f"Veritabanına kaydetme hatası: {str(e)}")
+            if self.is_birimi is not None:
+                raise
             return False
 
     def is_filigran_harf(self, text):
-        """Metnin filigran harfi olup olmadığını kontrol et"""
-        text = text.strip().upper()
-        filigran_kelime = "BİLGİ AMAÇLIDIR"
-        return (len(text) == 1 and (
-            text in set(filigran_kelime) or
-            text in self.filigran_karakterler
-        ))
+        """Metnin filigran harfi olup olmadığını kontrol et (büyük/küçük harf duyarsız)"""
+        return filigran_harfi_mi(text)
 
     def normalize_text(self, text):
         """Metni normalize eder (büyük harfe çevirir ve özel karakterleri temizler)"""
-        if not text:
-            return ""
-        text = text.upper()
-        text = text.replace('İ', 'I').replace('Ü', 'U').replace('Ö', 'O').replace('Ş', 'S').replace('Ç', 'C').replace('Ğ', 'G')
-        return text
+        return normalize_et(text)
 
     def similar(self, a, b):
         """İki metin arasındaki benzerlik oranını hesaplar"""
@@ -618,26 +542,68 @@ class IpotekKoordinatExtractor:
     def extract_data_from_area(self, page, area):
         """Belirli bir alandaki kelimeleri çıkar"""
         try:
-            area_words = []
-            words = page.extract_words(
+            kelime_dizini = page.kelime_dizini(
                 x_tolerance=3,
                 y_tolerance=3,
                 keep_blank_chars=True,
                 use_text_flow=False
             )
+            area_words = kelime_dizini.alan(area['x0'], area['x1'], area['y0'], area['y1'])
 
-            for word in words:
-                if (area['x0'] <= word['x0'] <= area['x1'] and 
-                    area['y0'] <= word['top'] <= area['y1']):
-                    area_words.append(word['text'])
-
-            text = ' '.join(area_words)
+            text = ' '.join(word['text'] for word in area_words)
             return self.clean_text(text)
 
         except Exception as e:
             logging.error(f"Veri çıkarma hatası: {str(e)}")
             return ""
 
+    def alanlari_cikar(self, page, alanlar):
+        """
+        Birden çok alanın metnini sayfa kelimeleri üzerinde tek taramada çıkarır
+
+        Her alanın sonucu extract_data_from_area ile aynıdır.
+        """
+        try:
+            kelime_dizini = page.kelime_dizini(
+                x_tolerance=3,
+                y_tolerance=3,
+                keep_blank_chars=True,
+                use_text_flow=False
+            )
+            return {
+                alan_adi: self.clean_text(' '.join(word['text'] for word in area_words))
+                for alan_adi, area_words in kelime_dizini.alanlar(alanlar).items()
+            }
+
+        except Exception as e:
+            logging.error(f"Veri çıkarma hatası: {str(e)}")
+            return {alan_adi: "" for alan_adi in alanlar}
+
+    def alan_verilerini_ayir(self, metinler, ipotek_alanlari, hisse_alanlari):
+        """alanlari_cikar sonucunu ipotek ve hisse verilerine ayırır"""
+        ipotek_data = {}
+        for alan_adi in ipotek_alanlari:
+            ipotek_data[alan_adi] = self.clean_text(metinler[('ipotek', alan_adi)])
+
+        hisse_data = {}
+        for alan_adi in hisse_alanlari:
+            text = metinler[('hisse', alan_adi)]
+            if alan_adi == 'borclu_malik':
+                temizlenmis_text = self.clean_text(text, preserve_sn=True)
+                sn_match = re.search(r'\(SN:(\d+)\)', temizlenmis_text)
+                sn_bilgisi = sn_match.group(1) if sn_match else None
+                hisse_data[alan_adi] = re.sub(r'\(SN:\d+\)\s*', '', temizlenmis_text).strip()
+                hisse_data['sn_bilgisi'] = sn_bilgisi
+            else:
+                hisse_data[alan_adi] = self.clean_text(text)
+
+        return ipotek_data, hisse_data
+
+    def tum_alanlar(self, ipotek_alanlari, hisse_alanlari):
+        alanlar = {('ipotek', alan_adi): koordinatlar for alan_adi, koordinatlar in ipotek_alanlari.items()}
+        alanlar.update({('hisse', alan_adi): koordinatlar for alan_adi, koordinatlar in hisse_alanlari.items()})
+        return alanlar
+
     def process_page(self, page):
        """
        Sayfadaki tüm verileri işler. Önce standart koordinatlarla dener,
@@ -645,25 +611,9 @@ class IpotekKoordinatExtractor:
        """
        try:
            # 1. STANDART KOORDİNATLARLA DENEME
-           ipotek_data = {}
-           hisse_data = {}
-       
-           # Standart koordinatlarla veri çıkarma
-           for alan_adi, koordinatlar in self.ipotek_alanlari.items():
-               text = self.extract_data_from_area(page, koordinatlar)
-               ipotek_data[alan_adi] = self.clean_text(text)
-
-           # Standart hisse verilerini çıkar    
-           for alan_adi, koordinatlar in self.hisse_alanlari.items():
-               text = self.extract_data_from_area(page, koordinatlar)
-               if alan_adi == 'borclu_malik':
-                   temizlenmis_text = self.clean_text(text, preserve_sn=True)
-                   sn_match = re.search(r'\(SN:(\d+)\)', temizlenmis_text)
-                   sn_bilgisi = sn_match.group(1) if sn_match else None
-                   hisse_data[alan_adi] = re.sub(r'\(SN:\d+\)\s*', '', temizlenmis_text).strip()
-                   hisse_data['sn_bilgisi'] = sn_bilgisi
-               else:
-                   hisse_data[alan_adi] = self.clean_text(text)
+           # Tüm ipotek ve hisse alanları sayfa kelimeleri üzerinde tek taramada çıkarılır
+           metinler = self.alanlari_cikar(page, self.tum_alanlar(self.ipotek_alanlari, self.hisse_alanlari))
+           ipotek_data, hisse_data = self.alan_verilerini_ayir(metinler, self.ipotek_alanlari, self.hisse_alanlari)
 
            # VERİ KALİTE KONTROLÜ
            veri_eksik = False
@@ -694,13 +644,13 @@ class IpotekKoordinatExtractor:
            if veri_eksik:
                logging.info("Standart koordinatlarla veri eksik veya hatalı, dinamik koordinatlara geçiliyor...")
            
-               # Sayfadaki metinleri çıkar
-               words = page.extract_words(
+               # Standart alanlarla aynı kelime kümesi kullanılır
+               words = page.kelime_dizini(
                    x_tolerance=3,
                    y_tolerance=3,
                    keep_blank_chars=True,
                    use_text_flow=False
-               )
+               ).kelimeler
            
                # Başlıkların konumlarını bul
                alacakli_coords = None
@@ -803,24 +753,9 @@ class IpotekKoordinatExtractor:
                        }
                    }
 
-                   # Dinamik koordinatlarla ipotek verilerini çıkar
-                   ipotek_data = {}
-                   for alan_adi, koordinatlar in dynamic_ipotek_alanlari.items():
-                       text = self.extract_data_from_area(page, koordinatlar)
-                       ipotek_data[alan_adi] = self.clean_text(text)
-
-                   # Dinamik koordinatlarla hisse verilerini çıkar
-                   hisse_data = {}
-                   for alan_adi, koordinatlar in dynamic_hisse_alanlari.items():
-                       text = self.extract_data_from_area(page, koordinatlar)
-                       if alan_adi == 'borclu_malik':
-                           temizlenmis_text = self.clean_text(text, preserve_sn=True)
-                           sn_match = re.search(r'\(SN:(\d+)\)', temizlenmis_text)
-                           sn_bilgisi = sn_match.group(1) if sn_match else None
-                           hisse_data[alan_adi] = re.sub(r'\(SN:\d+\)\s*', '', temizlenmis_text).strip()
-                           hisse_data['sn_bilgisi'] = sn_bilgisi
-                       else:
-                           hisse_data[alan_adi] = self.clean_text(text)
+                   # Dinamik koordinatlarla ipotek ve hisse verilerini tek taramada çıkar
+                   metinler = self.alanlari_cikar(page, self.tum_alanlar(dynamic_ipotek_alanlari, dynamic_hisse_alanlari))
+                   ipotek_data, hisse_data = self.alan_verilerini_ayir(metinler, dynamic_ipotek_alanlari, dynamic_hisse_alanlari)
 
            return {'ipotek': ipotek_data, 'hisse': hisse_data}
 
@@ -884,65 +819,130 @@ class IpotekKoordinatExtractor:
             logging.error(f"İpotek sayfası kontrol hatası: {str(e)}")
             return False
 
-    def extract_from_pdf(self, pdf_path, force_update=False):
+    def ipotek_adayi_mi(self, page):
+        """
+        fitz metniyle hızlı ön eleme
+
+        False dönerse sayfa is_ipotek_page koşullarını sağlayamaz. Metin
+        çıkarılamazsa karar kesin kontrole bırakılır.
+        """
+        try:
+            metin = page.fitz_metni()
+        except Exception as e:
+            logging.warning(f"fitz metni alınamadı, sayfa kesin kontrole bırakıldı: {str(e)}")
+            return True
+
+        if not metin or not metin.strip():
+            return True
+        return IPOTEK_ON_ELEME.search(metin) is not None
+
+    def extract_from_pdf(self, pdf_path, force_update=False, belge=None):
         """
         PDF'den tüm verileri çıkar ve veritabanına kaydet
         
         Args:
             pdf_path (str): PDF dosyasının yolu
             force_update (bool): True ise mevcut verileri güncelle
+            belge (TakbisBelgesi): Daha önce açılmış ortak belge (verilmezse PDF burada açılır)
             
         Returns:
             dict: Çıkarılan veriler veya None (hata durumunda)
         """
+        kendi_belgesi = belge is None
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                # İlk sayfadan tapu bilgilerini al
-                first_page = pdf.pages[0]
-                tapu_bilgileri = self.extract_tapu_info(first_page)
-                
-                if not tapu_bilgileri:
-                    logging.error("Tapu bilgileri çıkarılamadı")
+            if kendi_belgesi:
+                belge = TakbisBelgesi(pdf_path)
+
+            final_data = self.veri_cikar(belge)
+            self.save_banks()
+            if not final_data:
+                return None
+
+            return self.kaydet(final_data, force_update)
+
+        except Exception as e:
+            logging.error(f"PDF işleme hatası: {str(e)}")
+            return None
+        finally:
+            if kendi_belgesi and belge is not None:
+                belge.close()
+
+    def veri_cikar(self, belge):
+        """Tapu ve ipotek bilgilerini belgeden çıkarır; veritabanına dokunmaz"""
+        # İlk sayfadan tapu bilgilerini al
+        first_page = belge.sayfalar[0]
+        tapu_bilgileri = self.extract_tapu_info(first_page)
+        
+        if not tapu_bilgileri:
+            logging.error("Tapu bilgileri çıkarılamadı")
+            return None
+
+        ipotek_bilgileri = []
+        siniflandirma_suresi = 0.0
+        aday_sayisi = 0
+        for page_num, page in enumerate(belge.sayfalar, 1):
+            baslangic = time.perf_counter()
+            aday = self.ipotek_adayi_mi(page)
+            ipotek_sayfasi = aday and self.is_ipotek_page(page)
+            siniflandirma_suresi += time.perf_counter() - baslangic
+            aday_sayisi += aday
+
+            if ipotek_sayfasi:
+                logging.info(f"Sayfa {page_num}'de ipotek bilgisi bulundu")
+                page_data = self.process_page(page)
+                if any(page_data['ipotek'].values()):
+                    page_data['sayfa_no'] = page_num
+                    ipotek_bilgileri.append(page_data)
+            else:
+                logging.info(f"Sayfa {page_num} - ipotek sayfası olarak değerlendirilmedi.")
+
+        self.sayfa_istatistigi = {
+            'sayfa': len(belge.sayfalar),
+            'aday': aday_sayisi,
+            'sure': siniflandirma_suresi
+        }
+        if siniflandirma_suresi:
+            logging.info(
+                f"Sayfa sınıflandırma: {len(belge.sayfalar)} sayfa, {aday_sayisi} aday, "
+                f"{len(belge.sayfalar) / siniflandirma_suresi:.0f} sayfa/sn"
+            )
+
+        # Belge boyunca eklenen yeni bankalar banka_cozucu.yeni_bankalar'da
+        # bekler; çağıran save_banks ile (toplu aktarımda yazıcıda) kaydeder
+        return {
+            'tapu_bilgileri': tapu_bilgileri,
+            'ipotek_bilgileri': ipotek_bilgileri
+        }
+
+    def kaydet(self, final_data, force_update=False):
+        """veri_cikar sonucunu veritabanına yazar; mevcut ipotek verisi varsa None döner"""
+        try:
+            tapu_bilgileri = final_data['tapu_bilgileri']
+
+            # Takbis tarih bilgilerini kaydet
+            self.save_takbis_tarih(tapu_bilgileri['tarih'], tapu_bilgileri['tasinmaz_kimlik'])
+           
+            # Mevcut veri kontrolü
+            if self.check_existing_data(tapu_bilgileri['tasinmaz_kimlik']):
+                if not force_update:
+                    logging.info(f"Taşınmaz {tapu_bilgileri['tasinmaz_kimlik']} için mevcut ipotek verisi bulundu")
                     return None
-                               
-                # Yeni eklenen kısım: Takbis tarih bilgilerini kaydet
-                self.save_takbis_tarih(tapu_bilgileri['tarih'], tapu_bilgileri['tasinmaz_kimlik'])
-               
-                # Mevcut veri kontrolü
-                if self.check_existing_data(tapu_bilgileri['tasinmaz_kimlik']):
-                    if not force_update:
-                        logging.info(f"Taşınmaz {tapu_bilgileri['tasinmaz_kimlik']} için mevcut ipotek verisi bulundu")
-                        return None
-                    else:
-                        # Mevcut verileri sil
-                        self.delete_existing_data(tapu_bilgileri['tasinmaz_kimlik'])
-                
-                ipotek_bilgileri = []
-                for page_num, page in enumerate(pdf.pages, 1):
-                    if self.is_ipotek_page(page):
-                        logging.info(f"Sayfa {page_num}'de ipotek bilgisi bulundu")
-                        page_data = self.process_page(page)
-                        if any(page_data['ipotek'].values()):
-                            page_data['sayfa_no'] = page_num
-                            ipotek_bilgileri.append(page_data)
-                    else:
-                        logging.info(f"Sayfa {page_num} - ipotek sayfası olarak değerlendirilmedi.")
-
-                final_data = {
-                    'tapu_bilgileri': tapu_bilgileri,
-                    'ipotek_bilgileri': ipotek_bilgileri
-                }
-                
-                # Verileri veritabanına kaydet
-                if self.save_to_database(final_data):
-                    logging.info("Veriler başarıyla veritabanına kaydedildi.")
                 else:
-                    logging.error("Verileri veritabanına kaydederken hata oluştu.")
-                
-                return final_data
+                    # Mevcut verileri sil
+                    self.delete_existing_data(tapu_bilgileri['tasinmaz_kimlik'])
+            
+            # Verileri veritabanına kaydet
+            if self.save_to_database(final_data):
+                logging.info("Veriler başarıyla veritabanına kaydedildi.")
+            else:
+                logging.error("Verileri veritabanına kaydederken hata oluştu.")
+            
+            return final_data
 
         except Exception as e:
-            logging.error(f"PDF işleme hatası: {str(e)}")
+            logging.error(f"İpotek verisi kaydetme hatası: {str(e)}")
+            if self.is_birimi is not None:
+                raise
             return None
 
     def find_table_coordinates(self, page):
@@ -1018,12 +1018,12 @@ class IpotekKoordinatExtractor:
 
     def calculate_dynamic_coordinates(self, page):
         """Dinamik koordinat hesaplama"""
-        words = page.extract_words(
+        words = page.kelime_dizini(
             x_tolerance=3,
             y_tolerance=3,
             keep_blank_chars=True,
             use_text_flow=False
-        )
+        ).kelimeler
     
         alacakli_y = None
         hisse_y = None
@@ -1089,14 +1089,10 @@ class IpotekKoordinatExtractor:
 
     def find_content_area(self, page, start_y, section_width=250):
         """Belirli bir y koordinatından başlayarak içeriği bulur"""
-        words = page.extract_words(x_tolerance=3, y_tolerance=3)
-        content_words = []
-    
-        for word in words:
-            # Başlangıç y koordinatından sonraki ve x ekseni uygun olan kelimeleri al
-            if (word['top'] > start_y and 
-                word['top'] < start_y + section_width and 
-                word['x0'] < 250):  # Alacaklı bölümü için x sınırı
-                content_words.append(word['text'])
-    
-        return ' '.join(content_words)
\ No newline at end of file
+        kelime_dizini = page.kelime_dizini(x_tolerance=3, y_tolerance=3)
+
+        # Başlangıç y koordinatından sonraki ve x ekseni uygun olan kelimeleri al
+        # (250: Alacaklı bölümü için x sınırı)
+        content_words = kelime_dizini.alan(float('-inf'), 250, start_y, start_y + section_width, acik=True)
+
+        return ' '.join(word['text'] for word in content_words)
\ No newline at end of file
@@ -0,0 +1,131 @@
+import itertools
+import logging
+import sqlite3
+
+from veritabani_sema import sema_guncelle
+
+
+class IsBirimiBaglantisi:
+    """
+    İş biriminin bağlantısını sqlite3 bağlantısı gibi kullandırır
+
+    Her açılışta bir kayıt noktası (SAVEPOINT) başlatılır; commit kayıt noktasını
+    bırakıp yenisini açar, rollback yalnızca kayıt noktasına döner, close
+    kayıt noktasını bırakır. Asıl COMMIT iş biriminde yapılır.
+    """
+
+    def __init__(self, conn, ad):
+        self.conn = conn
+        self.ad = ad
+        self.acik = False
+        self.kayit_noktasi_ac()
+
+    def kayit_noktasi_ac(self):
+        self.conn.execute(f"SAVEPOINT {self.ad}")
+        self.acik = True
+
+    def cursor(self):
+        return self.conn.cursor()
+
+    def execute(self, *args):
+        return self.conn.execute(*args)
+
+    def executemany(self, *args):
+        return self.conn.executemany(*args)
+
+    def commit(self):
+        if self.acik:
+            self.conn.execute(f"RELEASE SAVEPOINT {self.ad}")
+        self.kayit_noktasi_ac()
+
+    def rollback(self):
+        if self.acik:
+            self.conn.execute(f"ROLLBACK TO SAVEPOINT {self.ad}")
+
+    def close(self):
+        if self.acik:
+            self.conn.execute(f"RELEASE SAVEPOINT {self.ad}")
+            self.acik = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+
+def baglanti_ac(db_path, is_birimi=None):
+    """İş birimi verilirse onun işlemindeki bağlantıyı, yoksa yeni bir bağlantı döndürür"""
+    if is_birimi is not None:
+        return is_birimi.baglanti()
+    return sqlite3.connect(db_path)
+
+
+class IsBirimi:
+    """
+    Bir belgenin tüm son işlemlerini tek bağlantı ve tek işlemde yürütür
+
+    İşlem ilk baglanti() çağrısında BEGIN IMMEDIATE ile başlar; o andan sonra
+    aynı veritabanına başka bağlantılardan yazılmamalıdır. with bloğu hatasız
+    biterse tek COMMIT (tek fsync) yapılır, hata olursa tüm değişiklikler geri
+    alınır.
+
+    Kullanım:
+        with IsBirimi(db_path) as is_birimi:
+            TapuProcessor(db_path, tasinmaz_no, is_birimi).process_all()
+            TesisProcessor(db_path, tasinmaz_no, is_birimi).process_all()
+    """
+
+    def __init__(self, db_path="veritabani.db"):
+        self.db_path = db_path
+        self.conn = None
+        self.sayac = itertools.count(1)
+
+    def baslat(self):
+        if self.conn is None:
+            # Şema göçleri ayrı bağlantıda yazıldığından işlem açılmadan uygulanır
+            sema_guncelle(self.db_path)
+            self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+            self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def baglanti(self):
+        """İşlem içinde kendi kayıt noktası olan bir bağlantı döndürür"""
+        return IsBirimiBaglantisi(self.baslat(), f"adim_{next(self.sayac)}")
+
+    def tamamla(self):
+        if self.conn is None:
+            return
+        try:
+            self.conn.execute("COMMIT")
+        finally:
+            self.kapat()
+
+    def geri_al(self):
+        if self.conn is None:
+            return
+        try:
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+        except Exception as e:
+            logging.error(f"İş birimi geri alma hatası: {str(e)}")
+        finally:
+            self.kapat()
+
+    def kapat(self):
+        self.conn.close()
+        self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.tamamla()
+        else:
+            self.geri_al()
+        return False
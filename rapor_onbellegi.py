@@ -0,0 +1,74 @@
+"""
+Taşınmaz başına, veri sürümüne bağlı rapor önbelleği
+
+Her taşınmazın veri_surumu tablosunda bir sürüm numarası vardır. Taşınmazın
+verisini değiştiren işlemler (içeri aktarma, düzenleme) sürümü artırır; silme
+işlemleri sürüm ve önbellek kayıtlarını birlikte siler. Raporlar (taşınmaz,
+tür) anahtarıyla üretildikleri sürümle saklanır; sürümü tutmayan kayıt okunmaz
+ve rapor yeniden üretilir. Sürüm kaydı olmayan taşınmazlar önbelleğe alınmaz.
+
+Rapor türü adları biçim numarası taşır (ör. 'tekli_rapor/1'); raporun biçimi
+değiştiğinde numara artırılır, eski kayıtlar okunmaz.
+"""
+import logging
+import sqlite3
+
+
+def surum_artir(cursor, tasinmaz_kimlik):
+    """Taşınmazın veri sürümünü artırır; önbellekteki raporları geçersiz olur"""
+    cursor.execute(
+        "UPDATE veri_surumu SET surum = surum + 1 WHERE tasinmaz_kimlik = ?",
+        (tasinmaz_kimlik,)
+    )
+    if cursor.rowcount == 0:
+        cursor.execute(
+            "INSERT INTO veri_surumu (tasinmaz_kimlik, surum) VALUES (?, 1)",
+            (tasinmaz_kimlik,)
+        )
+
+
+def onbellekten_oku(cursor, tur, tasinmaz_kimlik=None):
+    """
+    Sürümü olan taşınmazlar için {kimlik: (sürüm, rapor)} döndürür
+
+    Rapor önbellekte yoksa veya eski bir sürüme aitse None'dır. Verilirse
+    yalnızca o taşınmaz okunur. Dönen sürüm, rapor yeniden üretildiğinde
+    onbellege_yaz'a verilir.
+    """
+    kosul, params = "", (tur,)
+    if tasinmaz_kimlik is not None:
+        kosul, params = "WHERE v.tasinmaz_kimlik = ?", (tur, tasinmaz_kimlik)
+
+    try:
+        cursor.execute(f"""
+            SELECT v.tasinmaz_kimlik, v.surum, r.icerik
+            FROM veri_surumu v
+            LEFT JOIN rapor_onbellegi r
+                ON r.tasinmaz_kimlik = v.tasinmaz_kimlik
+                AND r.tur = ?
+                AND r.surum = v.surum
+            {kosul}
+        """, params)
+    except sqlite3.OperationalError as e:
+        # Şema göçü uygulanmamış veritabanında raporlar önbelleksiz üretilir
+        logging.warning(f"Rapor önbelleği okunamadı: {str(e)}")
+        return {}
+
+    return {kimlik: (surum, icerik) for kimlik, surum, icerik in cursor.fetchall()}
+
+
+def onbellege_yaz(cursor, tur, kayitlar):
+    """
+    (kimlik, sürüm, rapor) kayıtlarını yazar; işlemi çağıran onaylar
+
+    Sürüm, rapor üretilmeden önce onbellekten_oku ile alınmış olmalıdır; arada
+    veri değiştiyse kayıt eski sürümle yazılır ve bir sonraki okumada kullanılmaz.
+    """
+    try:
+        cursor.executemany(
+            "INSERT OR REPLACE INTO rapor_onbellegi (tasinmaz_kimlik, tur, surum, icerik) VALUES (?, ?, ?, ?)",
+            [(kimlik, tur, surum, icerik) for kimlik, surum, icerik in kayitlar]
+        )
+    except sqlite3.OperationalError as e:
+        # Önbelleğe yazılamaması (ör. aktarım sürerken kilit) raporu etkilemez
+        logging.warning(f"Rapor önbelleğine yazılamadı: {str(e)}")
@@ -0,0 +1,94 @@
+import gzip
+import logging
+import os
+import pickle
+import tempfile
+
+
+# Kayıt biçimi değiştiğinde artırılır; eski dosyalar okunmaz, yeniden üretilir
+ONBELLEK_SURUMU = 1
+
+
+def varsayilan_onbellek_dizini(db_path):
+    """Sayfa önbelleği veritabanının yanındaki klasörde tutulur"""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), 'sayfa_onbellegi')
+
+
+def kelimeleri_paketle(kelimeler):
+    """Aynı anahtarlara sahip kelime sözlüklerini (anahtarlar, [değerler]) biçimine çevirir"""
+    if not kelimeler:
+        return ((), [])
+    anahtarlar = tuple(kelimeler[0])
+    if any(tuple(kelime) != anahtarlar for kelime in kelimeler):
+        return (None, kelimeler)
+    return (anahtarlar, [tuple(kelime.values()) for kelime in kelimeler])
+
+
+def kelimeleri_ac(paket):
+    anahtarlar, degerler = paket
+    if anahtarlar is None:
+        return degerler
+    return [dict(zip(anahtarlar, deger)) for deger in degerler]
+
+
+class SayfaOnbellegi:
+    """
+    Belge içerik özeti başına sayfa çıkarma sonuçlarını (kelimeler, metin, tablolar,
+    fitz span'leri) sıkıştırılmış tek bir dosyada saklar
+
+    Kayıtlar kütüphane sürüm etiketiyle birlikte yazılır; etiket tutmazsa kayıt
+    yok sayılır ve sayfa yeniden ayrıştırılır.
+    """
+
+    def __init__(self, dizin):
+        self.dizin = dizin
+
+    def dosya_yolu(self, ozet):
+        return os.path.join(self.dizin, ozet[:2], f"{ozet}.pkl.gz")
+
+    def yukle(self, ozet, etiket):
+        """Sayfa kayıtlarının listesini, yoksa veya geçersizse None döndürür"""
+        try:
+            with gzip.open(self.dosya_yolu(ozet), 'rb') as f:
+                kayit = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Sayfa önbelleği okunamadı ({ozet}): {str(e)}")
+            return None
+
+        if kayit.get('surum') != (ONBELLEK_SURUMU, etiket):
+            return None
+
+        sayfalar = kayit['sayfalar']
+        for sayfa in sayfalar:
+            sayfa['kelimeler'] = {
+                anahtar: kelimeleri_ac(paket) for anahtar, paket in sayfa['kelimeler'].items()
+            }
+        return sayfalar
+
+    def kaydet(self, ozet, etiket, sayfalar):
+        """Sayfa kayıtlarını atomik olarak yazar; aynı belgeyi yazan süreçler birbirini bozmaz"""
+        hedef = self.dosya_yolu(ozet)
+        gecici = None
+        try:
+            paketli = []
+            for sayfa in sayfalar:
+                sayfa = dict(sayfa)
+                sayfa['kelimeler'] = {
+                    anahtar: kelimeleri_paketle(kelimeler) for anahtar, kelimeler in sayfa['kelimeler'].items()
+                }
+                paketli.append(sayfa)
+
+            os.makedirs(os.path.dirname(hedef), exist_ok=True)
+            fd, gecici = tempfile.mkstemp(dir=os.path.dirname(hedef), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as ham, gzip.GzipFile(fileobj=ham, mode='wb', compresslevel=5) as f:
+                pickle.dump({'surum': (ONBELLEK_SURUMU, etiket), 'sayfalar': paketli}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(gecici, hedef)
+            return True
+
+        except Exception as e:
+            logging.error(f"Sayfa önbelleği yazma hatası ({ozet}): {str(e)}")
+            if gecici and os.path.exists(gecici):
+                os.remove(gecici)
+            return False
@@ -0,0 +1,531 @@
+import logging
+
+from takbis_belge import TakbisBelgesi
+from veritabani_sema import sema_guncelle
+from toplu_yazici import TopluYazici
+from filigran import filigran_harflerini_ayikla, filigran_temizle, filigran_temizle_hepsi
+
+
+KOORDINAT_EKLE_SQL = """
+    INSERT INTO koordinat_bilgileri_ext
+    (tapu_rowid, hucreno_1_deger, y_koordinat, tasinmaz_kimlik,
+     sayfano, satirno, baslik_deger)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# tapu_verileri kolonları, tablodaki sırasıyla
+TAPU_KOLONLARI = (
+    ['sayfano', 'satirno']
+    + [f'hucreno_{i}' for i in range(1, 12)]
+    + ['baslikontrol', 'tasinmaz_kimlik', 'takyidat_baslik',
+       'takyidat_1', 'takyidat_2', 'takyidat_3', 'y_koordinat', 'baslik_deger']
+)
+
+# tapu_verileri'nin 21 kolonunun tamamı konumsal olarak doldurulur
+TAPU_EKLE_SQL = f"INSERT INTO tapu_verileri VALUES ({','.join(['?'] * len(TAPU_KOLONLARI))})"
+
+
+class TableAnalyzer:
+    def __init__(self):
+        self.common_headers = [
+            "TAPU KAYIT BİLGİSİ",
+            "MUHDESAT BİLGİLERİ",
+            "TAŞINMAZA AİT ŞERH BEYAN İRTİFAK BİLGİLERİ",
+            "EKLENTİ BİLGİLERİ",
+            "MÜLKİYET BİLGİLERİ",
+            "TEFERRUAT BİLGİLERİ",
+            "MÜLKİYETE AİT ŞERH BEYAN İRTİFAK BİLGİLERİ",
+            "MÜLKİYETE AİT REHİN BİLGİLERİ"
+        ]
+        self.margin_threshold = 50  # Sol kenar boşluğu
+
+    def tapu_belgesi_kontrol(self, text):
+        """
+        Belgenin tapu belgesi olup olmadığını kontrol eder
+        """
+        # Basit başlık kontrolü
+        if "TAPU KAYIT BİLGİSİ" not in text:
+            logging.error("TAPU KAYIT BİLGİSİ başlığı bulunamadı")
+            return False
+
+        # Zorunlu alanların kontrolü
+        zorunlu_alanlar = [
+            "Zemin Tipi:",
+            "Taşınmaz Kimlik No:",
+            "İl/İlçe:",
+            "Ada/Parsel:"
+        ]
+
+        # En az 3 zorunlu alan bulunması yeterli
+        bulunan_alan_sayisi = sum(1 for alan in zorunlu_alanlar if alan in text)
+        if bulunan_alan_sayisi >= 3:
+            logging.info("Yeni Takbis ")
+            return True
+
+        logging.error("Yetersiz zorunlu alan sayısı")
+        return False
+
+    def tasinmaz_kimlik_no_al(self, text):
+        """
+        Metin içinden taşınmaz kimlik numarasını çıkarır
+        """
+        try:
+            # Direkt olarak "Taşınmaz Kimlik No:" satırını ara
+            for line in text.split('\n'):
+                if "Taşınmaz Kimlik No:" in line:
+                    # Numarayı AT'den önceki kısımdan al
+                    kimlik_no = line.split('Taşınmaz Kimlik No:')[1].split('AT')[0].strip()
+                    logging.info(f"Taşınmaz Kimlik No bulundu: {kimlik_no}")
+                    return kimlik_no
+
+            logging.error("Taşınmaz Kimlik No satırı bulunamadı")
+            return None
+
+        except Exception as e:
+            logging.error(f"Taşınmaz Kimlik No çıkarma hatası: {str(e)}")
+            return None
+
+    def create_ext_koordinat_table(self, db_path):
+        """Genişletilmiş koordinat tablosunu oluştur"""
+        return sema_guncelle(db_path)
+
+    def extract_fitz_coordinates(self, pdf_path, tasinmaz_kimlik, belge=None, db_path="veritabani.db"):
+        """Fitz ile koordinatları çıkar ve kaydet"""
+        kendi_belgesi = belge is None
+        try:
+            if kendi_belgesi:
+                belge = TakbisBelgesi(pdf_path)
+            satirlar = self.fitz_koordinatlarini_cikar(belge, tasinmaz_kimlik)
+            return self.koordinatlari_kaydet(db_path, satirlar)
+
+        except Exception as e:
+            logging.error(f"Fitz koordinat çıkarma hatası: {str(e)}")
+            return False
+        finally:
+            if kendi_belgesi and belge is not None:
+                belge.close()
+
+    def fitz_koordinatlarini_cikar(self, belge, tasinmaz_kimlik):
+        """Fitz span'lerinden koordinat satırlarını üretir; veritabanına dokunmaz"""
+        # Atlanacak ifadeler listesi
+        skip_texts = [
+            "veya Web Tapu anasayfasından",
+            "veya Web Tapu",
+            "kodunu Online İşlemler",
+            "kodunu Online",
+            "https://webtapu.tkgm.gov.tr",
+            "alanına yazarak doğrulayabilirsiniz",
+            "adresinden)",
+            "Kaydı Oluşturan:",
+            "Bu belgeyi akıllı telefonunuzdan karekod tarama programları ile aşağıdaki barkodu",
+            "taratarak;",
+            "akıllı telefonunuzdan",
+            "BU BELGE TOPLAM",
+            "BİLGİ AMAÇLIDIR",
+            "İl/İlçe:",
+            "Tesis Tarih - Yev",
+            "Tesis Kurum Tarih-Yevmiye",
+            "Tesis Kurum Tarih-",
+            "Tescil Tarih - Yev",
+            "Terkin Sebebi-",
+            "-",
+            "Ş/B/İ",
+            "_",
+            "Zemin Tipi:",
+            "Başvuru No",
+            "Bağımsız Bölüm Nitelik:",
+            "Bağımsız Bölüm Net",
+            "Bağımsız Bölüm Brüt",
+            "Arsa Pay/Payda:"
+            ]
+
+        skip_texts = [skip_text.lower() for skip_text in skip_texts]
+
+        satirlar = []
+        satirno = 0
+        for page_num, sayfa in enumerate(belge.sayfalar, 1):
+            for span in sayfa.fitz_spanlari():
+                text = span["text"].strip()
+                if text:  # Boş olmayan text
+                    # Atlanacak ifadeleri kontrol et
+                    text_lower = text.lower()
+                    skip = any(skip_text in text_lower for skip_text in skip_texts)
+
+                    if not skip:
+                        y_coord = span["origin"][1]  # y koordinatı
+                        satirno += 1
+                        satirlar.append((None, text, y_coord, tasinmaz_kimlik, page_num, satirno, None))
+
+        return satirlar
+
+    def koordinatlari_kaydet(self, db_path, satirlar):
+        """Çıkarılan koordinat satırlarını koordinat_bilgileri_ext tablosuna yazar"""
+        try:
+            yazici = TopluYazici(db_path)
+            yazici.ekle_hepsi(KOORDINAT_EKLE_SQL, satirlar)
+            yazici.bosalt()
+            return True
+
+        except Exception as e:
+            logging.error(f"Koordinat kaydetme hatası: {str(e)}")
+            return False
+
+    def tasinmaz_kayit_kontrol(self, tasinmaz_no, db_yolu):
+        """
+        Taşınmaz numarasının veritabanında olup olmadığını kontrol eder
+        """
+        import sqlite3
+        
+        try:
+            conn = sqlite3.connect(db_yolu)
+            cursor = conn.cursor()
+            
+            # Veritabanında taşınmazı ara
+            cursor.execute("""
+                SELECT COUNT(*) FROM tapu_verileri 
+                WHERE tasinmaz_kimlik = ?
+            """, (tasinmaz_no,))
+            
+            sayi = cursor.fetchone()[0]
+            return sayi > 0
+            
+        except Exception as e:
+            #print(f"Veritabanı kontrol hatası: {str(e)}")
+            return False
+            
+        finally:
+            if conn:
+                conn.close()
+
+    def tapu_belgesi_dogrula(self, text, db_yolu):
+        """
+        Ana doğrulama fonksiyonu - hem belge türünü hem mükerrer kaydı kontrol eder
+        """
+        # Önce tapu belgesi mi kontrol et
+        if not self.tapu_belgesi_kontrol(text):
+            return False, "Bu belge geçerli bir tapu belgesi değil."
+        
+        # Taşınmaz kimlik no'yu bul
+        tasinmaz_no = self.tasinmaz_kimlik_no_al(text)
+        if not tasinmaz_no:
+            return False, "Taşınmaz Kimlik No bulunamadı."
+        
+        # Mükerrer kayıt kontrolü
+        if self.tasinmaz_kayit_kontrol(tasinmaz_no, db_yolu):
+            return False, f"Bu taşınmaz (Kimlik No: {tasinmaz_no}) zaten veritabanında mevcut."
+        
+        return True, tasinmaz_no
+  
+    def clean_filigran(self, text):
+        """Filigran harflerini temizler ve metni düzenler"""
+        # Tek başına duran filigran harflerini temizle, fazla boşlukları tekilleştir
+        return filigran_harflerini_ayikla(text)
+
+    def validate_header_position(self, header, table_bbox, text_line):
+        """
+        Başlığın konumunun geçerli olup olmadığını kontrol eder
+    
+        Args:
+            header (str): Kontrol edilecek başlık metni
+            table_bbox (tuple): Tablo sınırlarını içeren koordinatlar
+            text_line (dict): Başlık satırının koordinat ve özelliklerini içeren sözlük
+        
+        Returns:
+            bool: Başlığın konumu geçerliyse True, değilse False
+        """
+        # Boş veya geçersiz başlık kontrolü
+        if not header or not isinstance(header, str):
+            return False
+        
+        # TAPU KAYIT BİLGİSİ için özel durum
+        if header == "TAPU KAYIT BİLGİSİ":
+            return text_line['x0'] <= 50  # Sol kenar kontrolü
+        
+        # MÜLKİYETE AİT REHİN BİLGİLERİ için özel durum
+        if header == "MÜLKİYETE AİT REHİN BİLGİLERİ":
+            # Sayfa sonunda olabilir, bu yüzden daha esnek kontrol
+            return True
+        
+        # Başlık tablonun üstünde olmalı ve sol kenara yakın olmalı
+        if text_line['top'] >= table_bbox[1] or text_line['x0'] > 50:
+            return False
+        
+        return True
+
+    def detect_header(self, page, table_bbox):
+        """Tablonun üstündeki başlığı tespit eder"""
+        try:
+            texts = page.extract_text_lines()
+            header = None
+            header_y = float('inf')
+            margin_threshold = 50  # Sol kenar boşluğu
+            prev_header = None  # Önceki sayfadan kalan başlık kontrolü için
+        
+            # Başlık grupları
+            no_underline_headers = [
+                "TAPU KAYIT BİLGİSİ"  # Bu başlık her zaman ilk sayfada ve altında çizgi yok
+            ]
+        
+            special_headers = [
+                "MÜLKİYET BİLGİLERİ",
+                "MÜLKİYETE AİT ŞERH BEYAN İRTİFAK BİLGİLERİ",
+                "MÜLKİYETE AİT REHİN BİLGİLERİ",
+                "TAŞINMAZA AİT ŞERH BEYAN İRTİFAK BİLGİLERİ"
+            ]
+        
+            secondary_headers = [
+                "TEFERRUAT BİLGİLERİ",
+                "EKLENTİ BİLGİLERİ",
+                "MUHDESAT BİLGİLERİ"
+            ]
+        
+            for text_line in texts:
+                raw_text = text_line['text'].strip()
+                text = ' '.join(raw_text.split()) if page.filigran_ayiklandi else self.clean_filigran(raw_text)
+            
+                if not text:
+                    continue
+            
+                # TAPU KAYIT BİLGİSİ özel kontrolü
+                if text in no_underline_headers:
+                    if text_line['x0'] <= margin_threshold:
+                        return text
+            
+                # Başlık kontrolü
+                if self.is_potential_header(text):
+                    if self.validate_header_position(text, table_bbox, text_line):
+                        # Yatay çizgi kontrolü
+                        has_underline = False
+                        for line in page.lines:
+                            if (line['top'] > text_line['bottom'] and 
+                                line['top'] < text_line['bottom'] + 30 and
+                                line['x0'] <= margin_threshold + 10):
+                                if abs(line['y0'] - line['y1']) < 5:  # Yatay çizgi
+                                    has_underline = True
+                                    break
+                    
+                        # Özel başlıklar veya altı çizili başlıklar için
+                        if text in special_headers:  # Ana başlıklar her durumda kabul edilir
+                            if text_line['top'] < header_y:
+                                prev_header = header
+                                header = text
+                                header_y = text_line['top']
+                        elif text in secondary_headers and has_underline:  # İkincil başlıklar çizgi gerektirir
+                            if text_line['top'] < header_y:
+                                prev_header = header
+                                header = text
+                                header_y = text_line['top']
+                
+            return header if header else prev_header
+            
+        except Exception as e:
+            logging.error(f"Başlık tespiti hatası: {str(e)}")
+            return None
+
+    def is_potential_header(self, text):
+        """Metnin başlık olma potansiyelini kontrol eder"""
+        if not text or len(text) < 5:
+            return False
+            
+        # Kesin başlıklar
+        exact_headers = [
+            "TAPU KAYIT BİLGİSİ",
+            "MÜLKİYETE AİT REHİN BİLGİLERİ",
+            "TAŞINMAZA AİT ŞERH BEYAN İRTİFAK BİLGİLERİ",
+            "MÜLKİYET BİLGİLERİ",
+            "MÜLKİYETE AİT ŞERH BEYAN İRTİFAK BİLGİLERİ",
+            "EKLENTİ BİLGİLERİ",
+            "MUHDESAT BİLGİLERİ"
+        ]
+        
+        # Tam eşleşme kontrolü
+        if text in exact_headers:
+            return True
+            
+        # Diğer başlık kontrolleri için mevcut mantığı koru
+        if text in self.common_headers:
+            return True
+            
+        if text.isupper() and ("BİLGİ" in text or "KAYIT" in text):
+            return True
+            
+        return False
+
+    def process_table(self, table, page):
+        processed_rows = []
+        try:
+            table_data = table.extract()
+            table_cells = table.cells
+    
+            if not table_data or not table_cells:
+                return []
+
+            # Sayfanın yüksekliğini al
+            page_height = page.height
+        
+            # Sayfadaki kelimelerin dizini (sayfa başına bir kez kurulur)
+            kelime_dizini = page.kelime_dizini(
+                x_tolerance=3, 
+                y_tolerance=3,
+                keep_blank_chars=True,
+                use_text_flow=False
+            )
+        
+            for row_idx, row_data in enumerate(table_data):
+                processed_cells = []
+            
+                # İlk hücre içeriği ve y koordinatını bul 
+                first_cell = str(row_data[0]).strip() if row_data else ''
+                y_coord = None
+            
+                if first_cell:
+                    # Y koordinatını bulmak için alternatif yöntemler
+                    # 1. Kelimelerden bulma
+                    matching_word = kelime_dizini.ilk_iceren(first_cell)
+                    if matching_word:
+                        y_coord = matching_word['top']
+                
+                    # 2. Tablo hücresinden alma (backup)
+                    if y_coord is None and table_cells and len(table_cells) > row_idx:
+                        cell = table_cells[row_idx][0]
+                        if cell and hasattr(cell, 'bbox'):
+                            y_coord = page_height - cell.bbox[3]  # Sayfanın altından mesafe
+                
+                    # 3. Son çare: Önceki satırdan tahmin
+                    if y_coord is None and processed_rows:
+                        last_y = processed_rows[-1]['y_position']
+                        if last_y is not None:
+                            y_coord = last_y + 20  # Ortalama satır yüksekliği
+            
+                hucreler = [
+                    str(cell_content).strip() if cell_content is not None else ''
+                    for cell_content in row_data
+                ]
+                if page.filigran_ayiklandi:
+                    # Filigran karakterleri çıkarılmadan önce ayıklandı; gerçek tek harfler korunur
+                    temiz_hucreler = [' '.join(hucre.split()) for hucre in hucreler]
+                else:
+                    # Satırın hücreleri filigrandan topluca temizlenir
+                    temiz_hucreler = filigran_temizle_hepsi(hucreler)
+
+                # Hücreleri işle
+                for col_idx, cell_content in enumerate(row_data):
+                    try:
+                        cell = table_cells[row_idx][col_idx] if row_idx < len(table_cells) and col_idx < len(table_cells[row_idx]) else None
+                    
+                        content = temiz_hucreler[col_idx]
+                        content = content.replace('BİLGİ AMAÇLIDIR', '').strip()
+                        content = ' '.join(content.split())
+                    
+                        processed_cells.append({
+                            'content': content,
+                            'bbox': cell.bbox if cell and hasattr(cell, 'bbox') else None
+                        })
+                    
+                    except Exception as cell_error:
+                        logging.error(f"Hücre işleme hatası [{row_idx}][{col_idx}]: {str(cell_error)}")
+                        processed_cells.append({
+                            'content': '',
+                            'bbox': None
+                        })
+            
+                if any(cell['content'] for cell in processed_cells):
+                    processed_rows.append({
+                        'cells': processed_cells,
+                        'y_position': y_coord
+                    })
+        
+            return processed_rows
+        
+        except Exception as e:
+            logging.error(f"Tablo işleme hatası: {str(e)}")
+            return []
+
+    def analyze_and_clean_filigran(self, text):
+        """Filigran harflerini ve kelimelerini temizler"""
+        return filigran_temizle(text)
+
+TABLO_AYARLARI = {
+    "vertical_strategy": "lines",
+    "horizontal_strategy": "lines",
+    "intersection_y_tolerance": 3,
+    "intersection_x_tolerance": 3
+}
+
+
+def enhanced_analyze_pdf(pdf_path: str, db_path: str, tasinmaz_kimlik_no: str, belge=None) -> bool:
+    kendi_belgesi = belge is None
+    try:
+        if kendi_belgesi:
+            belge = TakbisBelgesi(pdf_path)
+
+        satirlar = tablo_satirlarini_cikar(belge, tasinmaz_kimlik_no)
+        return tablo_satirlarini_kaydet(db_path, satirlar)
+
+    except Exception as e:
+        logging.error(f"PDF analiz hatası: {str(e)}")
+        return False
+    finally:
+        if kendi_belgesi and belge is not None:
+            belge.close()
+
+
+def tablo_satirlarini_cikar(belge, tasinmaz_kimlik_no: str) -> list:
+    """Belgedeki tablolardan tapu_verileri satırlarını üretir; veritabanına dokunmaz"""
+    table_analyzer = TableAnalyzer()
+
+    satirlar = []
+    current_row = 0
+    for page_num, page in enumerate(belge.sayfalar, 1):
+        tables = page.find_tables(table_settings=TABLO_AYARLARI)
+        
+        for table in tables:
+            processed_rows = table_analyzer.process_table(table, page)
+        
+            for row_data in processed_rows:
+                values = [page_num, current_row]
+                cell_values = []
+            
+                # Dict'ten sadece content değerlerini al
+                for cell in row_data['cells']:
+                    cell_values.append(cell['content'])
+            
+                # 11 hücreye tamamla
+                while len(cell_values) < 11:
+                    cell_values.append('')
+                
+                values.extend(cell_values)
+                values.extend([
+                    "HAYIR",
+                    tasinmaz_kimlik_no,
+                    "",  # takyidat_baslik
+                    "", "", ""
+                ])
+                
+                # Y koordinat bilgisini ekle
+                if 'y_position' in row_data:
+                    values.extend([row_data['y_position'], None])  # y_koordinat ve boş baslik_deger
+                else:
+                    values.extend([None, None])
+            
+                satirlar.append(values)
+                current_row += 1
+
+    return satirlar
+
+
+def tablo_satirlarini_kaydet(db_path: str, satirlar: list) -> bool:
+    """Çıkarılan tablo satırlarını tapu_verileri tablosuna yazar"""
+    try:
+        # Tabloların ve kolonların güncel olduğundan emin ol
+        if not sema_guncelle(db_path):
+            return False
+
+        yazici = TopluYazici(db_path)
+        yazici.ekle_hepsi(TAPU_EKLE_SQL, satirlar)
+        yazici.bosalt()
+        return True
+
+    except Exception as e:
+        logging.error(f"Tablo satırı kaydetme hatası: {str(e)}")
+        return False
@@ -0,0 +1,367 @@
+from bisect import bisect_left, bisect_right
+
+import pdfplumber
+import fitz  # PyMuPDF
+
+from aktarim_manifest import dosya_ozeti
+from filigran import FILIGRAN_HARFLERI
+
+# Önbellek kayıtları yalnızca aynı kütüphane sürümleriyle yeniden kullanılır
+KUTUPHANE_ETIKETI = f"pdfplumber {pdfplumber.__version__} / PyMuPDF {getattr(fitz, 'VersionBind', '')}"
+
+# Filigran ayıklama kuralları değiştiğinde artırılır (önbellek etiketine girer)
+FILIGRAN_AYIKLAMA_SURUMU = 2
+
+# Filigran çapraz yazılır; gerçek metin yataydır. Dönüş matrisinin b/c
+# bileşenleri bu değerden büyükse karakter eğik sayılır.
+EGIM_TOLERANSI = 0.01
+
+FILIGRAN_KARAKTERLERI = FILIGRAN_HARFLERI | frozenset(' ')
+
+# Çizgilerin önbelleğe yazılan alanları
+CIZGI_ALANLARI = ('x0', 'x1', 'top', 'bottom', 'y0', 'y1')
+
+
+def filigran_karakteri_mi(nesne):
+    """pdfplumber nesnesi eğik yazılmış bir filigran harfi veya boşluğu mu"""
+    if nesne.get('object_type') != 'char' or nesne.get('text') not in FILIGRAN_KARAKTERLERI:
+        return False
+    matris = nesne.get('matrix')
+    return bool(matris) and (abs(matris[1]) > EGIM_TOLERANSI or abs(matris[2]) > EGIM_TOLERANSI)
+
+
+def filigran_karakteri_degil(nesne):
+    return not filigran_karakteri_mi(nesne)
+
+
+def filigran_satiri_mi(satir):
+    """fitz satırı yalnızca filigran harflerinden oluşan eğik bir satır mı"""
+    yon = satir.get('dir', (1, 0))
+    if abs(yon[1]) <= EGIM_TOLERANSI:
+        return False
+    metin = ''.join(span['text'] for span in satir.get('spans', []))
+    return bool(metin.strip()) and all(karakter in FILIGRAN_KARAKTERLERI for karakter in metin)
+
+
+class TabloKaydi:
+    """find_tables sonucunun saklanabilir kopyası (bbox, cells ve extract() verisi)"""
+
+    def __init__(self, bbox, cells, veri):
+        self.bbox = bbox
+        self.cells = cells
+        self.veri = veri
+
+    @classmethod
+    def tablodan(cls, table):
+        return cls(table.bbox, table.cells, table.extract())
+
+    def extract(self):
+        return self.veri
+
+
+class KelimeDizini:
+    """
+    Bir sayfanın kelimeleri üzerinde konum ve metin dizini
+
+    Kelimeler top değerine göre sıralı tutulur; bir alandaki kelimeler ikili
+    aramayla bulunan y bandından seçilir. Metin aramaları kelimelerin
+    birleştirilmiş halinde str.find ile, tam eşleşmeler sözlükle yapılır.
+    Tüm sonuçlar sayfadaki (extract_words) sırayı korur.
+    """
+
+    AYRAC = '\x00'
+
+    def __init__(self, kelimeler):
+        self.kelimeler = kelimeler
+        self.ust_sirasi = sorted(range(len(kelimeler)), key=lambda i: kelimeler[i]['top'])
+        self.ustler = [kelimeler[i]['top'] for i in self.ust_sirasi]
+
+        # Birleşik metin ve her kelimenin başlangıç konumu
+        self.baslangiclar = []
+        konum = 0
+        for kelime in kelimeler:
+            self.baslangiclar.append(konum)
+            konum += len(kelime['text']) + 1
+        self.metin = self.AYRAC.join(kelime['text'] for kelime in kelimeler)
+
+        self.metinler = {}
+        for kelime in kelimeler:
+            self.metinler.setdefault(kelime['text'], []).append(kelime)
+
+        self.arama_onbellegi = {}
+
+    def alan(self, x0, x1, y0, y1, acik=False):
+        """
+        x0 <= kelime x0 <= x1 ve y0 <= kelime top <= y1 olan kelimeler
+
+        acik=True ise sınır değerleri dahil edilmez.
+        """
+        if acik:
+            bas, son = bisect_right(self.ustler, y0), bisect_left(self.ustler, y1)
+            sira = [i for i in self.ust_sirasi[bas:son] if x0 < self.kelimeler[i]['x0'] < x1]
+        else:
+            bas, son = bisect_left(self.ustler, y0), bisect_right(self.ustler, y1)
+            sira = [i for i in self.ust_sirasi[bas:son] if x0 <= self.kelimeler[i]['x0'] <= x1]
+        sira.sort()
+        return [self.kelimeler[i] for i in sira]
+
+    def alanlar(self, kutular):
+        """
+        Birden çok alanın kelimelerini tek taramada toplar
+
+        kutular: {anahtar: {'x0', 'x1', 'y0', 'y1'}}; her anahtarın sonucu
+        alan(x0, x1, y0, y1) ile aynıdır.
+        """
+        toplanan = {anahtar: [] for anahtar in kutular}
+        if not kutular or not self.kelimeler:
+            return toplanan
+
+        # Kutular y0 sırasıyla etkinleşir, top > y1 olunca düşer
+        bekleyen = sorted(kutular.items(), key=lambda kutu: kutu[1]['y0'])
+        en_alt = max(kutu['y1'] for kutu in kutular.values())
+        etkin = []
+        j = 0
+        for k in range(bisect_left(self.ustler, bekleyen[0][1]['y0']), len(self.ustler)):
+            top = self.ustler[k]
+            if top > en_alt:
+                break
+            while j < len(bekleyen) and bekleyen[j][1]['y0'] <= top:
+                etkin.append(bekleyen[j])
+                j += 1
+            etkin = [kutu for kutu in etkin if kutu[1]['y1'] >= top]
+
+            i = self.ust_sirasi[k]
+            x0 = self.kelimeler[i]['x0']
+            for anahtar, kutu in etkin:
+                if kutu['x0'] <= x0 <= kutu['x1']:
+                    toplanan[anahtar].append(i)
+
+        return {
+            anahtar: [self.kelimeler[i] for i in sorted(sira)]
+            for anahtar, sira in toplanan.items()
+        }
+
+    def ilk_iceren(self, parca):
+        """Metninde parca geçen ilk kelime; yoksa None"""
+        if parca not in self.arama_onbellegi:
+            kelime = None
+            if self.kelimeler and self.AYRAC not in parca:
+                konum = self.metin.find(parca)
+                if konum >= 0:
+                    kelime = self.kelimeler[bisect_right(self.baslangiclar, konum) - 1]
+            self.arama_onbellegi[parca] = kelime
+        return self.arama_onbellegi[parca]
+
+    def tam(self, metin):
+        """Metni tam olarak eşleşen kelimeler"""
+        return self.metinler.get(metin, [])
+
+
+class BelgeSayfasi:
+    """pdfplumber sayfasını sarar; kelime, metin, tablo ve fitz sonuçlarını bir kez hesaplayıp saklar"""
+
+    def __init__(self, belge, index, kayit=None):
+        self.belge = belge
+        self.index = index
+        self.page_number = index + 1
+        self.plumber_sayfasi = None
+        kayit = kayit or {}
+        self.boyut = kayit.get('boyut')
+        self.kelime_onbellegi = dict(kayit.get('kelimeler', {}))
+        self.dizinler = {}
+        self.metin_onbellegi = dict(kayit.get('metin', {}))
+        self.metin_satiri_onbellegi = dict(kayit.get('metin_satirlari', {}))
+        self.tablo_onbellegi = {
+            anahtar: [TabloKaydi(*tablo) for tablo in tablolar]
+            for anahtar, tablolar in kayit.get('tablolar', {}).items()
+        }
+        self.cizgiler = kayit.get('cizgiler')
+        self.spanlar = kayit.get('spanlar')
+        self.fitz_metin = kayit.get('fitz_metni')
+        # pdfplumber sayfasından eğik filigran karakterleri çıkarıldıysa True;
+        # bu sayfalarda metin üzerinde filigran temizliği gerekmez
+        self.filigran_ayiklandi = kayit.get('filigran_ayiklandi', False)
+
+    @property
+    def sayfa(self):
+        """Alttaki pdfplumber sayfası (ilk erişimde yüklenir, filigran karakterleri ayıklanmış olarak)"""
+        if self.plumber_sayfasi is None:
+            sayfa = self.belge.pdf.pages[self.index]
+            if self.belge.filigran_ayikla and any(filigran_karakteri_mi(karakter) for karakter in sayfa.chars):
+                # Kelimeler, metin ve tablolar filigran karakterleri olmadan kurulur
+                sayfa = sayfa.filter(filigran_karakteri_degil)
+                self.filigran_ayiklandi = True
+            self.plumber_sayfasi = sayfa
+        return self.plumber_sayfasi
+
+    def sayfa_boyutu(self):
+        if self.boyut is None:
+            self.boyut = (self.sayfa.width, self.sayfa.height)
+            self.belge.degisti = True
+        return self.boyut
+
+    @property
+    def width(self):
+        return self.sayfa_boyutu()[0]
+
+    @property
+    def height(self):
+        return self.sayfa_boyutu()[1]
+
+    @property
+    def lines(self):
+        """Sayfadaki çizgiler (yalnızca konum alanlarıyla saklanır)"""
+        if self.cizgiler is None:
+            self.cizgiler = [
+                {alan: line[alan] for alan in CIZGI_ALANLARI}
+                for line in self.sayfa.lines
+            ]
+            self.belge.degisti = True
+        return self.cizgiler
+
+    def extract_words(self, **kwargs):
+        """Aynı parametrelerle yapılan kelime çıkarma işlemini yalnızca bir kez yapar"""
+        anahtar = tuple(sorted(kwargs.items()))
+        if anahtar not in self.kelime_onbellegi:
+            self.kelime_onbellegi[anahtar] = self.sayfa.extract_words(**kwargs)
+            self.belge.degisti = True
+        return self.kelime_onbellegi[anahtar]
+
+    def kelime_dizini(self, **kwargs):
+        """extract_words(**kwargs) sonucu üzerinde KelimeDizini (parametreler başına bir kez)"""
+        anahtar = tuple(sorted(kwargs.items()))
+        if anahtar not in self.dizinler:
+            self.dizinler[anahtar] = KelimeDizini(self.extract_words(**kwargs))
+        return self.dizinler[anahtar]
+
+    def extract_text(self, **kwargs):
+        anahtar = tuple(sorted(kwargs.items()))
+        if anahtar not in self.metin_onbellegi:
+            self.metin_onbellegi[anahtar] = self.sayfa.extract_text(**kwargs)
+            self.belge.degisti = True
+        return self.metin_onbellegi[anahtar]
+
+    def extract_text_lines(self, **kwargs):
+        anahtar = tuple(sorted(kwargs.items()))
+        if anahtar not in self.metin_satiri_onbellegi:
+            self.metin_satiri_onbellegi[anahtar] = self.sayfa.extract_text_lines(**kwargs)
+            self.belge.degisti = True
+        return self.metin_satiri_onbellegi[anahtar]
+
+    def find_tables(self, table_settings=None):
+        """Tablo geometrisini ve hücre verisini ayarlar başına bir kez hesaplar"""
+        anahtar = tuple(sorted((table_settings or {}).items()))
+        if anahtar not in self.tablo_onbellegi:
+            self.tablo_onbellegi[anahtar] = [
+                TabloKaydi.tablodan(table)
+                for table in self.sayfa.find_tables(table_settings=table_settings)
+            ]
+            self.belge.degisti = True
+        return self.tablo_onbellegi[anahtar]
+
+    def fitz_spanlari(self):
+        """Sayfadaki tüm fitz span'lerini blok/satır sırasıyla düz liste olarak döndürür"""
+        if self.spanlar is None:
+            spanlar = []
+            blocks = self.belge.fitz_belgesi[self.index].get_text("dict")["blocks"]
+            for block in blocks:
+                for line in block.get("lines", []):
+                    if self.belge.filigran_ayikla and filigran_satiri_mi(line):
+                        continue
+                    spanlar.extend(line["spans"])
+            self.spanlar = spanlar
+            self.belge.degisti = True
+        return self.spanlar
+
+    def fitz_metni(self):
+        """
+        Sayfanın PyMuPDF ile çıkarılan düz metni (pdfplumber'a göre çok daha ucuz)
+
+        Her zaman (filigran satırları ayıklanmış) span'lerden birleştirilir; böylece
+        sonuç span'lerin önbellekte olup olmamasına bağlı değildir.
+        """
+        if self.fitz_metin is None:
+            self.fitz_metin = ' '.join(span['text'] for span in self.fitz_spanlari())
+            self.belge.degisti = True
+        return self.fitz_metin
+
+    def kayit(self):
+        """Sayfa önbelleğine yazılacak sonuçlar"""
+        return {
+            'boyut': self.boyut,
+            'kelimeler': self.kelime_onbellegi,
+            'metin': self.metin_onbellegi,
+            'metin_satirlari': self.metin_satiri_onbellegi,
+            'tablolar': {
+                anahtar: [(tablo.bbox, tablo.cells, tablo.veri) for tablo in tablolar]
+                for anahtar, tablolar in self.tablo_onbellegi.items()
+            },
+            'cizgiler': self.cizgiler,
+            'spanlar': self.spanlar,
+            'fitz_metni': self.fitz_metin,
+            'filigran_ayiklandi': self.filigran_ayiklandi,
+        }
+
+
+class TakbisBelgesi:
+    """
+    Bir Takbis PDF'ini bir kez açar ve sayfa verilerini tüm çıkarma aşamalarıyla paylaşır
+
+    onbellek (SayfaOnbellegi) verilirse sayfa sonuçları belge özetiyle diskten
+    yüklenir; PDF yalnızca önbellekte olmayan bir sonuç istendiğinde açılır ve
+    yeni sonuçlar close() sırasında önbelleğe yazılır.
+
+    filigran_ayikla True ise eğik yazılmış filigran karakterleri pdfplumber ve
+    fitz kelimeleri kurulmadan önce çıkarılır.
+    """
+
+    def __init__(self, pdf_path, onbellek=None, ozet=None, filigran_ayikla=True):
+        self.pdf_path = pdf_path
+        self.plumber_belgesi = None
+        self.fitz_nesnesi = None
+        self.onbellek = onbellek
+        self.ozet = ozet
+        self.degisti = False
+        self.filigran_ayikla = filigran_ayikla
+        self.etiket = f"{KUTUPHANE_ETIKETI} / filigran {FILIGRAN_AYIKLAMA_SURUMU if filigran_ayikla else '-'}"
+
+        sayfa_kayitlari = None
+        if onbellek is not None:
+            self.ozet = ozet or dosya_ozeti(pdf_path)
+            sayfa_kayitlari = onbellek.yukle(self.ozet, self.etiket)
+        if sayfa_kayitlari is None:
+            sayfa_kayitlari = [None] * len(self.pdf.pages)
+
+        self.sayfalar = [BelgeSayfasi(self, i, kayit) for i, kayit in enumerate(sayfa_kayitlari)]
+
+    @property
+    def pdf(self):
+        """pdfplumber belgesi yalnızca ihtiyaç olduğunda açılır"""
+        if self.plumber_belgesi is None:
+            self.plumber_belgesi = pdfplumber.open(self.pdf_path)
+        return self.plumber_belgesi
+
+    @property
+    def fitz_belgesi(self):
+        """PyMuPDF belgesi yalnızca ihtiyaç olduğunda açılır"""
+        if self.fitz_nesnesi is None:
+            self.fitz_nesnesi = fitz.open(self.pdf_path)
+        return self.fitz_nesnesi
+
+    def close(self):
+        if self.onbellek is not None and self.degisti:
+            self.onbellek.kaydet(self.ozet, self.etiket, [sayfa.kayit() for sayfa in self.sayfalar])
+            self.degisti = False
+        if self.fitz_nesnesi is not None:
+            self.fitz_nesnesi.close()
+            self.fitz_nesnesi = None
+        if self.plumber_belgesi is not None:
+            self.plumber_belgesi.close()
+            self.plumber_belgesi = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -0,0 +1,238 @@
+"""
+Takbis komut satırı aracı (arayüzsüz)
+
+Örnekler:
+    python takbis_cli.py aktar /veri/takbisler --isci 8 --cikti /veri/raporlar
+    python takbis_cli.py rapor --cikti /veri/raporlar
+    python takbis_cli.py rapor --excel hisse.xlsx --tasinmaz 12345678
+
+Çıkış kodları:
+    0  Tüm dosyalar işlendi / raporlar yazıldı
+    1  Bazı dosyalar veya raporlar başarısız oldu
+    2  Hatalı kullanım ya da işlem başlatılamadı
+"""
+import argparse
+import html
+import logging
+import multiprocessing
+import os
+import re
+import sys
+
+BASARILI = 0
+KISMEN_BASARISIZ = 1
+HATA = 2
+
+
+def pdf_dosyalarini_bul(yollar, ozyinelemeli=False):
+    """Verilen dosya/klasörlerdeki PDF dosyalarını sıralı liste olarak döndürür"""
+    dosyalar = []
+    for yol in yollar:
+        if os.path.isfile(yol):
+            dosyalar.append(os.path.abspath(yol))
+        elif os.path.isdir(yol):
+            if ozyinelemeli:
+                for kok, _, adlar in os.walk(yol):
+                    dosyalar.extend(os.path.join(kok, ad) for ad in adlar if ad.lower().endswith('.pdf'))
+            else:
+                dosyalar.extend(
+                    os.path.join(yol, ad) for ad in os.listdir(yol)
+                    if ad.lower().endswith('.pdf') and os.path.isfile(os.path.join(yol, ad))
+                )
+        else:
+            raise FileNotFoundError(f"Bulunamadı: {yol}")
+    return sorted(set(os.path.abspath(dosya) for dosya in dosyalar))
+
+
+def html_metne_cevir(metin):
+    """Arayüzde setHtml ile gösterilen raporu düz metne çevirir"""
+    metin = re.sub(r'\s+', ' ', metin)
+    metin = re.sub(r'<br\s*/?>', '\n', metin, flags=re.IGNORECASE)
+    metin = re.sub(r'<[^>]+>', '', metin)
+    metin = html.unescape(metin)
+    return '\n'.join(satir.strip() for satir in metin.split('\n')).strip() + '\n'
+
+
+def metin_yaz(dosya_yolu, icerik):
+    with open(dosya_yolu, 'w', encoding='utf-8') as f:
+        f.write(icerik)
+    logging.info(f"Yazıldı: {dosya_yolu}")
+
+
+def raporlari_yaz(args):
+    """İstenen raporları yazar; başarısız olan rapor sayısını döndürür"""
+    from takbis_inceleme import TakbisInceleme
+    from takbisler_inceleme import CokluInceleme
+
+    hedefler = {
+        'tekli': args.tekli,
+        'coklu': args.coklu,
+        'json': args.json,
+        'excel': args.excel,
+    }
+    if args.cikti:
+        os.makedirs(args.cikti, exist_ok=True)
+        varsayilanlar = {
+            'tekli': 'tekli_rapor.txt',
+            'coklu': 'coklu_rapor.txt',
+            'json': 'tum_tasinmazlar.json',
+            'excel': 'Hisse_Tablosu.xlsx',
+        }
+        for tur, ad in varsayilanlar.items():
+            hedefler[tur] = hedefler[tur] or os.path.join(args.cikti, ad)
+
+    hatali = 0
+
+    if hedefler['tekli']:
+        try:
+            metin_yaz(hedefler['tekli'], html_metne_cevir(TakbisInceleme(args.db).incele()))
+        except Exception as e:
+            logging.error(f"Tekli rapor hatası: {str(e)}")
+            hatali += 1
+
+    if hedefler['coklu'] or hedefler['json']:
+        try:
+            inceleme = CokluInceleme(args.db)
+            if args.akis:
+                # Rapor ve JSON taşınmaz taşınmaz dosyaya yazılır; veri belleğe toplanmaz
+                logging.info(inceleme.akis_raporu(
+                    hedefler['coklu'] or os.devnull, hedefler['json'], donustur=html_metne_cevir
+                ))
+            else:
+                if hedefler['coklu']:
+                    metin_yaz(hedefler['coklu'], html_metne_cevir(inceleme.incele()))
+                if hedefler['json']:
+                    logging.info(inceleme.save_json(hedefler['json']))
+        except Exception as e:
+            logging.error(f"Çoklu rapor hatası: {str(e)}")
+            hatali += 1
+
+    if hedefler['excel']:
+        try:
+            from hisse_tablosu import hisse_verilerini_al, hisse_tablosu_olustur
+
+            data = hisse_verilerini_al(args.db, args.tasinmaz)
+            if data:
+                hisse_tablosu_olustur(data, hedefler['excel'])
+                logging.info(f"Yazıldı: {hedefler['excel']}")
+            else:
+                logging.warning("Hisse tablosu için kayıt bulunamadı")
+        except Exception as e:
+            logging.error(f"Excel dışa aktarma hatası: {str(e)}")
+            hatali += 1
+
+    return hatali
+
+
+def aktar(args):
+    from toplu_aktarim import TopluAktarim
+
+    try:
+        dosyalar = pdf_dosyalarini_bul(args.yollar, args.ozyinelemeli)
+    except FileNotFoundError as e:
+        logging.error(str(e))
+        return HATA
+
+    if not dosyalar:
+        logging.error("İşlenecek PDF dosyası bulunamadı")
+        return HATA
+
+    logging.info(f"{len(dosyalar)} dosya içeri aktarılacak")
+
+    def ilerleme(file_path, index):
+        logging.info(f"[{index}/{len(dosyalar)}] {os.path.basename(file_path)}")
+
+    successful_files, failed_files = TopluAktarim(args.db, args.isci, args.onbellek, args.kuyruk).calistir(
+        dosyalar,
+        ilerleme=ilerleme,
+        detay=lambda mesaj: logging.info(mesaj.strip()) if mesaj.strip() else None
+    )
+
+    atlanan = len(dosyalar) - len(successful_files) - len(failed_files)
+    logging.info(
+        f"Toplam: {len(dosyalar)}  Başarılı: {len(successful_files)}  "
+        f"Atlanan: {atlanan}  Başarısız: {len(failed_files)}"
+    )
+    for file_path, hata in failed_files:
+        logging.error(f"BAŞARISIZ - {file_path}: {hata}")
+
+    hatali_rapor = raporlari_yaz(args)
+
+    if failed_files or hatali_rapor:
+        return KISMEN_BASARISIZ
+    return BASARILI
+
+
+def rapor(args):
+    if not os.path.exists(args.db):
+        logging.error(f"Veritabanı bulunamadı: {args.db}")
+        return HATA
+
+    if not any([args.cikti, args.tekli, args.coklu, args.json, args.excel]):
+        logging.error("En az bir rapor hedefi verin (--cikti, --tekli, --coklu, --json, --excel)")
+        return HATA
+
+    # Eski sürümle oluşturulmuş veritabanında eksik tablolar olabilir
+    from veritabani_sema import sema_guncelle
+    if not sema_guncelle(args.db):
+        return HATA
+
+    return KISMEN_BASARISIZ if raporlari_yaz(args) else BASARILI
+
+
+def rapor_secenekleri(parser):
+    parser.add_argument('--cikti', help="Tüm raporların yazılacağı klasör")
+    parser.add_argument('--tekli', help="Tekli inceleme raporu (txt)")
+    parser.add_argument('--coklu', help="Çoklu inceleme raporu (txt)")
+    parser.add_argument('--json', help="Tüm taşınmazların JSON çıktısı")
+    parser.add_argument('--excel', help="Hisse tablosu (xlsx)")
+    parser.add_argument('--tasinmaz', help="Hisse tablosunu tek bir taşınmazla sınırla")
+    parser.add_argument('--akis', action='store_true',
+                        help="Çoklu raporu ve JSON'u taşınmaz taşınmaz, ada/parsel sırasıyla yaz (büyük projeler; takyidat analizi eklenmez)")
+
+
+def arguman_ayristirici():
+    # Ortak seçenekler alt komuttan sonra da yazılabilsin
+    ortak = argparse.ArgumentParser(add_help=False)
+    ortak.add_argument('--db', default='veritabani.db', help="SQLite veritabanı (varsayılan: veritabani.db)")
+    ortak.add_argument('-v', '--ayrintili', action='store_true', help="Ayrıntılı günlük")
+    ortak.add_argument('-q', '--sessiz', action='store_true', help="Yalnızca hataları yaz")
+
+    parser = argparse.ArgumentParser(prog='takbis_cli', description="Takbis arayüzsüz içeri aktarma ve raporlama")
+    alt = parser.add_subparsers(dest='komut', required=True)
+
+    aktar_parser = alt.add_parser('aktar', parents=[ortak], help="PDF dosyalarını/klasörlerini içeri aktar")
+    aktar_parser.add_argument('yollar', nargs='+', help="PDF dosyaları veya klasörler")
+    aktar_parser.add_argument('-r', '--ozyinelemeli', action='store_true', help="Alt klasörleri de tara")
+    aktar_parser.add_argument('-j', '--isci', type=int, default=None, help="Ayrıştırma süreç sayısı (varsayılan: CPU sayısı)")
+    aktar_parser.add_argument('--onbellek', help="Sayfa önbelleği klasörü (varsayılan: veritabanı yanında sayfa_onbellegi)")
+    aktar_parser.add_argument('--kuyruk', type=int, default=None, help="Aşamalar arasında bekleyebilecek belge sayısı (varsayılan: 2 x süreç sayısı)")
+    rapor_secenekleri(aktar_parser)
+    aktar_parser.set_defaults(islem=aktar)
+
+    rapor_parser = alt.add_parser('rapor', parents=[ortak], help="Mevcut veritabanından rapor üret")
+    rapor_secenekleri(rapor_parser)
+    rapor_parser.set_defaults(islem=rapor)
+
+    return parser
+
+
+def main(argv=None):
+    args = arguman_ayristirici().parse_args(argv)
+
+    seviye = logging.WARNING if args.sessiz else logging.DEBUG if args.ayrintili else logging.INFO
+    logging.basicConfig(level=seviye, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    try:
+        return args.islem(args)
+    except KeyboardInterrupt:
+        logging.error("İşlem kullanıcı tarafından durduruldu")
+        return HATA
+    except Exception as e:
+        logging.exception(f"Beklenmeyen hata: {str(e)}")
+        return HATA
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
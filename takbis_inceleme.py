@@ -1,9 +1,15 @@
+import json
 import sqlite3
 import logging
 from datetime import datetime
+from rapor_onbellegi import onbellekten_oku, onbellege_yaz
 
 
 class TakbisInceleme:
+    # Önbellekteki rapor türleri; rapor biçimi değiştiğinde sondaki numara artırılır
+    TEKLI_RAPOR_ONBELLEK_TURU = 'tekli_rapor/1'
+    TUM_KAYITLAR_ONBELLEK_TURU = 'tum_kayitlar/1'
+
     def __init__(self, db_path="veritabani.db"):
         self.db_path = db_path
         logging.basicConfig(level=logging.INFO)
@@ -236,10 +242,13 @@ class TakbisInceleme:
             if not kayitlar:
                 return "Kayıt bulunamadı"
             
+            # Verisi değişmemiş taşınmazların bölümleri önbellekten alınır
+            onbellek = onbellekten_oku(cursor, self.TUM_KAYITLAR_ONBELLEK_TURU)
+            yeni_kayitlar = []
             tam_rapor = ""
         
             for index, (tasinmaz_no, tapu_tarih) in enumerate(kayitlar, 1):
-                ada, parsel, zemin_tipi, bb_detay = self.get_tasinmaz_detay(cursor, tasinmaz_no)
+                ada, parsel, bb_detay, bolumler = self.tasinmaz_parcalari(cursor, tasinmaz_no, onbellek, yeni_kayitlar)
             
                 if not ada or not parsel:
                     continue
@@ -258,72 +267,11 @@ class TakbisInceleme:
                         f" rapor ekinde yer alan Tapu Kayıt Belgesine göre <b>{ada}</b> Ada <b>{parsel}</b> Parsel"
                         f" nolu taşınmaz üzerinde aşağıda yer alan takyidat bulunmaktadır. <br>")                      
 
-                # Önce veritabanında bu başlıkların olup olmadığını kontrol edelim
-                cursor.execute("""
-                    SELECT DISTINCT takyidat_baslik 
-                    FROM tapu_verileri 
-                    WHERE tasinmaz_kimlik = ? 
-                    AND takyidat_baslik IN ('MUHDESAT BİLGİLERİ', 'EKLENTİ BİLGİLERİ')
-                    AND baslikontrol = 'HAYIR'
-                """, (tasinmaz_no,))
-                mevcut_basliklar = [row[0] for row in cursor.fetchall()]
-
-                # Eğer Muhdesat bilgileri varsa raporla
-                if 'MUHDESAT BİLGİLERİ' in mevcut_basliklar:
-                    muhdesat_kayitlar = self.get_muhdesat_bilgileri(cursor, tasinmaz_no)
-                    if muhdesat_kayitlar:
-                        rapor += "<br><b>Muhdesat Bilgileri Hanesinde;</b><br>"
-                        for kayit in muhdesat_kayitlar:
-                            formatted_line = self.format_muhdesat_line(kayit)
-                            rapor += formatted_line + "<br>"
-
-                # Eğer Eklenti bilgileri varsa raporla
-                if 'EKLENTİ BİLGİLERİ' in mevcut_basliklar:
-                    eklenti_kayitlar = self.get_eklenti_bilgileri(cursor, tasinmaz_no)
-                    if eklenti_kayitlar:
-                        rapor += "<br><b>Eklenti Bilgileri Hanesinde;</b><br>"
-                        for kayit in eklenti_kayitlar:
-                            formatted_line = self.format_muhdesat_line(kayit)  # Aynı format metodunu kullanabiliriz
-                            rapor += formatted_line + "<br>"
-                                                                                               
-                kayitlar = self.get_serh_beyan_bilgileri(cursor, tasinmaz_no)
-                rapor += "<br><b>Taşınmaza Ait Şerh Beyan İrtifak Bilgileri hanesinde;</b><br>"
-                if kayitlar:                    
-                    for kayit in kayitlar:
-                        formatted_line = self.format_line(kayit)
-                        rapor += formatted_line + "<br>"
-                else:
-                    rapor += "- Herhangi bir takyidat bulunmamaktadır.<br>"
-                
-                # Teferruat bilgileri
-                teferruat_kayitlar = self.get_teferruat_bilgileri(cursor, tasinmaz_no)
-                if teferruat_kayitlar:
-                    rapor += "<br><b>Teferruat Bilgileri hanesinde;</b><br>"
-                    for kayit in teferruat_kayitlar:
-                        formatted_line = self.format_teferruat_line(kayit)
-                        rapor += formatted_line + "<br>"
-
-                # Mülkiyete ait şerh beyan kayıtları                
-                mulkiyet_kayitlar = self.get_mulkiyet_serh_beyan_bilgileri(cursor, tasinmaz_no)                
-                rapor += "<br><b>Mülkiyete Ait Şerh Beyan İrtifak Bilgileri hanesinde;</b><br>"
-                if mulkiyet_kayitlar:                    
-                    for kayit in mulkiyet_kayitlar:
-                        formatted_line = self.format_mulkiyet_line(kayit)
-                        rapor += formatted_line + "<br>"
-                else:
-                    rapor += "- Herhangi bir takyidat bulunmamaktadır.<br>"
-                
-                # İpotek bilgileri                
-                ipotek_kayitlar = self.get_ipotek_bilgileri(cursor, tasinmaz_no)
-                rapor += "<br><b>Mülkiyete Ait Rehin Bilgileri Hanesinde;</b><br>"
-                if ipotek_kayitlar:                                                                   
-                    for kayit in ipotek_kayitlar:
-                        formatted_line = self.format_ipotek_line(kayit)
-                        rapor += formatted_line + "<br>"
-                else:
-                    rapor += "- Herhangi bir takyidat bulunmamaktadır.<br>"
-                
-                tam_rapor += rapor + "<br>" + "_" * 50 + "<br>"
+                tam_rapor += rapor + bolumler + "<br>" + "_" * 50 + "<br>"
+
+            if yeni_kayitlar:
+                onbellege_yaz(cursor, self.TUM_KAYITLAR_ONBELLEK_TURU, yeni_kayitlar)
+                conn.commit()
             
             return tam_rapor
         
@@ -334,6 +282,201 @@ class TakbisInceleme:
             if conn:
                 conn.close()
 
+    def tasinmaz_parcalari(self, cursor, tasinmaz_no, onbellek, yeni_kayitlar):
+        """
+        Taşınmazın [ada, parsel, bb_detay, bölümler] parçalarını döndürür
+
+        Önbellekte güncel kaydı varsa oradan alınır; yoksa üretilir ve sürümü
+        biliniyorsa yazılmak üzere yeni_kayitlar'a eklenir. Ada/parsel
+        bulunamazsa bölümler None'dır.
+        """
+        surum, icerik = onbellek.get(tasinmaz_no, (None, None))
+        if icerik is not None:
+            return json.loads(icerik)
+
+        ada, parsel, zemin_tipi, bb_detay = self.get_tasinmaz_detay(cursor, tasinmaz_no)
+        bolumler = self.tasinmaz_bolumleri(cursor, tasinmaz_no) if ada and parsel else None
+        parcalar = [ada, parsel, bb_detay, bolumler]
+
+        if surum is not None:
+            icerik = json.dumps(parcalar, ensure_ascii=False)
+            onbellek[tasinmaz_no] = (surum, icerik)
+            yeni_kayitlar.append((tasinmaz_no, surum, icerik))
+        return parcalar
+
+    def tasinmaz_bolumleri(self, cursor, tasinmaz_no):
+        """Tüm kayıtlar raporunda taşınmazın giriş cümlesinden sonraki hanelerini oluşturur"""
+        bolumler = ""
+
+        # Önce veritabanında bu başlıkların olup olmadığını kontrol edelim
+        cursor.execute("""
+            SELECT DISTINCT takyidat_baslik
+            FROM tapu_verileri
+            WHERE tasinmaz_kimlik = ?
+            AND takyidat_baslik IN ('MUHDESAT BİLGİLERİ', 'EKLENTİ BİLGİLERİ')
+            AND baslikontrol = 'HAYIR'
+        """, (tasinmaz_no,))
+        mevcut_basliklar = [row[0] for row in cursor.fetchall()]
+
+        # Eğer Muhdesat bilgileri varsa raporla
+        if 'MUHDESAT BİLGİLERİ' in mevcut_basliklar:
+            muhdesat_kayitlar = self.get_muhdesat_bilgileri(cursor, tasinmaz_no)
+            if muhdesat_kayitlar:
+                bolumler += "<br><b>Muhdesat Bilgileri Hanesinde;</b><br>"
+                for kayit in muhdesat_kayitlar:
+                    formatted_line = self.format_muhdesat_line(kayit)
+                    bolumler += formatted_line + "<br>"
+
+        # Eğer Eklenti bilgileri varsa raporla
+        if 'EKLENTİ BİLGİLERİ' in mevcut_basliklar:
+            eklenti_kayitlar = self.get_eklenti_bilgileri(cursor, tasinmaz_no)
+            if eklenti_kayitlar:
+                bolumler += "<br><b>Eklenti Bilgileri Hanesinde;</b><br>"
+                for kayit in eklenti_kayitlar:
+                    formatted_line = self.format_muhdesat_line(kayit)  # Aynı format metodunu kullanabiliriz
+                    bolumler += formatted_line + "<br>"
+
+        serh_beyan = self.get_serh_beyan_bilgileri(cursor, tasinmaz_no)
+        bolumler += "<br><b>Taşınmaza Ait Şerh Beyan İrtifak Bilgileri hanesinde;</b><br>"
+        if serh_beyan:
+            for kayit in serh_beyan:
+                formatted_line = self.format_line(kayit)
+                bolumler += formatted_line + "<br>"
+        else:
+            bolumler += "- Herhangi bir takyidat bulunmamaktadır.<br>"
+
+        # Teferruat bilgileri
+        teferruat_kayitlar = self.get_teferruat_bilgileri(cursor, tasinmaz_no)
+        if teferruat_kayitlar:
+            bolumler += "<br><b>Teferruat Bilgileri hanesinde;</b><br>"
+            for kayit in teferruat_kayitlar:
+                formatted_line = self.format_teferruat_line(kayit)
+                bolumler += formatted_line + "<br>"
+
+        # Mülkiyete ait şerh beyan kayıtları
+        mulkiyet_kayitlar = self.get_mulkiyet_serh_beyan_bilgileri(cursor, tasinmaz_no)
+        bolumler += "<br><b>Mülkiyete Ait Şerh Beyan İrtifak Bilgileri hanesinde;</b><br>"
+        if mulkiyet_kayitlar:
+            for kayit in mulkiyet_kayitlar:
+                formatted_line = self.format_mulkiyet_line(kayit)
+                bolumler += formatted_line + "<br>"
+        else:
+            bolumler += "- Herhangi bir takyidat bulunmamaktadır.<br>"
+
+        # İpotek bilgileri
+        ipotek_kayitlar = self.get_ipotek_bilgileri(cursor, tasinmaz_no)
+        bolumler += "<br><b>Mülkiyete Ait Rehin Bilgileri Hanesinde;</b><br>"
+        if ipotek_kayitlar:
+            for kayit in ipotek_kayitlar:
+                formatted_line = self.format_ipotek_line(kayit)
+                bolumler += formatted_line + "<br>"
+        else:
+            bolumler += "- Herhangi bir takyidat bulunmamaktadır.<br>"
+
+        return bolumler
+
+    def tekli_rapor(self, tasinmaz_no):
+        """Taşınmazın tekli raporunu döndürür, kayıt yoksa None; verisi değişmediyse önbellekten alınır"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            onbellek = onbellekten_oku(cursor, self.TEKLI_RAPOR_ONBELLEK_TURU, tasinmaz_no)
+            surum, rapor = onbellek.get(tasinmaz_no, (None, None))
+            if rapor is None:
+                rapor = self.tekli_rapor_olustur(cursor, tasinmaz_no)
+                if rapor is not None and surum is not None:
+                    onbellege_yaz(cursor, self.TEKLI_RAPOR_ONBELLEK_TURU, [(tasinmaz_no, surum, rapor)])
+                    conn.commit()
+            return rapor
+        finally:
+            conn.close()
+
+    def tekli_rapor_olustur(self, cursor, tasinmaz_no):
+        """Seçilen taşınmazın detaylı raporunu oluşturur; kayıt yoksa None döndürür"""
+        # Temel taşınmaz bilgilerini al
+        cursor.execute("""
+            SELECT t.tasinmaz_no, tt.tapu_tarih
+            FROM tasinmaz t
+            JOIN takbis_tarih tt ON t.tasinmaz_no = tt.tasinmaz_kimlik
+            WHERE t.tasinmaz_no = ?
+        """, (tasinmaz_no,))
+        kayit = cursor.fetchone()
+
+        if not kayit:
+            return None
+
+        ada, parsel, zemin_tipi, bb_detay = self.get_tasinmaz_detay(cursor, tasinmaz_no)
+        tarih, saat = self.format_datetime(kayit[1])
+
+        # Rapor başlığı ve giriş
+        rapor = f"<b>{ada} ADA / {parsel} PARSEL"
+        if bb_detay:
+            rapor += f" - {bb_detay}"
+        rapor += " TAKYİDATLARI</b><br><br>"
+
+        rapor += (f"TKGM Web-Tapu portaldan elektronik ortamda {tarih} tarih ve saat {saat} itibarıyla alınan ve "
+                 f"rapor ekinde yer alan Tapu Kayıt Belgesine göre <b>{ada}</b> Ada <b>{parsel}</b> Parsel "
+                 f"nolu taşınmaz üzerinde aşağıda yer alan takyidat bulunmaktadır.<br><br>")
+
+        # Muhdesat bilgileri
+        muhdesat_kayitlar = self.get_muhdesat_bilgileri(cursor, tasinmaz_no)
+        if muhdesat_kayitlar:
+            rapor += "<b>Muhdesat Bilgileri Hanesinde;</b><br>"
+            for kayit in muhdesat_kayitlar:
+                formatted_line = self.format_muhdesat_line(kayit)
+                rapor += formatted_line + "<br>"
+            rapor += "<br>"
+
+        # Eklenti bilgileri
+        eklenti_kayitlar = self.get_eklenti_bilgileri(cursor, tasinmaz_no)
+        if eklenti_kayitlar:
+            rapor += "<b>Eklenti Bilgileri Hanesinde;</b><br>"
+            for kayit in eklenti_kayitlar:
+                formatted_line = self.format_muhdesat_line(kayit)
+                rapor += formatted_line + "<br>"
+            rapor += "<br>"
+
+        # Şerh beyan bilgileri
+        serh_beyan = self.get_serh_beyan_bilgileri(cursor, tasinmaz_no)
+        rapor += "<b>Taşınmaza Ait Şerh Beyan İrtifak Bilgileri hanesinde;</b><br>"
+        if serh_beyan:
+            for kayit in serh_beyan:
+                rapor += self.format_line(kayit) + "<br>"
+        else:
+            rapor += "- Herhangi bir takyidat bulunmamaktadır.<br>"
+        rapor += "<br>"
+
+        # Teferruat bilgileri
+        teferruat_kayitlar = self.get_teferruat_bilgileri(cursor, tasinmaz_no)
+        if teferruat_kayitlar:
+            rapor += "<b>Teferruat Bilgileri hanesinde;</b><br>"
+            for kayit in teferruat_kayitlar:
+                formatted_line = self.format_teferruat_line(kayit)
+                rapor += formatted_line + "<br>"
+            rapor += "<br>"
+
+        # Mülkiyete ait şerh beyan bilgileri
+        mulkiyet_kayitlar = self.get_mulkiyet_serh_beyan_bilgileri(cursor, tasinmaz_no)
+        rapor += "<b>Mülkiyete Ait Şerh Beyan İrtifak Bilgileri hanesinde;</b><br>"
+        if mulkiyet_kayitlar:
+            for kayit in mulkiyet_kayitlar:
+                formatted_line = self.format_mulkiyet_line(kayit)
+                rapor += formatted_line + "<br>"
+        else:
+            rapor += "- Herhangi bir takyidat bulunmamaktadır.<br>"
+        rapor += "<br>"
+
+        # İpotek bilgileri
+        ipotek = self.get_ipotek_bilgileri(cursor, tasinmaz_no)
+        rapor += "<b>Mülkiyete Ait Rehin Bilgileri Hanesinde;</b><br>"
+        if ipotek:
+            for kayit in ipotek:
+                rapor += self.format_ipotek_line(kayit) + "<br>"
+        else:
+            rapor += "- Herhangi bir takyidat bulunmamaktadır.<br>"
+
+        return rapor
+
     def get_teferruat_bilgileri(self, cursor, tasinmaz_no):
         """Teferruat bilgilerini alır"""
         cursor.execute("""
@@ -1,24 +1,243 @@
-import sqlite3
+import copy
+import re
 from difflib import SequenceMatcher
 import logging
+from veritabani_sema import sema_guncelle, malik_sn_dizinle
+from filigran import rakam_arasi_filigran_temizle
+from rapor_onbellegi import surum_artir
+from is_birimi import baglanti_ac
+
+
+def kapsam_kosulu(tasinmaz_kimlik, sutun='tasinmaz_kimlik', baglac=' AND '):
+    """Taşınmaz kapsamı verilmişse sorguya eklenecek koşulu ve parametresini döndürür"""
+    if tasinmaz_kimlik is None:
+        return "", ()
+    return f"{baglac}{sutun} = ?", (tasinmaz_kimlik,)
+
+
+# Başlık tipleri
+BASLIK_TIPLERI = {
+    'kisitlama': {
+        'hucreno_1': ['Ş//', 'Ş.'],
+        'hucreno_2': ['Açıklama'],
+        'hucreno_3': ['Kısıtlı Malik', 'Malik (Hisse)'],
+        'hucreno_4': ['Malik/Lehtar'],
+        'hucreno_5': ['Tesis Kurum', 'Tarih- Yevmiye'],
+        'hucreno_6': ['Terkin Sebebi']
+    },
+    'kisitlama2': {
+        'hucreno_1': ['Ş//', 'Ş.'],
+        'hucreno_2': ['Açıklama'],
+        'hucreno_3': ['Kısıtlı Malik', 'Malik (Hisse)'],
+        'hucreno_4': ['Malik/Lehtar'],
+        'hucreno_5': ['Tesis Kurum', 'Tarih- Yevmiye'],
+        'hucreno_6': ['Terkin Sebebi', 'Terkin Sebebi- Tarih- Yevmiye'],
+    },
+    'sistem_bilgi': { 
+        'hucreno_1': ['Sistem No'],
+        'hucreno_2': ['Tip'],
+        'hucreno_3': ['Tanım'],
+        'hucreno_4': ['Adet'],
+        'hucreno_5': ['Deger'],
+        'hucreno_6': ['Tesis Kurum', 'Tarih- Yevmiye']
+    },
+    'serh_beyan': {
+        'hucreno_1': ['Ş//', 'Ş.'],
+        'hucreno_2': ['Açıklama'],
+        'hucreno_3': ['Malik/Lehtar'],
+        'hucreno_4': ['Tesis Kurum'],
+        'hucreno_5': ['Terkin']
+    },
+    'ipotek': {
+        'hucreno_1': ['İpotek', 'Ipotek', 'IPOTEK', 'İPOTEK'],
+        'hucreno_2': ['Hisse Pay', 'Payda'],
+        'hucreno_3': ['Borçlu'],
+        'hucreno_4': ['Malik'],
+        'hucreno_5': ['Tescil'],
+        'hucreno_6': ['Terkin']
+    },
+    'ipotek_2': {
+        'hucreno_1': ['Taşınmaz'],
+        'hucreno_2': ['Hisse Pay', 'Pay/Payda'],
+        'hucreno_3': ['Borçlu', 'Borçlu Malik'],
+        'hucreno_4': ['Malik', 'Borç'],
+        'hucreno_5': ['Tescil', 'Tarih - Yev'],
+        'hucreno_6': ['Terkin', 'Terkin Sebebi', 'Tarih Yev']
+    },
+    'ipotek_detay': {
+        'hucreno_1': ['Alacaklı'],
+        'hucreno_2': ['Müşterek'],
+        'hucreno_3': ['Borç'],
+        'hucreno_4': ['Faiz'],
+        'hucreno_5': ['Derece'],
+        'hucreno_6': ['Süre'],
+        'hucreno_7': ['Tesis']
+    } ,
+    'malik_bilgi': {
+        'hucreno_1': ['Hisse', 'Sistem'],
+        'hucreno_2': ['Malik'],
+        'hucreno_3': ['El Birliği'],
+        'hucreno_4': ['Pay'],
+        'hucreno_5': ['Metrekare'],
+        'hucreno_6': ['Toplam'],
+        'hucreno_7': ['Edinme'],
+        'hucreno_8': ['Terkin']
+    },
+    'tekli_ipotek': {
+        'hucreno_1': ['Ipotek'],
+        'hucreno_2': ['',' '],
+        'hucreno_3': ['',' '],
+        'hucreno_4': ['',' '],
+        'hucreno_5': ['',' '],
+        'hucreno_6': ['',' '],
+        'hucreno_7': ['',' '],
+        'hucreno_8': ['',' ']
+    },
+    'hissedarm2': {
+        'hucreno_1': ['No'],
+        'hucreno_2': ['',' '],
+        'hucreno_3': ['No'],
+        'hucreno_4': ['Payda'],
+        'hucreno_5': ['',' '],
+        'hucreno_6': ['Metrekare'],
+        'hucreno_7': ['Sebebi-Tarih- Yevmiye','Sebebi-Tarih - Yevmiye'],
+        'hucreno_8': ['Tarih-Yevmiye']
+    }
+}
+
+# Sayfa 1 özel başlıkları
+SAYFA_BIR_BASLIKLARI = [
+    'Makbuz No',
+    'Dekont No',
+    'Başvuru No',
+    'Zemin Tipi:',
+    'Taşınmaz Kimlik No:',
+    'İl/İlçe:',
+    'Ada/Parsel:',
+    'Mahalle/Köy Adı:',
+    'Mevkii:',
+    'Cilt/Sayfa No:',
+    'Kayıt Durum:',
+    'Kurum Adı:',
+    'AT Yüzölçüm(m2):',
+    'Bağımsız Bölüm Nitelik:',
+    'Bağımsız Bölüm Brüt YüzÖlçümü:',
+    'Bağımsız Bölüm Net YüzÖlçümü:',
+    'Blok/Kat/Giriş/BBNo:',
+    'Arsa Pay/Payda:',
+    'Ana Taşınmaz Nitelik:'
+]
+
+# Tekli ipotek özel kontrolü için yazım biçimleri
+IPOTEK_YAZIMLARI = ['ipotek', 'ıpotek', 'İpotek', 'IPOTEK', 'İPOTEK']
+
+
+class BaslikSiniflandirici:
+    """
+    TapuProcessor.is_header kurallarının derlenmiş hali
+
+    Aday başlıklar bir kez hazırlanır: birebir eşleşmeler sözlükten, yakın
+    eşleşmeler uzunluk sınırı ve quick_ratio ön elemesinden geçtikten sonra
+    SequenceMatcher ile kontrol edilir. Hücre sonuçları (kolon, değer) başına
+    önbellekte tutulur. Sonuçlar is_header ile birebir aynıdır.
+    """
+
+    ESIK = 0.8  # Benzerlik eşiği
+    GEREKEN_ESLESME = 2  # En az 2 hücre eşleşmesi gerekiyor
+    ONBELLEK_SINIRI = 100000
+
+    def __init__(self, baslik_tipleri=None, sayfa_bir_basliklari=None):
+        baslik_tipleri = BASLIK_TIPLERI if baslik_tipleri is None else baslik_tipleri
+        sayfa_bir_basliklari = SAYFA_BIR_BASLIKLARI if sayfa_bir_basliklari is None else sayfa_bir_basliklari
+
+        self.ipotek_yazimlari = {variant.lower() for variant in IPOTEK_YAZIMLARI}
+        self.sayfa_bir_adaylari = [header.lower() for header in sayfa_bir_basliklari]
+
+        # kolon -> {aday metin: başlık tipi indeksleri}
+        self.kolon_adaylari = {}
+        for tip_no, patterns in enumerate(baslik_tipleri.values()):
+            for column, expected_values in patterns.items():
+                adaylar = self.kolon_adaylari.setdefault(column, {})
+                for expected in expected_values:
+                    adaylar.setdefault(expected.lower(), set()).add(tip_no)
+
+        # Aday metin -> ikinci dizisi hazır SequenceMatcher
+        self.eslestiriciler = {}
+        for aday in self.sayfa_bir_adaylari:
+            self.eslestirici_ekle(aday)
+        for adaylar in self.kolon_adaylari.values():
+            for aday in adaylar:
+                self.eslestirici_ekle(aday)
+
+        self.sayfa_bir_onbellegi = {}
+        self.hucre_onbellegi = {}
+
+    def eslestirici_ekle(self, aday):
+        if aday not in self.eslestiriciler:
+            eslestirici = SequenceMatcher(None)
+            eslestirici.set_seq2(aday)
+            self.eslestiriciler[aday] = eslestirici
+
+    def benzer_mi(self, metin, aday):
+        """SequenceMatcher(None, metin, aday).ratio() > ESIK ile aynı sonucu verir"""
+        if metin == aday:
+            return True
 
+        # real_quick_ratio ile aynı üst sınır
+        uzunluk = len(metin) + len(aday)
+        if not uzunluk or 2.0 * min(len(metin), len(aday)) / uzunluk <= self.ESIK:
+            return False
 
-class TapuProcessor:
-    def __init__(self, db_path):
-        self.db_path = db_path
-    
-    # isheader fonk call    
-    def similar(self, a, b):
-        return SequenceMatcher(None, str(a).lower(), str(b).lower()).ratio()
-    
-    # updateheader fonk call
-    def is_header(self, row):
+        eslestirici = self.eslestiriciler[aday]
+        eslestirici.set_seq1(metin)
+        return eslestirici.quick_ratio() > self.ESIK and eslestirici.ratio() > self.ESIK
+
+    def sayfa_bir_basligi_mi(self, first_cell):
+        sonuc = self.sayfa_bir_onbellegi.get(first_cell)
+        if sonuc is None:
+            metin = first_cell.lower()
+            sonuc = any(self.benzer_mi(metin, aday) for aday in self.sayfa_bir_adaylari)
+            self.onbellege_yaz(self.sayfa_bir_onbellegi, first_cell, sonuc)
+        return sonuc
+
+    def hucre_tipleri(self, column, cell_value):
+        """Hücrenin eşleştiği başlık tiplerinin indekslerini döndürür"""
+        anahtar = (column, cell_value)
+        tipler = self.hucre_onbellegi.get(anahtar)
+        if tipler is None:
+            metin = cell_value.lower()
+            tipler = set()
+            for aday, aday_tipleri in self.kolon_adaylari[column].items():
+                if not aday_tipleri <= tipler and self.benzer_mi(metin, aday):
+                    tipler |= aday_tipleri
+            tipler = frozenset(tipler)
+            self.onbellege_yaz(self.hucre_onbellegi, anahtar, tipler)
+        return tipler
+
+    def is_parcacigi_kopyasi(self):
+        """Önbellekleri paylaşan, kendi eşleştiricileri olan bir kopya döndürür
+
+        SequenceMatcher nesneleri her karşılaştırmada değiştirildiği için iki
+        iş parçacığı aynı sınıflandırıcıyı kullanamaz; önbellek sonuçları ise
+        deterministik olduğundan paylaşılabilir.
+        """
+        kopya = copy.copy(self)
+        kopya.eslestiriciler = {}
+        for aday in self.eslestiriciler:
+            kopya.eslestirici_ekle(aday)
+        return kopya
+
+    def onbellege_yaz(self, onbellek, anahtar, deger):
+        if len(onbellek) >= self.ONBELLEK_SINIRI:
+            onbellek.clear()
+        onbellek[anahtar] = deger
+
+    def baslik_mi(self, row):
         """Satırın başlık olup olmadığını kontrol eder"""
-    
+
         # Tekli ipotek özel kontrolü
         first_cell = str(row.get('hucreno_1', '')).strip().lower()
-        ipotek_variants = ['ipotek', 'ıpotek', 'İpotek', 'IPOTEK', 'İPOTEK']
-        if first_cell and any(variant.lower() == first_cell for variant in ipotek_variants):
+        if first_cell and first_cell in self.ipotek_yazimlari:
             # Diğer hücrelerin boş olduğunu kontrol et
             other_cells_empty = all(
                 not str(row.get(f'hucreno_{i}', '')).strip() 
@@ -26,248 +245,178 @@ class TapuProcessor:
             )
             if other_cells_empty:
                 return True
-            
+
         # Boş satır kontrolü
         if not any(str(value).strip() for value in row.values() if value is not None):
             return False
-    
-
-        # Başlık tipleri
-        header_types = {
-            'kisitlama': {
-                'hucreno_1': ['Ş//', 'Ş.'],
-                'hucreno_2': ['Açıklama'],
-                'hucreno_3': ['Kısıtlı Malik', 'Malik (Hisse)'],
-                'hucreno_4': ['Malik/Lehtar'],
-                'hucreno_5': ['Tesis Kurum', 'Tarih- Yevmiye'],
-                'hucreno_6': ['Terkin Sebebi']
-            },
-            'kisitlama2': {
-                'hucreno_1': ['Ş//', 'Ş.'],
-                'hucreno_2': ['Açıklama'],
-                'hucreno_3': ['Kısıtlı Malik', 'Malik (Hisse)'],
-                'hucreno_4': ['Malik/Lehtar'],
-                'hucreno_5': ['Tesis Kurum', 'Tarih- Yevmiye'],
-                'hucreno_6': ['Terkin Sebebi', 'Terkin Sebebi- Tarih- Yevmiye'],
-            },
-            'sistem_bilgi': { 
-                'hucreno_1': ['Sistem No'],
-                'hucreno_2': ['Tip'],
-                'hucreno_3': ['Tanım'],
-                'hucreno_4': ['Adet'],
-                'hucreno_5': ['Deger'],
-                'hucreno_6': ['Tesis Kurum', 'Tarih- Yevmiye']
-            },
-            'serh_beyan': {
-                'hucreno_1': ['Ş//', 'Ş.'],
-                'hucreno_2': ['Açıklama'],
-                'hucreno_3': ['Malik/Lehtar'],
-                'hucreno_4': ['Tesis Kurum'],
-                'hucreno_5': ['Terkin']
-            },
-            'ipotek': {
-                'hucreno_1': ['İpotek', 'Ipotek', 'IPOTEK', 'İPOTEK'],
-                'hucreno_2': ['Hisse Pay', 'Payda'],
-                'hucreno_3': ['Borçlu'],
-                'hucreno_4': ['Malik'],
-                'hucreno_5': ['Tescil'],
-                'hucreno_6': ['Terkin']
-            },
-            'ipotek_2': {
-                'hucreno_1': ['Taşınmaz'],
-                'hucreno_2': ['Hisse Pay', 'Pay/Payda'],
-                'hucreno_3': ['Borçlu', 'Borçlu Malik'],
-                'hucreno_4': ['Malik', 'Borç'],
-                'hucreno_5': ['Tescil', 'Tarih - Yev'],
-                'hucreno_6': ['Terkin', 'Terkin Sebebi', 'Tarih Yev']
-            },
-            'ipotek_detay': {
-                'hucreno_1': ['Alacaklı'],
-                'hucreno_2': ['Müşterek'],
-                'hucreno_3': ['Borç'],
-                'hucreno_4': ['Faiz'],
-                'hucreno_5': ['Derece'],
-                'hucreno_6': ['Süre'],
-                'hucreno_7': ['Tesis']
-            } ,
-            'malik_bilgi': {
-                'hucreno_1': ['Hisse', 'Sistem'],
-                'hucreno_2': ['Malik'],
-                'hucreno_3': ['El Birliği'],
-                'hucreno_4': ['Pay'],
-                'hucreno_5': ['Metrekare'],
-                'hucreno_6': ['Toplam'],
-                'hucreno_7': ['Edinme'],
-                'hucreno_8': ['Terkin']
-            },
-            'tekli_ipotek': {
-                'hucreno_1': ['Ipotek'],
-                'hucreno_2': ['',' '],
-                'hucreno_3': ['',' '],
-                'hucreno_4': ['',' '],
-                'hucreno_5': ['',' '],
-                'hucreno_6': ['',' '],
-                'hucreno_7': ['',' '],
-                'hucreno_8': ['',' ']
-            },
-            'hissedarm2': {
-                'hucreno_1': ['No'],
-                'hucreno_2': ['',' '],
-                'hucreno_3': ['No'],
-                'hucreno_4': ['Payda'],
-                'hucreno_5': ['',' '],
-                'hucreno_6': ['Metrekare'],
-                'hucreno_7': ['Sebebi-Tarih- Yevmiye','Sebebi-Tarih - Yevmiye'],
-                'hucreno_8': ['Tarih-Yevmiye']
-            }
-        }
-    
-        # Sayfa 1 özel başlıkları
-        page_one_headers = [
-            'Makbuz No',
-            'Dekont No',
-            'Başvuru No',
-            'Zemin Tipi:',
-            'Taşınmaz Kimlik No:',
-            'İl/İlçe:',
-            'Ada/Parsel:',
-            'Mahalle/Köy Adı:',
-            'Mevkii:',
-            'Cilt/Sayfa No:',
-            'Kayıt Durum:',
-            'Kurum Adı:',
-            'AT Yüzölçüm(m2):',
-            'Bağımsız Bölüm Nitelik:',
-            'Bağımsız Bölüm Brüt YüzÖlçümü:',
-            'Bağımsız Bölüm Net YüzÖlçümü:',
-            'Blok/Kat/Giriş/BBNo:',
-            'Arsa Pay/Payda:',
-            'Ana Taşınmaz Nitelik:'
-        ]
 
         # Sayfa 1 başlık kontrolü
-        first_cell = str(row.get('hucreno_1', '')).strip()
-        for header in page_one_headers:
-            if self.similar(first_cell, header) > 0.8:  # Benzerlik eşiği
-                return True
-    
+        if self.sayfa_bir_basligi_mi(str(row.get('hucreno_1', '')).strip()):
+            return True
+
         # Diğer başlık tipleri kontrolü
-        for header_type, patterns in header_types.items():
-            matches = 0
-            required_matches = 2  # En az 2 hücre eşleşmesi gerekiyor
-        
-            for column, expected_values in patterns.items():
-                if column not in row:
-                    continue
-                
-                cell_value = str(row[column]).strip().lower()
-                if not cell_value:
-                    continue
-                
-                for expected in expected_values:
-                    if self.similar(cell_value, expected.lower()) > 0.8:
-                        matches += 1
-                        break
-                    
-            if matches >= required_matches:
-                return True
-            
+        eslesmeler = {}
+        for column in self.kolon_adaylari:
+            if column not in row:
+                continue
+
+            cell_value = str(row[column]).strip().lower()
+            if not cell_value:
+                continue
+
+            for tip_no in self.hucre_tipleri(column, cell_value):
+                eslesmeler[tip_no] = eslesmeler.get(tip_no, 0) + 1
+                if eslesmeler[tip_no] >= self.GEREKEN_ESLESME:
+                    return True
+
         return False
 
+    def satirlari_siniflandir(self, satirlar, kolonlar):
+        """Demet halindeki satırların başlık olup olmadığını döndürür; sonuçlar önbelleğe de yazılır"""
+        return [self.baslik_mi(dict(zip(kolonlar, satir))) for satir in satirlar]
+
+
+siniflandirici_nesnesi = None
+
+
+def baslik_siniflandirici():
+    """Süreç başına bir kez derlenen başlık sınıflandırıcısını döndürür"""
+    global siniflandirici_nesnesi
+    if siniflandirici_nesnesi is None:
+        siniflandirici_nesnesi = BaslikSiniflandirici()
+    return siniflandirici_nesnesi
+
+
+class TapuProcessor:
+    def __init__(self, db_path, tasinmaz_kimlik=None, is_birimi=None):
+        self.db_path = db_path
+        self.siniflandirici = baslik_siniflandirici()
+        # Verilirse tüm işlemler yalnızca bu taşınmazın kayıtlarıyla sınırlanır
+        self.tasinmaz_kimlik = tasinmaz_kimlik
+        # Verilirse tüm işlemler iş biriminin tek işleminde yapılır; hatalar
+        # yutulmaz, iş biriminin taşınmazı bütünüyle geri alması için iletilir
+        self.is_birimi = is_birimi
+
+    def baglan(self):
+        return baglanti_ac(self.db_path, self.is_birimi)
+    
+    # isheader fonk call    
+    def similar(self, a, b):
+        return SequenceMatcher(None, str(a).lower(), str(b).lower()).ratio()
+    
+    # updateheader fonk call
+    def is_header(self, row):
+        """Satırın başlık olup olmadığını kontrol eder"""
+        return self.siniflandirici.baslik_mi(row)
+
     #baslikontrol EVET, HAYIR yazımı
     def update_headers(self):
         """Veritabanındaki başlıkları günceller"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.baglan()
         cursor = conn.cursor()
     
         try:
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+
             # Sadece hucreno_11 değeri 'X' olmayan kayıtların başlık kontrollerini sıfırla
-            cursor.execute("""
+            cursor.execute(f"""
                 UPDATE tapu_verileri 
                 SET baslikontrol = 'HAYIR'
-                WHERE hucreno_11 IS NULL OR hucreno_11 != 'X'
-            """)          
+                WHERE (hucreno_11 IS NULL OR hucreno_11 != 'X'){kosul}
+            """, params)          
         
             # Sadece hucreno_11 değeri 'X' olmayan satırları kontrol et
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT rowid, * 
                 FROM tapu_verileri 
-                WHERE hucreno_11 IS NULL OR hucreno_11 != 'X'
-            """)
+                WHERE (hucreno_11 IS NULL OR hucreno_11 != 'X'){kosul}
+            """, params)
             rows = cursor.fetchall()
             columns = [description[0] for description in cursor.description]
         
+            # Başlık kontrolü
+            basliklar = []
             for row in rows:
                 row_dict = dict(zip(columns, row))
-                row_id = row_dict['rowid']
-            
-                # Başlık kontrolü
                 if self.is_header(row_dict):
-                    cursor.execute("""
-                        UPDATE tapu_verileri 
-                        SET baslikontrol = 'EVET' 
-                        WHERE rowid = ?
-                    """, (row_id,))
+                    basliklar.append((row_dict['rowid'],))
+
+            cursor.executemany("""
+                UPDATE tapu_verileri 
+                SET baslikontrol = 'EVET' 
+                WHERE rowid = ?
+            """, basliklar)
             
             conn.commit()            
         
         except Exception as e:            
             conn.rollback()
+            if self.is_birimi is not None:
+                raise
         finally:
             conn.close()
 
     #Verileri birleştirme işlemi
     def merge_rows(self):        
-        conn = sqlite3.connect(self.db_path)
+        """
+        Devam satırlarını (hucreno_1 boş) bir üstteki satırla birleştirir
+
+        Kapsamdaki satırlar bir kez okunur, birleştirme bellekte aşağıdan yukarı
+        tek geçişte yapılır ve yalnızca değişen satırlar toplu olarak yazılır.
+        """
+        conn = self.baglan()
         cursor = conn.cursor()
     
         try:
-            cursor.execute("""
-                SELECT MAX(rowid) 
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+
+            cursor.execute(f"""
+                SELECT MAX(rowid), MIN(rowid) 
                 FROM tapu_verileri 
-                WHERE hucreno_11 IS NULL OR hucreno_11 != 'X'
-            """)
-            max_id = cursor.fetchone()[0]
+                WHERE (hucreno_11 IS NULL OR hucreno_11 != 'X'){kosul}
+            """, params)
+            max_id, min_id = cursor.fetchone()
 
             if not max_id:  # İşlenecek kayıt yoksa
                 return True
-        
-            for current_id in range(max_id, 1, -1):
-                # Mevcut satırı al - sadece işlenmemiş kayıtlar
-                cursor.execute("""
-                    SELECT rowid, baslikontrol, hucreno_1, hucreno_2, hucreno_3, hucreno_4,
-                           hucreno_5, hucreno_6, hucreno_7, hucreno_8, hucreno_9, hucreno_10, hucreno_11
-                    FROM tapu_verileri 
-                    WHERE rowid = ?
-                    AND (hucreno_11 IS NULL OR hucreno_11 != 'X')
-                """, (current_id,))
 
-                current_row = cursor.fetchone()
-            
-                if not current_row:
+            # İlk işlenmemiş satırın üstü dahil tüm satırları bir kez oku
+            cursor.execute(f"""
+                SELECT rowid, baslikontrol, hucreno_1, hucreno_2, hucreno_3, hucreno_4,
+                       hucreno_5, hucreno_6, hucreno_7, hucreno_8, hucreno_9, hucreno_10, hucreno_11
+                FROM tapu_verileri 
+                WHERE rowid BETWEEN ? AND ?{kosul}
+            """, (min_id - 1, max_id, *params))
+            satirlar = {row[0]: list(row[1:]) for row in cursor.fetchall()}
+
+            guncellenenler = {}  # rowid -> birleştirilmiş üst satır
+            silinecekler = []
+
+            # Aşağıdan yukarı: birleştirilen üst satır sıradaki adımda mevcut satır olur
+            for current_id in sorted(satirlar, reverse=True):
+                if current_id < max(min_id, 2):
+                    break
+
+                current_row = satirlar[current_id]
+
+                # Sadece işlenmemiş kayıtlar
+                if current_row[11] == 'X':
                     continue
                 
                 # Başlık satırı veya hucreno_1 dolu ise atla
-                if current_row[1] == 'EVET' or (current_row[2] and current_row[2].strip()):
+                if current_row[0] == 'EVET' or (current_row[1] and current_row[1].strip()):
                     continue
             
-                # Bir üst satırı al
-                cursor.execute("""
-                    SELECT rowid, baslikontrol, hucreno_1, hucreno_2, hucreno_3, hucreno_4,
-                           hucreno_5, hucreno_6, hucreno_7, hucreno_8, hucreno_9, hucreno_10, hucreno_11
-                    FROM tapu_verileri 
-                    WHERE rowid = ?
-                """, (current_id - 1,))
-                upper_row = cursor.fetchone()
-            
-                if not upper_row or upper_row[1] == 'EVET':
+                # Bir üst satır (kapsam varsa aynı taşınmazdan)
+                upper_row = satirlar.get(current_id - 1)
+                if not upper_row or upper_row[0] == 'EVET':
                     continue
             
                 # Birleştirme işlemi
                 update_values = []
                 needs_update = False
             
-                for i in range(2, 13):  # hucreno_1'den hucreno_11'e
+                for i in range(1, 12):  # hucreno_1'den hucreno_11'e
                     upper_value = str(upper_row[i] or '').strip()
                     current_value = str(current_row[i] or '').strip()
                 
@@ -279,21 +428,25 @@ class TapuProcessor:
                         update_values.append(upper_value)
             
                 if needs_update:
-                    # Üst satırı güncelle
-                    cursor.execute("""
-                        UPDATE tapu_verileri 
-                        SET hucreno_1=?, hucreno_2=?, hucreno_3=?, hucreno_4=?,
-                            hucreno_5=?, hucreno_6=?, hucreno_7=?, hucreno_8=?,
-                            hucreno_9=?, hucreno_10=?, hucreno_11=?
-                        WHERE rowid = ?
-                    """, (*update_values, current_id - 1))
-                
-                    # Mevcut satırı işaretle
-                    cursor.execute("""
-                        UPDATE tapu_verileri 
-                        SET baslikontrol = 'SILINECEK'
-                        WHERE rowid = ?
-                    """, (current_id,))
+                    # Üst satırı güncelle, mevcut satırı işaretle
+                    upper_row[1:] = update_values
+                    guncellenenler[current_id - 1] = upper_row
+                    current_row[0] = 'SILINECEK'
+                    silinecekler.append((current_id,))
+
+            cursor.executemany("""
+                UPDATE tapu_verileri 
+                SET hucreno_1=?, hucreno_2=?, hucreno_3=?, hucreno_4=?,
+                    hucreno_5=?, hucreno_6=?, hucreno_7=?, hucreno_8=?,
+                    hucreno_9=?, hucreno_10=?, hucreno_11=?
+                WHERE rowid = ?
+            """, [(*row[1:], rowid) for rowid, row in guncellenenler.items()])
+
+            cursor.executemany("""
+                UPDATE tapu_verileri 
+                SET baslikontrol = 'SILINECEK'
+                WHERE rowid = ?
+            """, silinecekler)
         
             conn.commit()
             #print("Veri birleştirme tamamlandı")
@@ -301,47 +454,31 @@ class TapuProcessor:
         except Exception as e:
             #print(f"Hata: {e}")
             conn.rollback()
+            if self.is_birimi is not None:
+                raise
         finally:
             conn.close()
 
     def create_tasinmaz_table(self):
             """Taşınmaz tablosunu siler ve yeniden oluşturur"""
-            conn = sqlite3.connect(self.db_path)
+            conn = self.baglan()
             cursor = conn.cursor()
     
             try:
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS tasinmaz (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        tasinmaz_no TEXT UNIQUE,
-                        zemintipi TEXT,
-                        il_ilce TEXT,
-                        kurum_adi TEXT,
-                        mahalle TEXT,
-                        mevki TEXT,
-                        cilt_sayfa_no TEXT,
-                        kayitdurumu TEXT,
-                        ada_parsel TEXT,
-                        at_yuzolcum TEXT,
-                        bb_nitelik TEXT,
-                        bb_brüt_yuzolcum TEXT,
-                        bb_net_yuzolcum TEXT,
-                        blok_kat_girisi_bbno TEXT,
-                        arsa_pay_payda TEXT,
-                        ana_tasinmaz_nitelik TEXT,
-                        tapu_tarih TEXT,
-                        baslik_islem_yapildi BOOLEAN DEFAULT FALSE 
-                    )
-                """)
+                # Tablo şema göçüyle oluşturulur; iş birimi şemayı işlemi
+                # başlatırken zaten günceller
+                if self.is_birimi is None:
+                    sema_guncelle(self.db_path)
 
                 # Sadece işlenmemiş kayıtları al
-                cursor.execute("""
+                kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+                cursor.execute(f"""
                     SELECT rowid, hucreno_1, hucreno_2 
                     FROM tapu_verileri 
                     WHERE sayfano = 1
-                    AND (hucreno_11 IS NULL OR hucreno_11 != 'X')
+                    AND (hucreno_11 IS NULL OR hucreno_11 != 'X'){kosul}
                     ORDER BY rowid
-                """)
+                """, params)
                 rows = cursor.fetchall()
 
                 tapu_count = 0
@@ -461,63 +598,78 @@ class TapuProcessor:
             except Exception as e:
                 #print(f"Genel hata: {e}")
                 conn.rollback()
+                if self.is_birimi is not None:
+                    raise
             finally:
                 conn.close()
 
     #Tasinmaz numaralarini tapu_verileri tablosuna ekler
     def assign_tasinmaz_numbers(self):        
-        conn = sqlite3.connect(self.db_path)
+        """
+        İşlenmemiş satırları 'Makbuz No' satırlarından gruplara ayırır ve her gruba
+        kendisinden sonraki ilk 'Taşınmaz Kimlik No' değerini atar
+
+        Satırlar tek sorguyla okunur; yalnızca değeri değişen satırlar toplu güncellenir.
+        """
+        conn = self.baglan()
         cursor = conn.cursor()        
         try:
-            cursor.execute("""
-                WITH TapuBolum AS (
-                    SELECT 
-                        rowid,
-                        hucreno_1,
-                        hucreno_2,
-                        CASE 
-                            WHEN hucreno_1 = 'Makbuz No' THEN 1 
-                            ELSE 0 
-                        END as yeni_tapu_baslangic
-                    FROM tapu_verileri
-                    WHERE hucreno_11 IS NULL OR hucreno_11 != 'X'
-                    ORDER BY rowid
-                )
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+
+            # Kimlik satırı araması işlenmiş satırları da kapsadığından ilk işlenmemiş
+            # satırdan itibaren tüm satırlar okunur
+            cursor.execute(f"""
                 SELECT 
                     rowid,
-                    SUM(yeni_tapu_baslangic) OVER (ORDER BY rowid) as tapu_grup_no
-                FROM TapuBolum
-            """)
-        
-            gruplar = cursor.fetchall()
-        
-            # Her bir grup için taşınmaz numarasını bul ve güncelle
+                    tasinmaz_kimlik,
+                    (hucreno_11 IS NULL OR hucreno_11 != 'X') as islenmemis,
+                    hucreno_1 = 'Makbuz No' as yeni_tapu_baslangic,
+                    hucreno_1 LIKE '%Taşınmaz Kimlik No%' as kimlik_satiri,
+                    hucreno_2
+                FROM tapu_verileri
+                WHERE rowid >= (
+                    SELECT MIN(rowid) FROM tapu_verileri
+                    WHERE (hucreno_11 IS NULL OR hucreno_11 != 'X'){kosul}
+                ){kosul}
+                ORDER BY rowid
+            """, (*params, *params))
+            satirlar = cursor.fetchall()
+
+            # Her satır için kendisinden itibaren ilk 'Taşınmaz Kimlik No' satırı
+            sonraki_kimlik = [None] * len(satirlar)
+            bulunan = None
+            for i in range(len(satirlar) - 1, -1, -1):
+                if satirlar[i][4]:
+                    bulunan = (satirlar[i][5],)
+                sonraki_kimlik[i] = bulunan
+
+            # Her bir grup için taşınmaz numarasını bul
+            grup_no = 0
             current_grup = None
             current_tasinmaz = None
-        
-            for rowid, grup_no in gruplar:
+            guncellemeler = []
+
+            for i, (rowid, mevcut_kimlik, islenmemis, yeni_tapu_baslangic, _, _) in enumerate(satirlar):
+                if not islenmemis:
+                    continue
+
+                if yeni_tapu_baslangic:
+                    grup_no += 1
+
                 if grup_no != current_grup:
-                    # Yeni grup başladı, taşınmaz numarasını bul
-                    cursor.execute("""
-                        SELECT hucreno_2 
-                        FROM tapu_verileri 
-                        WHERE hucreno_1 LIKE '%Taşınmaz Kimlik No%'
-                        AND rowid >= ?
-                        ORDER BY rowid
-                        LIMIT 1
-                    """, (rowid,))
-                
-                    result = cursor.fetchone()
-                    if result:
-                        current_tasinmaz = result[0]
+                    # Yeni grup başladı; bulunamazsa önceki grubun numarası kullanılır
+                    if sonraki_kimlik[i]:
+                        current_tasinmaz = sonraki_kimlik[i][0]
                     current_grup = grup_no
             
-                if current_tasinmaz:
-                    cursor.execute("""
-                        UPDATE tapu_verileri
-                        SET tasinmaz_kimlik = ?
-                        WHERE rowid = ?
-                    """, (current_tasinmaz, rowid))
+                if current_tasinmaz and current_tasinmaz != mevcut_kimlik:
+                    guncellemeler.append((current_tasinmaz, rowid))
+
+            cursor.executemany("""
+                UPDATE tapu_verileri
+                SET tasinmaz_kimlik = ?
+                WHERE rowid = ?
+            """, guncellemeler)
         
             conn.commit()
             return True
@@ -525,24 +677,29 @@ class TapuProcessor:
         except Exception as e:
             #print(f"Hata: {e}")
             conn.rollback()
+            if self.is_birimi is not None:
+                raise
             return False
         finally:
             conn.close()
 
     def delete_marked_rows(self):
-        conn = sqlite3.connect(self.db_path)
+        conn = self.baglan()
         cursor = conn.cursor()
     
         try:
-            cursor.execute("""
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+            cursor.execute(f"""
                 DELETE FROM tapu_verileri 
                 WHERE baslikontrol = 'SILINECEK'
-                AND (hucreno_11 IS NULL OR hucreno_11 != 'X')
-            """)
+                AND (hucreno_11 IS NULL OR hucreno_11 != 'X'){kosul}
+            """, params)
             conn.commit()
         
         except Exception as e:
             conn.rollback()
+            if self.is_birimi is not None:
+                raise
         finally:
             conn.close()
 
@@ -551,17 +708,19 @@ class TapuProcessor:
         Belirli koşullara uyan kayıtların takyidat_baslik alanını günceller
         """
 
-        conn = sqlite3.connect(self.db_path)
+        conn = self.baglan()
         cursor = conn.cursor()
     
         try:
             updates = 0
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+
             # sayfa 1'deki tüm kayıtları al
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT rowid, hucreno_1, satirno 
                 FROM tapu_verileri 
-                WHERE sayfano = 1
-            """)
+                WHERE sayfano = 1{kosul}
+            """, params)
             records = cursor.fetchall()
         
             # Her kayıt için kontrol et
@@ -668,17 +827,38 @@ class TapuProcessor:
                     continue
                 
             # En son işlem olarak başarıyla işlenen kayıtları işaretle
-            cursor.execute("""
+            cursor.execute(f"""
                 UPDATE tapu_verileri 
                 SET hucreno_11 = 'X'
-                WHERE (hucreno_11 IS NULL OR hucreno_11 != 'X')
-            """)
+                WHERE (hucreno_11 IS NULL OR hucreno_11 != 'X'){kosul}
+            """, params)
         
             conn.commit()
             return True
         
         except Exception as e:
             conn.rollback()
+            if self.is_birimi is not None:
+                raise
+            return False
+        finally:
+            conn.close()
+
+    def malik_sn_guncelle(self):
+        """Birleştirme ve silmelerden sonra kalan malik satırlarının SN dizinini yeniler"""
+        conn = self.baglan()
+        cursor = conn.cursor()
+
+        try:
+            malik_sn_dizinle(cursor, self.tasinmaz_kimlik)
+            conn.commit()
+            return True
+
+        except Exception as e:
+            logging.error(f"Malik SN dizini hatası: {str(e)}")
+            conn.rollback()
+            if self.is_birimi is not None:
+                raise
             return False
         finally:
             conn.close()
@@ -692,9 +872,12 @@ class TapuProcessor:
             self.create_tasinmaz_table()
             self.assign_tasinmaz_numbers()
             self.update_tapu_kayit_bilgisi()            
+            self.malik_sn_guncelle()
             return True
     
         except Exception as e:
+            if self.is_birimi is not None:
+                raise
             return False
 
 
@@ -704,16 +887,17 @@ class TapuProcessor:
     def update_takyidat_headers(self):
         """Takyidat başlıklarını günceller"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.baglan()
             cursor = conn.cursor()
 
             # Sadece işlenmemiş taşınmazları al
-            cursor.execute("""
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik, 'tasinmaz_no')
+            cursor.execute(f"""
                 SELECT tasinmaz_no 
                 FROM tasinmaz 
-                WHERE baslik_islem_yapildi = FALSE 
-                OR baslik_islem_yapildi IS NULL
-            """)
+                WHERE (baslik_islem_yapildi = FALSE 
+                OR baslik_islem_yapildi IS NULL){kosul}
+            """, params)
     
             tasinmaz_nolar = cursor.fetchall()
            
@@ -794,6 +978,8 @@ class TapuProcessor:
                 except Exception as e:
                     logging.error(f"Taşınmaz işleme hatası - Taşınmaz: {tasinmaz_no}: {str(e)}")
                     conn.rollback()
+                    if self.is_birimi is not None:
+                        raise
                     continue
 
             return True, f"""Başlık güncellemeleri tamamlandı.
@@ -801,6 +987,8 @@ class TapuProcessor:
                 Toplam {toplam_guncellenen} kayıt güncellendi."""
 
         except Exception as e:
+            if self.is_birimi is not None:
+                raise
             return False, f"Genel hata oluştu: {str(e)}"
 
         finally:
@@ -809,19 +997,20 @@ class TapuProcessor:
 
     #Takproson dan cagriliyor 
     def update_missing_headers(self):
-        conn = sqlite3.connect(self.db_path)
+        conn = self.baglan()
         cursor = conn.cursor()
     
         try:
             # 1. Tapu verilerinden boş başlıklı kayıtları bul
-            cursor.execute("""
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+            cursor.execute(f"""
                 SELECT rowid, hucreno_1, tasinmaz_kimlik 
                 FROM tapu_verileri 
                 WHERE (takyidat_baslik IS NULL OR takyidat_baslik = '')
                 AND baslikontrol = 'HAYIR'
                 AND hucreno_1 IS NOT NULL
-                AND trim(hucreno_1) != ''
-            """)
+                AND trim(hucreno_1) != ''{kosul}
+            """, params)
         
             empty_headers = cursor.fetchall()
             updated_count = 0
@@ -903,6 +1092,8 @@ class TapuProcessor:
         
         except Exception as e:
             conn.rollback()
+            if self.is_birimi is not None:
+                raise
             return False, f"Hata: {str(e)}"
         
         finally:
@@ -910,34 +1101,15 @@ class TapuProcessor:
 
     # #Takproson dan cagriliyor Sayfa numaralarini 1000 ile carp ve ykoordinat degerini ekle  
     def add_baslik_deger_columns(self):
-        """Tablolara baslik_deger kolonunu ekler ve değerleri hesaplar"""
-        conn = sqlite3.connect(self.db_path)
+        """Tablolardaki baslik_deger değerlerini hesaplar (kolonlar şema göçüyle eklenir)"""
+        conn = self.baglan()
         cursor = conn.cursor()
 
         try:
-            # Sütunların var olup olmadığını kontrol et
-            cursor.execute("PRAGMA table_info(baslik_bilgileri)")
-            baslik_columns = [column[1] for column in cursor.fetchall()]
-        
-            cursor.execute("PRAGMA table_info(tapu_verileri)")
-            tapu_columns = [column[1] for column in cursor.fetchall()]
-
-            # baslik_bilgileri tablosuna baslik_deger kolonunu ekle
-            if 'baslik_deger' not in baslik_columns:
-                cursor.execute("""
-                    ALTER TABLE baslik_bilgileri 
-                    ADD COLUMN baslik_deger INTEGER
-                """)
-
-            # tapu_verileri tablosuna baslik_deger kolonunu ekle    
-            if 'baslik_deger' not in tapu_columns:
-                cursor.execute("""
-                    ALTER TABLE tapu_verileri 
-                    ADD COLUMN baslik_deger INTEGER
-                """)
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
 
             # baslik_bilgileri tablosundaki değerleri güncelle
-            cursor.execute("""
+            cursor.execute(f"""
                 UPDATE baslik_bilgileri 
                 SET baslik_deger = (
                     CAST(sayfa_no AS INTEGER) * 1000 + 
@@ -945,24 +1117,24 @@ class TapuProcessor:
                 )
                 WHERE baslik_deger IS NULL 
                 AND sayfa_no IS NOT NULL 
-                AND y_koordinat IS NOT NULL
-            """)
+                AND y_koordinat IS NOT NULL{kosul}
+            """, params)
         
             # tapu_verileri tablosundaki değerleri güncelle
-            cursor.execute("""
+            cursor.execute(f"""
                 UPDATE tapu_verileri 
                 SET baslik_deger = CAST((CAST(sayfano AS INTEGER) * 1000) + 
                     CAST(ROUND(y_koordinat) AS INTEGER) AS INTEGER)
                 WHERE baslik_deger IS NULL 
                 AND sayfano IS NOT NULL 
-                AND y_koordinat IS NOT NULL
-            """)
+                AND y_koordinat IS NOT NULL{kosul}
+            """, params)
             
             # Güncellenen kayıt sayısını al
-            cursor.execute("SELECT COUNT(*) FROM baslik_bilgileri WHERE baslik_deger IS NOT NULL")
+            cursor.execute(f"SELECT COUNT(*) FROM baslik_bilgileri WHERE baslik_deger IS NOT NULL{kosul}", params)
             baslik_count = cursor.fetchone()[0]
         
-            cursor.execute("SELECT COUNT(*) FROM tapu_verileri WHERE baslik_deger IS NOT NULL")
+            cursor.execute(f"SELECT COUNT(*) FROM tapu_verileri WHERE baslik_deger IS NOT NULL{kosul}", params)
             tapu_count = cursor.fetchone()[0]
 
             conn.commit()
@@ -979,6 +1151,8 @@ class TapuProcessor:
         except Exception as e:
             print(f"Hata: {str(e)}")
             conn.rollback()
+            if self.is_birimi is not None:
+                raise
             return False, 0, 0
     
         finally:
@@ -990,7 +1164,7 @@ class TapuProcessor:
         Aynı koordinata sahip verilerin düzeltilmesi için koordinat ataması yapar
         ve takyidat başlıklarını günceller
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self.baglan()
         cursor = conn.cursor()
     
         try:
@@ -999,17 +1173,20 @@ class TapuProcessor:
             #null_count = cursor.fetchone()[0]
             #print(f"Başlangıçta baslik_deger NULL olan kayıt sayısı: {null_count}")
 
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+
             # Önce koordinat_bilgileri_ext tablosunda baslik_deger hesapla
-            cursor.execute("""
+            cursor.execute(f"""
                 UPDATE koordinat_bilgileri_ext 
                 SET baslik_deger = (sayfano * 1000) + CAST(ROUND(y_koordinat) AS INTEGER)
-                WHERE baslik_deger IS NULL
-            """)
+                WHERE baslik_deger IS NULL{kosul}
+            """, params)
         
             #print(f"koordinat_bilgileri_ext güncelleme etkilenen kayıt: {cursor.rowcount}")
 
             # Tekrarlanan koordinatları bul
-            cursor.execute("""
+            tv1_kosul, _ = kapsam_kosulu(self.tasinmaz_kimlik, 'tv1.tasinmaz_kimlik')
+            cursor.execute(f"""
                 WITH TekrarEdenler AS (
                     SELECT tv1.rowid as tv_rowid, 
                            tv1.tasinmaz_kimlik, 
@@ -1019,12 +1196,12 @@ class TapuProcessor:
                            COUNT(*) OVER (PARTITION BY tv1.tasinmaz_kimlik, tv1.sayfano, tv1.baslik_deger) as tekrar_sayisi
                     FROM tapu_verileri tv1
                     WHERE tv1.baslik_deger IS NOT NULL 
-                    AND tv1.takyidat_baslik != 'TAPU KAYIT BİLGİSİ'
+                    AND tv1.takyidat_baslik != 'TAPU KAYIT BİLGİSİ'{tv1_kosul}
                 )
                 SELECT * FROM TekrarEdenler 
                 WHERE tekrar_sayisi > 1
                 ORDER BY tasinmaz_kimlik, sayfano, baslik_deger, tv_rowid
-            """)
+            """, params)
         
             tekrarlanan_kayitlar = cursor.fetchall()
             #print(f"\nToplam tekrarlanan kayıt sayısı: {len(tekrarlanan_kayitlar)}")
@@ -1088,7 +1265,7 @@ class TapuProcessor:
                     print(f"Eşleşen koordinat kaydı bulunamadı!")
 
             # Koordinat düzeltmesi sonrası takyidat başlıklarını güncelle
-            cursor.execute("""
+            cursor.execute(f"""
                 UPDATE tapu_verileri 
                 SET takyidat_baslik = (
                     SELECT bb.baslik
@@ -1104,8 +1281,8 @@ class TapuProcessor:
                     WHERE ke.tapu_rowid = tapu_verileri.rowid
                     AND ke.tapu_rowid IS NOT NULL
                 )
-                AND takyidat_baslik != 'TAPU KAYIT BİLGİSİ'
-            """)
+                AND takyidat_baslik != 'TAPU KAYIT BİLGİSİ'{kosul}
+            """, params)
         
             #print(f"\nTakyidat başlıkları güncelleme sonucu: {cursor.rowcount} kayıt güncellendi")
         
@@ -1113,17 +1290,17 @@ class TapuProcessor:
             #print(f"\nToplam güncellenen kayıt sayısı: {guncellenen_kayit_sayisi}")
         
             # Son durum kontrolü
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT COUNT(*) as tekrar_sayisi
                 FROM (
                     SELECT tasinmaz_kimlik, sayfano, baslik_deger, COUNT(*) as sayi
                     FROM tapu_verileri
                     WHERE baslik_deger IS NOT NULL 
-                    AND takyidat_baslik != 'TAPU KAYIT BİLGİSİ'
+                    AND takyidat_baslik != 'TAPU KAYIT BİLGİSİ'{kosul}
                     GROUP BY tasinmaz_kimlik, sayfano, baslik_deger
                     HAVING COUNT(*) > 1
                 ) tekrarlar
-            """)
+            """, params)
         
 
             kalan_tekrar = cursor.fetchone()[0]
@@ -1137,11 +1314,11 @@ class TapuProcessor:
                 #print(f"İşlem sonrası kalan tekrarlı koordinat sayısı: {kalan_tekrar}")
 
                 # Gereksiz kayıtlar temizleniyor
-                cursor.execute("""
+                cursor.execute(f"""
                     DELETE FROM koordinat_bilgileri_ext 
-                    WHERE tapu_rowid IS NULL 
-                    OR tapu_rowid = ''
-                """)
+                    WHERE (tapu_rowid IS NULL 
+                    OR tapu_rowid = ''){kosul}
+                """, params)
 
                 delete_count = cursor.rowcount
                 conn.commit()
@@ -1156,6 +1333,8 @@ class TapuProcessor:
             print(f"Koordinat atama hatası: {str(e)}")
             logging.error(f"Koordinat atama hatası: {str(e)}")
             conn.rollback()
+            if self.is_birimi is not None:
+                raise
             return False
         
         finally:
@@ -1167,17 +1346,18 @@ class TapuProcessor:
         Boş başlıklı kayıtlar için son kontrol ve güncelleme yapar.
         Bulunamayan kayıtları raporlar.
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self.baglan()
         cursor = conn.cursor()
     
         try:
             # Boş başlıklı kayıtları bul
-            cursor.execute("""
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+            cursor.execute(f"""
                 SELECT rowid, sayfano, tasinmaz_kimlik 
                 FROM tapu_verileri 
                 WHERE (takyidat_baslik IS NULL OR takyidat_baslik = '')
-                AND baslikontrol = 'HAYIR'
-            """)
+                AND baslikontrol = 'HAYIR'{kosul}
+            """, params)
         
             empty_headers = cursor.fetchall()
             missing_records = []  # Başlık bulunamayan kayıtlar için
@@ -1285,6 +1465,8 @@ class TapuProcessor:
             return True, report_message
         
         except Exception as e:
+            if self.is_birimi is not None:
+                raise
             return False, f"Hata oluştu: {str(e)}"
         
         finally:
@@ -1295,72 +1477,57 @@ class TapuProcessor:
         """
         Belirli hücreleri boş olan ve yevmiye içeren kayıtları siler
         """        
-        conn = sqlite3.connect(self.db_path)
+        conn = self.baglan()
         cursor = conn.cursor()
     
-        try:
-            # İlk durum: hucreno_1,2,3 boş, hucreno_4 = Yevmiye
-            cursor.execute("""
-                DELETE FROM tapu_verileri 
-                WHERE (hucreno_1 IS NULL OR trim(hucreno_1) = '')
+        bos_hucreler = """(hucreno_1 IS NULL OR trim(hucreno_1) = '')
                 AND (hucreno_2 IS NULL OR trim(hucreno_2) = '')
-                AND (hucreno_3 IS NULL OR trim(hucreno_3) = '')
+                AND (hucreno_3 IS NULL OR trim(hucreno_3) = '')"""
+        kosullar = [
+            # İlk durum: hucreno_1,2,3 boş, hucreno_4 = Yevmiye
+            f"""{bos_hucreler}
                 AND baslikontrol = 'HAYIR'
-                AND hucreno_4 = 'Yevmiye'
-            """)
-        
+                AND hucreno_4 = 'Yevmiye'""",
             # İkinci durum: hucreno_1,2,3 boş, hucreno_4 = Yevmiye veya hucreno_5 = Sebebi- Tarih- Yevmiye
-            cursor.execute("""
-                DELETE FROM tapu_verileri 
-                WHERE (hucreno_1 IS NULL OR trim(hucreno_1) = '')
-                AND (hucreno_2 IS NULL OR trim(hucreno_2) = '')
-                AND (hucreno_3 IS NULL OR trim(hucreno_3) = '')
+            f"""{bos_hucreler}
                 AND baslikontrol = 'HAYIR'
                 AND (
                     hucreno_4 = 'Yevmiye'
                     OR hucreno_5 = 'Sebebi- Tarih- Yevmiye'
-                )
-            """)
-        
+                )""",
             # Üçüncü durum: hucreno_1,2,3,4 boş, hucreno_5 = Yevmiye veya Sebebi- Tarih- Yevmiye
-            cursor.execute("""
-                DELETE FROM tapu_verileri 
-                WHERE (hucreno_1 IS NULL OR trim(hucreno_1) = '')
-                AND (hucreno_2 IS NULL OR trim(hucreno_2) = '')
-                AND (hucreno_3 IS NULL OR trim(hucreno_3) = '')
+            f"""{bos_hucreler}
                 AND (hucreno_4 IS NULL OR trim(hucreno_4) = '')
                 AND baslikontrol = 'HAYIR'
                 AND (
                     hucreno_5 = 'Yevmiye'
                     OR hucreno_5 = 'Sebebi- Tarih- Yevmiye'
-                )
-            """)
-        
+                )""",
             # Dördüncü durum: hucreno_1,2,3 boş, hucreno_4 = Yevmiye veya Sebebi- Tarih- Yevmiye
-            cursor.execute("""
-                DELETE FROM tapu_verileri 
-                WHERE (hucreno_1 IS NULL OR trim(hucreno_1) = '')
-                AND (hucreno_2 IS NULL OR trim(hucreno_2) = '')
-                AND (hucreno_3 IS NULL OR trim(hucreno_3) = '')
+            f"""{bos_hucreler}
                 AND baslikontrol = 'HAYIR'
                 AND (
                     hucreno_4 = 'Yevmiye'
                     OR hucreno_4 = 'Sebebi- Tarih- Yevmiye'
-                )
-            """)
-        
+                )""",
             # Beşinci durum: hucreno_1,2,3,4 boş, hucreno_5 dolu
-            cursor.execute("""
-                DELETE FROM tapu_verileri 
-                WHERE (hucreno_1 IS NULL OR trim(hucreno_1) = '')
-                AND (hucreno_2 IS NULL OR trim(hucreno_2) = '')
-                AND (hucreno_3 IS NULL OR trim(hucreno_3) = '')
+            f"""{bos_hucreler}
                 AND (hucreno_4 IS NULL OR trim(hucreno_4) = '')
                 AND baslikontrol = 'HAYIR'
-                AND (hucreno_5 IS NOT NULL AND trim(hucreno_5) != '')
-            """)
-        
+                AND (hucreno_5 IS NOT NULL AND trim(hucreno_5) != '')""",
+        ]
+
+        try:
+            # Satırı silinen taşınmazların önbellekteki raporları geçersiz kılınır
+            degisen_tasinmazlar = set()
+            for kosul in kosullar:
+                cursor.execute(f"SELECT DISTINCT tasinmaz_kimlik FROM tapu_verileri WHERE {kosul}")
+                degisen_tasinmazlar.update(kimlik for (kimlik,) in cursor.fetchall())
+                cursor.execute(f"DELETE FROM tapu_verileri WHERE {kosul}")
+
             deleted_count = cursor.rowcount
+            for kimlik in degisen_tasinmazlar:
+                surum_artir(cursor, kimlik)
             conn.commit()
             return True, f"{deleted_count} kayıt silindi."
         
@@ -1370,4 +1537,501 @@ class TapuProcessor:
         
         finally:
             conn.close()
-     
+
+
+class TesisProcessor:
+    def __init__(self, db_path, tasinmaz_kimlik=None, is_birimi=None):
+        self.db_path = db_path
+        # Verilirse tüm işlemler yalnızca bu taşınmazın kayıtlarıyla sınırlanır
+        self.tasinmaz_kimlik = tasinmaz_kimlik
+        # Verilirse tüm işlemler iş biriminin tek işleminde yapılır; hatalar
+        # yutulmaz, iş biriminin taşınmazı bütünüyle geri alması için iletilir
+        self.is_birimi = is_birimi
+
+    def baglan(self):
+        return baglanti_ac(self.db_path, self.is_birimi)
+
+    def process_all(self):
+        """Tüm tesis tarih işlemlerini yürütür"""
+        try:
+            if not self.duzenle_tesis_tarih():
+                return False
+            if not self.duzelt_ve_kontrol_tesis_tarih():
+                return False
+            if not self.guncelle_sn_ve_malik_bilgileri():
+                return False
+            if not self.guncelle_bos_rehin_bilgileri():
+                return False
+            if not self.yevmiye_guncelle():
+                return False
+            return True
+        except Exception as e:
+            logging.error(f"Tesis işleme hatası: {str(e)}")
+            if self.is_birimi is not None:
+                raise
+            return False
+
+    def duzenle_tesis_tarih(self):
+        """İpotek verilerindeki tesis tarih bilgilerini düzenler"""
+        conn = self.baglan()
+        cursor = conn.cursor()
+                                                                                                   
+        try:
+            kaldirilacak_ifadeler = [
+               'TDesis Tarih - Yev ',
+               'Tesis Tarih - Yev ',
+               'Tescil Tarih - Yev Terkin',
+               'Tescil Tarih - Yev ',
+               'Tesis Kurum Tarih- Yevmiye',
+               'Tesis Tarih - Yev ',
+               'Tarih- Yevmiye',
+               'Tarih - Yevmiye',
+               'Tesis Kurum',
+               'Tesis Tarih',
+               'Tescil',
+               'Tarih -',               
+               'Yev Terkin',
+               'Yev',
+               'Terkin',
+               'Tarih - Yev Terkin',
+               '- Yev Terkin',
+            ]
+        
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+
+            for ifade in kaldirilacak_ifadeler:
+                cursor.execute(f"""
+                    UPDATE ipotek_verileri 
+                    SET tesis_tarih = REPLACE(tesis_tarih, ?, ''),
+                        tescil_tarih = REPLACE(tescil_tarih, ?, '')
+                    WHERE (tesis_tarih LIKE ? OR tescil_tarih LIKE ?){kosul}
+                """, (ifade, ifade, f'%{ifade}%', f'%{ifade}%', *params))
+
+            # Doğru format kontrolü için regex pattern
+            format_pattern = r'^[A-Za-zğüşıöçĞÜŞİÖÇ\s]+\([A-Za-zğüşıöçĞÜŞİÖÇ\s]+\)\s*-\s*\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}\s*-\s*\d+'
+
+            # Tüm kayıtları al
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik, baglac=' WHERE ')
+            cursor.execute(f"SELECT rowid, tesis_tarih, tescil_tarih FROM ipotek_verileri{kosul}", params)
+            kayitlar = cursor.fetchall()
+
+            for rowid, tesis_tarih, tescil_tarih in kayitlar:
+                tesis_format_uygun = bool(re.match(format_pattern, str(tesis_tarih).strip()))
+                tescil_format_uygun = bool(re.match(format_pattern, str(tescil_tarih).strip()))
+
+                # Her iki sütunda da veri varsa format kontrolü yap
+                if tesis_tarih and tescil_tarih:
+                    if tescil_format_uygun and not tesis_format_uygun:
+                        # Tescil tarihi doğru formatta, tesis tarihi yanlış
+                        cursor.execute("""
+                            UPDATE ipotek_verileri 
+                            SET tesis_tarih = tescil_tarih
+                            WHERE rowid = ?
+                        """, (rowid,))
+                    elif tesis_format_uygun and not tescil_format_uygun:
+                        # Tesis tarihi doğru formatta, tescil tarihi yanlış
+                        cursor.execute("""
+                            UPDATE ipotek_verileri 
+                            SET tescil_tarih = tesis_tarih
+                            WHERE rowid = ?
+                        """, (rowid,))
+                # Sadece birinde veri varsa ve format uygunsa diğerine kopyala
+                elif tescil_tarih and tescil_format_uygun and not tesis_tarih:
+                    cursor.execute("""
+                        UPDATE ipotek_verileri 
+                        SET tesis_tarih = tescil_tarih
+                        WHERE rowid = ?
+                    """, (rowid,))
+                elif tesis_tarih and tesis_format_uygun and not tescil_tarih:
+                    cursor.execute("""
+                        UPDATE ipotek_verileri 
+                        SET tescil_tarih = tesis_tarih
+                        WHERE rowid = ?
+                    """, (rowid,))
+
+            conn.commit()
+            return True
+
+        except Exception as e:
+            logging.error(f"Tarih düzenleme hatası: {str(e)}")
+            if conn:
+                conn.rollback()
+            if self.is_birimi is not None:
+                raise
+            return False
+
+        finally:
+            if conn:
+                conn.close()
+
+    def duzelt_ve_kontrol_tesis_tarih(self):
+        conn = self.baglan()
+        cursor = conn.cursor()
+        
+        try:
+           # Tescil tarih temizleme işlemi
+           #print("\nTescil tarih temizleme başlıyor...")
+           temizlenecek_ifadeler = [
+               'Tescil Tarih - Yev Terkin',
+               'Tescil Tarih - Yev ',
+               'Tesis Kurum Tarih- Yevmiye',
+               'Tesis Tarih - Yev ',
+               'Tarih- Yevmiye',
+               'Tarih - Yevmiye',
+               'Tesis Kurum',
+               'Tesis Tarih',
+               'Tescil',
+               'Tarih -',
+               ' - ',
+               'Yev Terkin',
+               'Yev',
+               'Terkin',
+               'Tarih - Yev Terkin',
+               '- Yev Terkin',
+           ]
+       
+           kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+
+           for ifade in temizlenecek_ifadeler:
+               cursor.execute(f"""
+                   UPDATE ipotek_verileri 
+                   SET tescil_tarih = REPLACE(tesis_tarih, ?, '')
+                   WHERE tescil_tarih LIKE ?{kosul}
+               """, (ifade, f'%{ifade}%', *params))
+
+           for ifade in temizlenecek_ifadeler:
+               cursor.execute(f"""
+                   UPDATE ipotek_verileri 
+                   SET tescil_tarih = REPLACE(tescil_tarih, ?, '')
+                   WHERE tescil_tarih LIKE ?{kosul}
+               """, (ifade, f'%{ifade}%', *params))
+
+
+               #print(f"'{ifade}' ifadesi temizlendi")
+
+           format_pattern = r'^.+ - \d{2}-\d{2}-\d{4} \d{2}:\d{2} - \d+$'
+       
+           # Önce hatalı kayıtları bul ve tescil_tarih kontrolü yap
+           cursor.execute(f"""
+               SELECT rowid, tesis_tarih, tescil_tarih 
+               FROM ipotek_verileri 
+               WHERE tesis_tarih IS NOT NULL 
+               AND tesis_tarih != ''{kosul}
+           """, params)
+       
+           guncelleme_listesi = []
+           hatali_kayitlar = []
+       
+           #print("\nKayıtlar kontrol ediliyor...")                                                                          
+           for rowid, tesis_tarih, tescil_tarih in cursor.fetchall():
+               tesis_uygun = bool(re.match(format_pattern, str(tesis_tarih).strip()))
+               tescil_uygun = bool(re.match(format_pattern, str(tescil_tarih).strip()))
+           
+               if not tesis_uygun and tescil_uygun:
+                   guncelleme_listesi.append((rowid, tescil_tarih))
+                   """
+                   print(f"\nGüncellenecek kayıt bulundu:")
+                   print(f"ID: {rowid}")
+                   print(f"Eski tesis_tarih: {tesis_tarih}")
+                   print(f"Yeni tesis_tarih olacak: {tescil_tarih}")
+                   """
+               elif not tesis_uygun:
+                   hatali_kayitlar.append((rowid, tesis_tarih, tescil_tarih))
+
+           # Güncelleme işlemini yap
+           if guncelleme_listesi:
+               #print(f"\nToplam {len(guncelleme_listesi)} kayıt güncellenecek...")
+               for rowid, yeni_deger in guncelleme_listesi:
+                   cursor.execute("""
+                       UPDATE ipotek_verileri 
+                       SET tesis_tarih = ? 
+                       WHERE rowid = ?
+                   """, (yeni_deger, rowid))
+               #print("Güncelleme tamamlandı.")
+           """
+           # Hala hatalı olan kayıtları göster
+           if hatali_kayitlar:
+               print("\nHala hatalı formatta olan ve düzeltilemeyecek kayıtlar:")
+               print("ID\tTesis Tarih || Tescil Tarih")
+               print("-" * 80)
+               for rowid, tesis_tarih, tescil_tarih in hatali_kayitlar:
+                   print(f"{rowid}\t{tesis_tarih} || {tescil_tarih}")
+               print(f"\nToplam {len(hatali_kayitlar)} adet hatalı kayıt kaldı.")
+           else:
+               print("\nTüm kayıtlar düzeltildi veya uygun formatta.")
+
+           conn.commit()
+           """
+           return True
+
+        except Exception as e:
+           #print(f"Hata oluştu: {str(e)}")
+           conn.rollback()
+           if self.is_birimi is not None:
+               raise
+           return False
+   
+        finally:
+           conn.close()
+
+    def guncelle_sn_ve_malik_bilgileri(self):
+        conn = self.baglan()
+        cursor = conn.cursor()
+    
+        try:
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+
+            # 1. Boş SN bilgilerini doldur
+            cursor.execute(f"""
+                SELECT rowid, hisse_pay_payda 
+                FROM ipotek_verileri 
+                WHERE (sn_bilgisi IS NULL OR sn_bilgisi = '')
+                AND hisse_pay_payda LIKE '%(SN:%'{kosul}
+            """, params)
+        
+            # SN numaralarını çıkar ve güncelle
+            sn_pattern = r'\(SN:(\d+)\)'
+            for rowid, hisse_pay_payda in cursor.fetchall():
+                match = re.search(sn_pattern, hisse_pay_payda)
+                if match:
+                    sn_no = match.group(1)
+                    cursor.execute("""
+                        UPDATE ipotek_verileri 
+                        SET sn_bilgisi = ? 
+                        WHERE rowid = ?
+                    """, (sn_no, rowid))
+        
+            # 2. Eşleştirme ve güncelleme için kayıtları al; malik satırı SN dizininden
+            # tek birleştirmeyle bulunur. Dizinde eşleşme yoksa (dizin eksik, satır
+            # sonradan silinmiş ya da değişmişse) eski LIKE aramasına dönülür.
+            kosul_i, params_i = kapsam_kosulu(self.tasinmaz_kimlik, 'i.tasinmaz_kimlik')
+            cursor.execute(f"""
+                SELECT i.rowid, i.tasinmaz_kimlik, i.sn_bilgisi, t.hucreno_2, t.hucreno_4
+                FROM ipotek_verileri i
+                LEFT JOIN malik_sn m
+                    ON m.tasinmaz_kimlik = i.tasinmaz_kimlik AND m.sn = i.sn_bilgisi
+                LEFT JOIN tapu_verileri t
+                    ON t.rowid = m.tapu_rowid
+                    AND t.tasinmaz_kimlik = i.tasinmaz_kimlik
+                    AND t.hucreno_2 LIKE '%(SN:' || i.sn_bilgisi || ')%'
+                WHERE i.sn_bilgisi IS NOT NULL 
+                AND i.sn_bilgisi != ''{kosul_i}
+            """, params_i)
+        
+            for rowid, tasinmaz_kimlik, sn_bilgisi, hucreno_2, hucreno_4 in cursor.fetchall():
+                tapu_kayit = (hucreno_2, hucreno_4) if hucreno_2 is not None else None
+                if tapu_kayit is None:
+                    # Eşleşen tapu kaydını bul
+                    cursor.execute("""
+                        SELECT hucreno_2, hucreno_4 
+                        FROM tapu_verileri 
+                        WHERE tasinmaz_kimlik = ?
+                        AND hucreno_2 LIKE ?
+                    """, (tasinmaz_kimlik, f'%(SN:{sn_bilgisi})%'))
+                    tapu_kayit = cursor.fetchone()
+
+                if tapu_kayit:
+                    hucreno_2, hucreno_4 = tapu_kayit
+                
+                    # SN bilgisini temizle
+                    temiz_borclu = re.sub(r'\(SN:\d+\)\s*', '', hucreno_2)
+                
+                    # Güncelleme yap
+                    cursor.execute("""
+                        UPDATE ipotek_verileri 
+                        SET borclu_malik = ?,
+                            hisse_pay_payda = ?
+                        WHERE rowid = ?
+                    """, (temiz_borclu, hucreno_4, rowid))
+        
+            conn.commit()
+            return True
+
+        except Exception as e:
+            #print(f"Hata oluştu: {str(e)}")
+            conn.rollback()
+            if self.is_birimi is not None:
+                raise
+            return False
+    
+        finally:
+            conn.close()
+
+    def guncelle_bos_rehin_bilgileri(self):
+        conn = self.baglan()
+        cursor = conn.cursor()
+    
+        try:
+            #print("\nBOŞ REHİN GÜNCELLEME İŞLEMİ BAŞLIYOR...")
+        
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+
+            # 1. BosRehin olan ve diğer alanları boş olan kayıtları bul
+            cursor.execute(f"""
+                SELECT sayfano, satirno FROM tapu_verileri 
+                WHERE hucreno_1 = 'BosRehin' 
+                AND (hucreno_2 IS NULL OR hucreno_2 = '' OR hucreno_2 = ' ')
+                AND (hucreno_3 IS NULL OR hucreno_3 = '' OR hucreno_3 = ' ')
+                AND (hucreno_4 IS NULL OR hucreno_4 = '' OR hucreno_4 = ' ')
+                AND (hucreno_5 IS NULL OR hucreno_5 = '' OR hucreno_5 = ' ')
+                AND (hucreno_6 IS NULL OR hucreno_6 = '' OR hucreno_6 = ' '){kosul}
+            """, params)
+        
+            bos_rehin_kayitlari = cursor.fetchall()
+            #print(f"Bulunan boş rehin kayıt sayısı: {len(bos_rehin_kayitlari)}")
+        
+            guncellenen_kayit_sayisi = 0
+        
+            for sayfano, satirno in bos_rehin_kayitlari:
+                #print(f"\nİŞLENEN KAYIT -> Sayfa: {sayfano}, Satır: {satirno}")
+            
+                # 2. İki satır sonrasındaki veriyi al
+                hedef_satirno = satirno + 2
+            
+                cursor.execute(f"""
+                    SELECT hucreno_1 FROM tapu_verileri 
+                    WHERE sayfano = ? AND satirno = ?{kosul}
+                """, (sayfano, hedef_satirno, *params))
+            
+                sonuc = cursor.fetchone()
+                if not sonuc or not sonuc[0]:
+                    #print(f"  - 2 satır sonrası için veri bulunamadı")
+                    continue
+            
+                uzun_metin = sonuc[0]
+                #print(f"  - Bulunan metin: {uzun_metin[:100]}...")
+            
+                # SN numarasını bul
+                sn_match = re.search(r'SN:(\d+)', uzun_metin)
+                if not sn_match:
+                    #print("  - SN numarası bulunamadı")
+                    continue
+            
+                sn_numarasi = sn_match.group(1)
+                #print(f"  - Çıkarılan SN numarası: {sn_numarasi}")
+            
+                # 3. İpotek verilerini güncelle
+                cursor.execute(f"""
+                    UPDATE ipotek_verileri 
+                    SET alacakli = 'Boş Rehin Bilgisi'
+                    WHERE sn_bilgisi = ? 
+                    AND LOWER(alacakli) = LOWER('İpoteğin Konulduğu Hisse Bilgisi'){kosul}
+                """, (sn_numarasi, *params))
+            
+                etkilenen_kayit = cursor.rowcount
+                if etkilenen_kayit > 0:
+                    guncellenen_kayit_sayisi += etkilenen_kayit
+                    #print(f"  - Güncellenen kayıt sayısı: {etkilenen_kayit}")
+                #else:
+                    #print("  - Güncelleme kriterlerine uygun kayıt bulunamadı")
+        
+            conn.commit()
+            #print(f"\nİŞLEM TAMAMLANDI")
+            #print(f"Toplam güncellenen kayıt sayısı: {guncellenen_kayit_sayisi}")
+            return True
+        
+        except Exception as e:
+            #print(f"\nHATA OLUŞTU: {str(e)}")
+            conn.rollback()
+            if self.is_birimi is not None:
+                raise
+            return False
+        
+        finally:
+            conn.close()
+
+    def yevmiye_guncelle(self):        
+        try:
+            conn = self.baglan()
+            cursor = conn.cursor()
+
+            kosul, params = kapsam_kosulu(self.tasinmaz_kimlik)
+
+            pattern = r"""
+                # İlk kısım (yer bilgisi) - zorunlu değil
+                (?:[^-\d]+)?
+            
+                # Tarih kısmı (zorunlu)
+                (\d{2}[-\./]\d{2}[-\./]\d{4})
+            
+                # Saat kısmı (opsiyonel)
+                (?:\s+(\d{1,2}:\d{1,2}))?
+            
+                # Son kısım - yevmiye no
+                .*?[-\s]+(\d+)\s*$
+            """
+            cursor.execute(f"""
+                SELECT rowid, hucreno_3, hucreno_4, 
+                       hucreno_5, hucreno_6, hucreno_7, hucreno_8, hucreno_9
+                FROM tapu_verileri 
+                WHERE hucreno_1 IS NOT NULL
+                AND (takyidat_1 IS NULL OR takyidat_1 = '')
+                AND (baslikontrol IS NOT 'EVET'){kosul}
+            """, params)
+        
+            kayitlar = cursor.fetchall()
+            guncellenen = 0
+        
+            for kayit in kayitlar:
+                kayit_id = kayit[0]
+            
+                for hucre_deger in kayit[1:]:
+                    if not hucre_deger:
+                        continue
+                
+                    # Önce filigranları temizle
+                    temiz_deger = rakam_arasi_filigran_temizle(str(hucre_deger))
+                
+                    # Parantezleri ve içindekileri temizle
+                    temiz_deger = re.sub(r'\([^)]*\)', '', temiz_deger)
+                
+                    # Regex ile eşleşme kontrolü
+                    match = re.search(pattern, temiz_deger, re.VERBOSE)
+                
+                    if match:
+                        try:
+                            # İşlem yerini al - ilk tarihten önceki kısım
+                            islem_yeri = temiz_deger.split(match.group(1))[0].strip()
+                            islem_yeri = re.sub(r'[-\s]+$', '', islem_yeri)  # Sondaki tire ve boşlukları temizle
+                        
+                            # Tarih ve saat formatını ayarla
+                            tarih = match.group(1)  # Tarih kısmı
+                            saat = match.group(2)   # Saat kısmı (opsiyonel)
+                        
+                            # Tarihi noktalı formata çevir
+                            tarih_parcalar = re.split('[-./]', tarih)
+                            formatli_tarih = f"{tarih_parcalar[0]}.{tarih_parcalar[1]}.{tarih_parcalar[2]}"
+                        
+                            # Saat varsa ekle, yoksa sadece tarih
+                            tam_tarih = f"{formatli_tarih} {saat}" if saat else formatli_tarih
+                        
+                            # Yevmiye numarası artık group(3)'te
+                            yevmiye_no = match.group(3)
+
+                            # Verileri güncelle
+                            cursor.execute("""
+                                UPDATE tapu_verileri 
+                                SET takyidat_1 = ?,  -- Yevmiye No
+                                    takyidat_2 = ?,  -- Tarih (ve varsa Saat)
+                                    takyidat_3 = ?   -- İşlem Yeri
+                                WHERE rowid = ?
+                            """, (yevmiye_no, tam_tarih, islem_yeri, kayit_id))
+                        
+                            guncellenen += 1
+                            break
+                        except Exception as e:
+                            print(f"Veri işleme hatası: {str(e)}")
+                            continue
+
+            conn.commit()
+            return f"İşlem başarıyla tamamlandı. {guncellenen} kayıt güncellendi."
+        
+        except Exception as e:
+            print(f"Genel hata: {str(e)}")
+            if self.is_birimi is not None:
+                raise
+            return f"Genel hata oluştu: {str(e)}"
+    
+        finally:
+            if conn:
+                conn.close()
@@ -1,12 +1,23 @@
 import sqlite3
 from collections import defaultdict
+from contextlib import ExitStack
+from itertools import groupby
+from operator import itemgetter
 import json
+import shutil
+import tempfile
 from datetime import datetime
 import logging
+from takyidat_kumeleme import TakyidatKumeleri, sadelestir
+from rapor_onbellegi import onbellekten_oku, onbellege_yaz
 
 class CokluInceleme:
-    def __init__(self, db_path='veritabani.db'):
+    # create_tasinmaz_data çıktısının önbellekteki türü; çıktı biçimi değişirse numara artırılır
+    ONBELLEK_TURU = 'coklu_veri/2'
+
+    def __init__(self, db_path='veritabani.db', debug=False):
         self.db_path = db_path
+        self.debug = debug
         self.json_data = None
         self.grouped_data = None
         # Özel başlıkları tanımla
@@ -68,6 +79,7 @@ class CokluInceleme:
             AND tv.takyidat_baslik != ''
             AND tv.baslikontrol != 'EVET'
             AND t.tasinmaz_no = ?
+            ORDER BY tv.rowid
         """, (tasinmaz_no,))
         return cursor.fetchall()
 
@@ -79,6 +91,7 @@ class CokluInceleme:
             FROM ipotek_verileri i
             JOIN tasinmaz t ON t.tasinmaz_no = i.tasinmaz_kimlik
             WHERE t.tasinmaz_no = ?
+            ORDER BY i.rowid
         """, (tasinmaz_no,))
         result = cursor.fetchall()
         logging.debug(f"İpotek kayıtları: {result}")  # Debug log ekle
@@ -108,6 +121,84 @@ class CokluInceleme:
             logging.error(f"Taşınmaz bilgisi getirme hatası: {str(e)}")
             raise
 
+    def toplu_kayitlari_getir(self, conn, sira="t.tasinmaz_no", atlanacaklar=()):
+        """
+        Tüm taşınmazların bilgi, takyidat ve ipotek kayıtlarını üç sorguyla getirir
+
+        Üç sorgu da aynı taşınmaz sırasıyla (sira) okunur ve tek geçişte
+        eşleştirilir; her taşınmaz için (tasinmaz_no, get_tasinmaz_info,
+        get_takyidat_records, get_ipotek_records) sonuçları üretilir. Bir
+        taşınmazın kayıtları, tekil sorgulardaki gibi belge (rowid) sırasındadır.
+        atlanacaklar'daki taşınmazların yalnızca bilgisi okunur, takyidat ve
+        ipotek listeleri boş döner.
+        """
+        secim = ""
+        if atlanacaklar:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS atlanan_tasinmazlar (tasinmaz_no PRIMARY KEY)")
+            conn.execute("DELETE FROM temp.atlanan_tasinmazlar")
+            conn.executemany(
+                "INSERT OR IGNORE INTO temp.atlanan_tasinmazlar (tasinmaz_no) VALUES (?)",
+                [(tasinmaz_no,) for tasinmaz_no in atlanacaklar]
+            )
+            # Okumalar açık bir işlem içinde kalmasın
+            conn.commit()
+            secim = "AND t.tasinmaz_no NOT IN temp.atlanan_tasinmazlar"
+
+        bilgiler = conn.execute(f"""
+            SELECT t.tasinmaz_no, t.zemintipi, t.il_ilce, t.kurum_adi, 
+                   t.mahalle, t.mevki, t.cilt_sayfa_no, t.kayitdurumu,
+                   t.ada_parsel, t.at_yuzolcum, t.bb_nitelik, 
+                   t.bb_brüt_yuzolcum, t.bb_net_yuzolcum,
+                   t.blok_kat_girisi_bbno, t.arsa_pay_payda,
+                   t.ana_tasinmaz_nitelik, tt.tapu_tarih
+            FROM tasinmaz t
+            LEFT JOIN takbis_tarih tt ON t.tasinmaz_no = tt.tasinmaz_kimlik
+            ORDER BY {sira}, tt.rowid
+        """)
+        # Eşleştirme anahtarı olarak ilk kolonda taşınmaz numarası da okunur
+        takyidatlar = conn.execute(f"""
+            SELECT t.tasinmaz_no, tv.*, tv.takyidat_1, tv.takyidat_2, tv.takyidat_3 
+            FROM tapu_verileri tv
+            JOIN tasinmaz t ON t.tasinmaz_no = tv.tasinmaz_kimlik {secim}
+            WHERE tv.takyidat_baslik NOT IN ('TAPU KAYIT BİLGİSİ', 'MÜLKİYET BİLGİLERİ')
+            AND tv.takyidat_baslik IS NOT NULL
+            AND tv.takyidat_baslik != ''
+            AND tv.baslikontrol != 'EVET'
+            ORDER BY {sira}, tv.rowid
+        """)
+        ipotekler = conn.execute(f"""
+            SELECT t.tasinmaz_no, i.* 
+            FROM ipotek_verileri i
+            JOIN tasinmaz t ON t.tasinmaz_no = i.tasinmaz_kimlik {secim}
+            ORDER BY {sira}, i.rowid
+        """)
+
+        takyidat_gruplari = groupby(takyidatlar, key=itemgetter(0))
+        ipotek_gruplari = groupby(ipotekler, key=itemgetter(0))
+        takyidat_grubu = self.sonraki_grup(takyidat_gruplari)
+        ipotek_grubu = self.sonraki_grup(ipotek_gruplari)
+
+        # takbis_tarih'te birden fazla kayıt varsa tekil sorgudaki gibi ilki alınır
+        for tasinmaz_no, satirlar in groupby(bilgiler, key=itemgetter(0)):
+            takyidat_records = []
+            if takyidat_grubu and takyidat_grubu[0] == tasinmaz_no:
+                takyidat_records = takyidat_grubu[1]
+                takyidat_grubu = self.sonraki_grup(takyidat_gruplari)
+
+            ipotek_records = []
+            if ipotek_grubu and ipotek_grubu[0] == tasinmaz_no:
+                ipotek_records = ipotek_grubu[1]
+                ipotek_grubu = self.sonraki_grup(ipotek_gruplari)
+
+            yield tasinmaz_no, next(satirlar), takyidat_records, ipotek_records
+
+    def sonraki_grup(self, gruplar):
+        """Sıradaki (tasinmaz_no, satırlar) grubunu anahtar kolonu atılmış olarak döndürür"""
+        grup = next(gruplar, None)
+        if grup is None:
+            return None
+        return grup[0], [satir[1:] for satir in grup[1]]
+
     def create_tasinmaz_data(self, tasinmaz_data, takyidat_records, ipotek_records):
         """Taşınmaz verilerini yapılandırır"""
         def extract_yevmiye(tesis_tarih):
@@ -211,7 +302,8 @@ class CokluInceleme:
 
     def create_json_data(self):
         """Veritabanından JSON verisi oluşturur"""
-        self.debug_database()  # Debug fonksiyonunu çağır
+        if self.debug:
+            self.debug_database()
         conn = self.connect_db()
         try:
             tasinmaz_count = self.get_tasinmaz_count(conn)
@@ -230,22 +322,39 @@ class CokluInceleme:
                     "message": f"Veritabanında şu anda {tasinmaz_count} adet taşınmaz kaydı bulunmaktadır. Karşılaştırmalı rapor için en az 2 taşınmaz kaydı gereklidir."
                 }
 
+            # Verisi değişmemiş taşınmazlar önbellekten alınır, yalnızca değişenler okunup işlenir.
+            # Önbellekte verinin indent=4 JSON metni tutulur; dosya bu metinlerden birleştirilir.
             cursor = conn.cursor()
-            cursor.execute("SELECT tasinmaz_no FROM tasinmaz")
-            tasinmaz_numbers = cursor.fetchall()
+            onbellek = onbellekten_oku(cursor, self.ONBELLEK_TURU)
+            onbellektekiler = {
+                tasinmaz_no: icerik
+                for tasinmaz_no, (surum, icerik) in onbellek.items()
+                if icerik is not None
+            }
+            yeni_kayitlar = []
 
             all_data = {}
-            for tasinmaz_no in tasinmaz_numbers:
-                tasinmaz_no = tasinmaz_no[0]
-                tasinmaz_data = self.get_tasinmaz_info(conn, tasinmaz_no)
-                takyidat_records = self.get_takyidat_records(conn, tasinmaz_no)
-                ipotek_records = self.get_ipotek_records(conn, tasinmaz_no)
-
-                all_data[f"Tasinmaz_{tasinmaz_no}"] = self.create_tasinmaz_data(
-                    tasinmaz_data, 
-                    takyidat_records, 
-                    ipotek_records
-                )
+            json_metinleri = []
+            kayitlar = self.toplu_kayitlari_getir(conn, atlanacaklar=onbellektekiler)
+            for tasinmaz_no, tasinmaz_data, takyidat_records, ipotek_records in kayitlar:
+                anahtar = f"Tasinmaz_{tasinmaz_no}"
+                metin = onbellektekiler.get(tasinmaz_no)
+                if metin is not None:
+                    all_data[anahtar] = json.loads(metin)
+                else:
+                    all_data[anahtar] = self.create_tasinmaz_data(
+                        tasinmaz_data, 
+                        takyidat_records, 
+                        ipotek_records
+                    )
+                    metin = json.dumps(all_data[anahtar], ensure_ascii=False, indent=4)
+                    if tasinmaz_no in onbellek:
+                        yeni_kayitlar.append((tasinmaz_no, onbellek[tasinmaz_no][0], metin))
+                json_metinleri.append((anahtar, metin))
+
+            if yeni_kayitlar:
+                onbellege_yaz(cursor, self.ONBELLEK_TURU, yeni_kayitlar)
+                conn.commit()
 
             # Hafızada tut
             self.json_data = all_data
@@ -256,7 +365,9 @@ class CokluInceleme:
         
             try:
                 with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(all_data, f, ensure_ascii=False, indent=4)
+                    for sira, (anahtar, metin) in enumerate(json_metinleri):
+                        self.json_girdisi_yaz(f, anahtar, None, sira == 0, metin)
+                    f.write("\n}" if json_metinleri else "{}")
                 logging.info(f"JSON dosyası oluşturuldu: {filename}")
             except Exception as e:
                 logging.error(f"JSON dosyası oluşturma hatası: {str(e)}")
@@ -308,23 +419,30 @@ class CokluInceleme:
         """Rapor başlığını ve bağımsız bölüm bilgilerini formatlar"""
         bb_texts = []
         for prop in properties:
-            tasim = prop['Taşınmaz Bölümü']
-            bb_no = self.get_bb_no(prop)
-            if bb_no and tasim['bb_nitelik']:
-                # tapu_tarih varsa formatla ve ekle
-                if tasim['tapu_tarih']:
-                    tarih, saat = self.format_datetime(tasim['tapu_tarih'])
-                    bb_texts.append(f"({tasim['ada_parsel']} parsel {bb_no} Nolu BB. {tasim['bb_nitelik']} Nitelikli Gayrimenkul {tarih} tarih ve saat {saat})")
-                else:
-                    bb_texts.append(f"({tasim['ada_parsel']} parsel {bb_no} Nolu BB. {tasim['bb_nitelik']} Nitelikli Gayrimenkul)")
-            elif not bb_no and not tasim['bb_nitelik']:
-                # Bağımsız bölüm olmayan gayrimenkuller için
-                if tasim['tapu_tarih']:
-                    tarih, saat = self.format_datetime(tasim['tapu_tarih'])
-                    bb_texts.append(f"({tasim['ada_parsel']} parsel {tarih} tarih ve saat {saat})")
-                else:
-                    bb_texts.append(f"({tasim['ada_parsel']} parsel)")
-    
+            bb_text = self.format_header_part(prop)
+            if bb_text:
+                bb_texts.append(bb_text)
+        return self.format_header_text(bb_texts)
+
+    def format_header_part(self, prop):
+        """Başlıktaki tek bir taşınmazın metnini döndürür; yer almıyorsa None"""
+        tasim = prop['Taşınmaz Bölümü']
+        bb_no = self.get_bb_no(prop)
+        if bb_no and tasim['bb_nitelik']:
+            # tapu_tarih varsa formatla ve ekle
+            if tasim['tapu_tarih']:
+                tarih, saat = self.format_datetime(tasim['tapu_tarih'])
+                return f"({tasim['ada_parsel']} parsel {bb_no} Nolu BB. {tasim['bb_nitelik']} Nitelikli Gayrimenkul {tarih} tarih ve saat {saat})"
+            return f"({tasim['ada_parsel']} parsel {bb_no} Nolu BB. {tasim['bb_nitelik']} Nitelikli Gayrimenkul)"
+        elif not bb_no and not tasim['bb_nitelik']:
+            # Bağımsız bölüm olmayan gayrimenkuller için
+            if tasim['tapu_tarih']:
+                tarih, saat = self.format_datetime(tasim['tapu_tarih'])
+                return f"({tasim['ada_parsel']} parsel {tarih} tarih ve saat {saat})"
+            return f"({tasim['ada_parsel']} parsel)"
+        return None
+
+    def format_header_text(self, bb_texts):
         header = "<br>TKGM Web-Tapu portaldan elektronik ortamda " + " ".join(bb_texts)
         return header + " tarih ve saat itibarıyla alınan ve rapor ekinde yer alan Tapu Kayıt Belgesine göre taşınmaz üzerinde aşağıda yer alan bilgiler bulunmaktadır.<br>"
 
@@ -402,83 +520,77 @@ class CokluInceleme:
     def merge_takyidats(self, properties):
         """Takyidatları başlıklarına göre gruplar ve benzer içerikli olanları birleştirir"""
         merged = {}
+        kumeler = {}  # başlık -> merged[başlık] üzerindeki (tarih, lokasyon) kovalı dizin
 
         # Bağımsız bölüm kontrolü
         is_bagimsiz_bolum = properties[0]['Taşınmaz Bölümü'].get('bb_nitelik') and properties[0]['Taşınmaz Bölümü'].get('blok_kat_girisi_bbno')
 
         for prop in properties:
-            bb_no = self.get_bb_no(prop) if is_bagimsiz_bolum else None
-            ada_parsel = prop['Taşınmaz Bölümü']['ada_parsel']
+            self.takyidat_ekle(merged, kumeler, prop, is_bagimsiz_bolum)
 
-            for takyidat in prop['Şerh Beyan İrtifak Bölümü']:
-                # "MÜLKİYETE AİT REHİN BİLGİLERİ" başlıklı ve boş içerikli kayıtları atla
-                if (takyidat['takyidat_baslik'] == 'MÜLKİYETE AİT REHİN BİLGİLERİ' and 
-                    not takyidat['hucreno_2'].strip()):
-                    continue
-            
-                takyidat_baslik = takyidat['takyidat_baslik']
-                yevmiye = takyidat['takyidat_1']
-                tarih = takyidat['takyidat_2']
-                lokasyon = takyidat['takyidat_3']
-                content = takyidat['hucreno_2']
-            
-                # Özel başlıklar için farklı bir işlem yap
-                if takyidat_baslik in self.OZEL_BASLIKLAR:
-                    # BB no veya ada/parsel ile birlikte benzersiz key oluştur
-                    unique_key = f"{bb_no if bb_no else ada_parsel}_{content}"
-                    if takyidat_baslik not in merged:
-                        merged[takyidat_baslik] = {}
-                
-                    merged[takyidat_baslik][unique_key] = {
-                        'content': takyidat,
-                        'bb_numbers': {bb_no} if bb_no else None,
-                        'ada_parseller': {ada_parsel} if not bb_no else None,
-                        'yevmiye': yevmiye,
-                        'tarih': tarih,
-                        'lokasyon': lokasyon
-                    }
-                    continue
+        return merged
 
-                # Normal başlıklar için işlem
-                simplified_content = content.lower().replace(" ", "")[:100]
-                key = f"{simplified_content}_{tarih}_{lokasyon}"
+    def takyidat_ekle(self, merged, kumeler, prop, is_bagimsiz_bolum):
+        """Tek bir taşınmazın takyidatlarını birleştirilmiş kayıtlara ekler"""
+        bb_no = self.get_bb_no(prop) if is_bagimsiz_bolum else None
+        ada_parsel = prop['Taşınmaz Bölümü']['ada_parsel']
 
+        for takyidat in prop['Şerh Beyan İrtifak Bölümü']:
+            # "MÜLKİYETE AİT REHİN BİLGİLERİ" başlıklı ve boş içerikli kayıtları atla
+            if (takyidat['takyidat_baslik'] == 'MÜLKİYETE AİT REHİN BİLGİLERİ' and 
+                not takyidat['hucreno_2'].strip()):
+                continue
+        
+            takyidat_baslik = takyidat['takyidat_baslik']
+            yevmiye = takyidat['takyidat_1']
+            tarih = takyidat['takyidat_2']
+            lokasyon = takyidat['takyidat_3']
+            content = takyidat['hucreno_2']
+        
+            # Özel başlıklar için farklı bir işlem yap
+            if takyidat_baslik in self.OZEL_BASLIKLAR:
+                # BB no veya ada/parsel ile birlikte benzersiz key oluştur
+                unique_key = f"{bb_no if bb_no else ada_parsel}_{content}"
                 if takyidat_baslik not in merged:
                     merged[takyidat_baslik] = {}
+            
+                merged[takyidat_baslik][unique_key] = {
+                    'content': takyidat,
+                    'bb_numbers': {bb_no} if bb_no else None,
+                    'ada_parseller': {ada_parsel} if not bb_no else None,
+                    'yevmiye': yevmiye,
+                    'tarih': tarih,
+                    'lokasyon': lokasyon
+                }
+                continue
 
-                matching_key = None
-                for existing_key in merged[takyidat_baslik].keys():
-                    existing_data = merged[takyidat_baslik][existing_key]
-                    existing_content = existing_data['content']['hucreno_2']
-                    existing_simplified = existing_content.lower().replace(" ", "")[:100]
-
-                    try:
-                        similarity = sum(a == b for a, b in zip(simplified_content, existing_simplified)) / max(len(simplified_content), len(existing_simplified))
-                    except ZeroDivisionError:
-                        similarity = 0
+            # Normal başlıklar için işlem
+            simplified_content = sadelestir(content)
+            key = f"{simplified_content}_{tarih}_{lokasyon}"
 
-                    if similarity > 0.90 and tarih == existing_data['tarih'] and lokasyon == existing_data['lokasyon']:
-                        matching_key = existing_key
-                        break
+            if takyidat_baslik not in kumeler:
+                kumeler[takyidat_baslik] = TakyidatKumeleri(merged.setdefault(takyidat_baslik, {}))
+            kume = kumeler[takyidat_baslik]
 
-                if matching_key:
-                    key = matching_key
-                else:
-                    merged[takyidat_baslik][key] = {
-                        'content': takyidat,
-                        'bb_numbers': set() if is_bagimsiz_bolum else None,
-                        'ada_parseller': set() if not is_bagimsiz_bolum else None,
-                        'yevmiye': yevmiye,
-                        'tarih': tarih,
-                        'lokasyon': lokasyon
-                    }
-
-                if is_bagimsiz_bolum and bb_no:
-                    merged[takyidat_baslik][key]['bb_numbers'].add(bb_no)
-                elif not is_bagimsiz_bolum:
-                    merged[takyidat_baslik][key]['ada_parseller'].add(ada_parsel)
+            # Yalnızca aynı (tarih, lokasyon) kovasında blok paylaşan kayıtlarla karşılaştırılır
+            matching_key = kume.bul(simplified_content, tarih, lokasyon)
 
-        return merged
+            if matching_key:
+                key = matching_key
+            else:
+                kume.ekle(key, {
+                    'content': takyidat,
+                    'bb_numbers': set() if is_bagimsiz_bolum else None,
+                    'ada_parseller': set() if not is_bagimsiz_bolum else None,
+                    'yevmiye': yevmiye,
+                    'tarih': tarih,
+                    'lokasyon': lokasyon
+                }, simplified_content)
+
+            if is_bagimsiz_bolum and bb_no:
+                merged[takyidat_baslik][key]['bb_numbers'].add(bb_no)
+            elif not is_bagimsiz_bolum:
+                merged[takyidat_baslik][key]['ada_parseller'].add(ada_parsel)
 
     def merge_ipoteks(self, properties):
         """Aynı yevmiye numaralı ipotekleri birleştirir"""
@@ -488,30 +600,34 @@ class CokluInceleme:
         is_bagimsiz_bolum = properties[0]['Taşınmaz Bölümü'].get('bb_nitelik') and properties[0]['Taşınmaz Bölümü'].get('blok_kat_girisi_bbno')
     
         for prop in properties:
-            bb_no = self.get_bb_no(prop) if is_bagimsiz_bolum else None
-            ada_parsel = prop['Taşınmaz Bölümü']['ada_parsel']
-        
-            for ipotek in prop['İpotekler Bölümü']:
-                yevmiye = ipotek['yevmiye_no']
-                borc = ipotek['borc']
-            
-                # Yevmiye ve borç tutarı bazlı birleştirme anahtarı
-                key = f"{yevmiye}_{borc}"
-            
-                if key not in merged:
-                    merged[key] = {
-                        'data': ipotek,
-                        'bb_numbers': set() if is_bagimsiz_bolum else None,
-                        'ada_parseller': set() if not is_bagimsiz_bolum else None
-                    }
-            
-                if is_bagimsiz_bolum and bb_no:
-                    merged[key]['bb_numbers'].add(bb_no)
-                elif not is_bagimsiz_bolum:
-                    merged[key]['ada_parseller'].add(ada_parsel)
+            self.ipotek_ekle(merged, prop, is_bagimsiz_bolum)
     
         return merged
 
+    def ipotek_ekle(self, merged, prop, is_bagimsiz_bolum):
+        """Tek bir taşınmazın ipoteklerini birleştirilmiş kayıtlara ekler"""
+        bb_no = self.get_bb_no(prop) if is_bagimsiz_bolum else None
+        ada_parsel = prop['Taşınmaz Bölümü']['ada_parsel']
+    
+        for ipotek in prop['İpotekler Bölümü']:
+            yevmiye = ipotek['yevmiye_no']
+            borc = ipotek['borc']
+        
+            # Yevmiye ve borç tutarı bazlı birleştirme anahtarı
+            key = f"{yevmiye}_{borc}"
+        
+            if key not in merged:
+                merged[key] = {
+                    'data': ipotek,
+                    'bb_numbers': set() if is_bagimsiz_bolum else None,
+                    'ada_parseller': set() if not is_bagimsiz_bolum else None
+                }
+        
+            if is_bagimsiz_bolum and bb_no:
+                merged[key]['bb_numbers'].add(bb_no)
+            elif not is_bagimsiz_bolum:
+                merged[key]['ada_parseller'].add(ada_parsel)
+
     def generate_report(self):
         if not self.json_data:
             return "Veri bulunamadı."
@@ -526,69 +642,19 @@ class CokluInceleme:
         non_bb_properties = []
 
         for prop in all_properties:
-            is_bb = prop['Taşınmaz Bölümü'].get('bb_nitelik') and prop['Taşınmaz Bölümü'].get('blok_kat_girisi_bbno')
-            if is_bb:
+            if self.is_bb_property(prop):
                 bb_properties.append(prop)
             else:
                 non_bb_properties.append(prop)
 
         # Bağımsız bölüm olmayanlar için tek bir rapor oluştur
         if non_bb_properties:
-            # Parsel listesini oluştur
-            parsel_list = sorted([prop['Taşınmaz Bölümü']['ada_parsel'] for prop in non_bb_properties])
-            parsel_str = " VE ".join(parsel_list)
-
-            # Başlık oluştur
-            title = f"{parsel_str} PARSEL NOLU TAŞINMAZLAR TAKYİDATLARI"
-
-            # Header bilgilerini oluştur
-            header_parts = []
-            for prop in non_bb_properties:
-                base_text = f"({prop['Taşınmaz Bölümü']['ada_parsel']} parsel"
-                if prop['Taşınmaz Bölümü']['tapu_tarih']:  # tapu_tarih varsa ekle
-                    base_text += f" {prop['Taşınmaz Bölümü']['tapu_tarih']}"
-                base_text += ")"
-                header_parts.append(base_text)
-
-            report_lines.extend([
-                "<br>",
-                f"<b>{title}</b>",
-                "<br>",
-                f"TKGM Web-Tapu portaldan elektronik ortamda {' '.join(header_parts)}\n"
-                f"tarih ve saat itibarıyla alınan ve rapor ekinde yer alan Tapu Kayıt Belgesine göre "
-                f"taşınmaz üzerinde aşağıda yer alan bilgiler bulunmaktadır.<br>",
-                "<br>"
-            ])
-            # Takyidatları yazdır
-            merged_takyidats = self.merge_takyidats(non_bb_properties)
-            if merged_takyidats:
-                for baslik, takyidatlar in merged_takyidats.items():
-                    report_lines.append(f"<b>{baslik} hanesinde;</b><br>")
-                    for key, data in takyidatlar.items():
-                        line = self.format_takyidat(
-                            data['content'], 
-                            None,  # bb_numbers
-                            data['ada_parseller'],  # ada_parseller
-                            data.get('extra_yevmiye')  # extra_yevmiye
-                        )
-                        report_lines.append(f"{line}<br>")
-                    report_lines.append("<br>")
-
-            # İpotekleri yazdır
-            report_lines.append("<b>MÜLKİYETE AİT REHİN BİLGİLERİ hanesinde;</b><br>")
-            merged_ipoteks = self.merge_ipoteks(non_bb_properties)
-            if merged_ipoteks:
-                for key, data in merged_ipoteks.items():
-                    line = self.format_ipotek(parsel_list[0], data['data'], None, data['ada_parseller'])
-                    report_lines.append(f"{line}<br>")
-            else:
-                report_lines.append("- Herhangi bir ipotek bulunmamaktadır.<br>")
-
-            report_lines.extend([
-                "<br>",
-                "_" * 50,
-                "<br>"
-            ])
+            report_lines.extend(self.non_bb_section_lines(
+                [prop['Taşınmaz Bölümü']['ada_parsel'] for prop in non_bb_properties],
+                [self.non_bb_header_part(prop) for prop in non_bb_properties],
+                self.merge_takyidats(non_bb_properties),
+                self.merge_ipoteks(non_bb_properties)
+            ))
 
         # Bağımsız bölümler için
         if bb_properties:
@@ -602,70 +668,140 @@ class CokluInceleme:
 
             # Her ada/parsel grubu için rapor oluştur
             for ada_parsel, properties in bb_grouped.items():
-                first_prop = properties[0]['Taşınmaz Bölümü']
-            
-                # Başlık oluşturma
                 bb_list = []
                 for prop in properties:
                     bb_no = self.get_bb_no(prop)
                     if bb_no:
                         bb_list.append(bb_no)
 
-                # Sayısal sıralama yap ve string'e çevir
-                sorted_numbers = sorted(bb_list)
-                bb_list_str = [str(num) for num in sorted_numbers]
+                report_lines.extend(self.bb_section_lines(
+                    ada_parsel,
+                    bb_list,
+                    self.format_header(properties),
+                    self.merge_takyidats(properties),
+                    self.merge_ipoteks(properties)
+                ))
 
-                if len(bb_list_str) == 0:
-                    bb_str = ""  # Varsayılan değer veya hata yönetimi
-                elif len(bb_list_str) == 1:
-                    bb_str = bb_list_str[0]
-                elif len(bb_list_str) == 2:
-                    bb_str = " ve ".join(bb_list_str)
-                else:
-                    bb_str = ", ".join(bb_list_str[:-1]) + " ve " + bb_list_str[-1]
+        return "\n".join(report_lines)
 
-                title = f"{ada_parsel} PARSEL {bb_str} NOLU BAĞIMSIZ BÖLÜM TAKYİDATLARI"
-            
-                report_lines.extend([
-                    "<br>",
-                    f"<b>{title}</b>",
-                    "<br>",
-                    self.format_header(properties),
-                    "<br>"
-                ])
-
-                # Takyidatları yazdır
-                merged_takyidats = self.merge_takyidats(properties)
-                if merged_takyidats:
-                    for baslik, takyidatlar in merged_takyidats.items():
-                        report_lines.append(f"<b>{baslik} hanesinde;</b><br>")
-                        for key, data in takyidatlar.items():
-                            line = self.format_takyidat(
-                                data['content'], 
-                                data['bb_numbers'],  # bb_numbers
-                                None,  # ada_parseller
-                                data.get('extra_yevmiye')  # extra_yevmiye
-                            )
-                            report_lines.append(f"{line}<br>")
-                        report_lines.append("<br>")
-
-                # İpotek bilgileri
-                report_lines.append("<b>MÜLKİYETE AİT REHİN BİLGİLERİ hanesinde;</b><br>")
-                merged_ipoteks = self.merge_ipoteks(properties)
-                if merged_ipoteks:
-                    for key, data in merged_ipoteks.items():
-                        line = self.format_ipotek(ada_parsel, data['data'], data['bb_numbers'])
-                        report_lines.append(f"{line}<br>")
-                else:
-                    report_lines.append("- Herhangi bir ipotek bulunmamaktadır.<br>")
+    def is_bb_property(self, prop):
+        """Taşınmaz bağımsız bölüm mü"""
+        return prop['Taşınmaz Bölümü'].get('bb_nitelik') and prop['Taşınmaz Bölümü'].get('blok_kat_girisi_bbno')
 
-                report_lines.extend([
-                    "<br>",
-                    "_" * 50,
-                    "<br>"
-                ])
+    def non_bb_header_part(self, prop):
+        """Bağımsız bölüm olmayan taşınmazın başlık metni"""
+        base_text = f"({prop['Taşınmaz Bölümü']['ada_parsel']} parsel"
+        if prop['Taşınmaz Bölümü']['tapu_tarih']:  # tapu_tarih varsa ekle
+            base_text += f" {prop['Taşınmaz Bölümü']['tapu_tarih']}"
+        base_text += ")"
+        return base_text
 
-        return "\n".join(report_lines)
+    def non_bb_section_lines(self, parseller, header_parts, merged_takyidats, merged_ipoteks):
+        """Bağımsız bölüm olmayan tüm parseller için ortak rapor bölümünün satırları"""
+        report_lines = []
+
+        # Parsel listesini oluştur
+        parsel_list = sorted(parseller)
+        parsel_str = " VE ".join(parsel_list)
+
+        # Başlık oluştur
+        title = f"{parsel_str} PARSEL NOLU TAŞINMAZLAR TAKYİDATLARI"
+
+        report_lines.extend([
+            "<br>",
+            f"<b>{title}</b>",
+            "<br>",
+            f"TKGM Web-Tapu portaldan elektronik ortamda {' '.join(header_parts)}\n"
+            f"tarih ve saat itibarıyla alınan ve rapor ekinde yer alan Tapu Kayıt Belgesine göre "
+            f"taşınmaz üzerinde aşağıda yer alan bilgiler bulunmaktadır.<br>",
+            "<br>"
+        ])
+        # Takyidatları yazdır
+        if merged_takyidats:
+            for baslik, takyidatlar in merged_takyidats.items():
+                report_lines.append(f"<b>{baslik} hanesinde;</b><br>")
+                for key, data in takyidatlar.items():
+                    line = self.format_takyidat(
+                        data['content'], 
+                        None,  # bb_numbers
+                        data['ada_parseller'],  # ada_parseller
+                        data.get('extra_yevmiye')  # extra_yevmiye
+                    )
+                    report_lines.append(f"{line}<br>")
+                report_lines.append("<br>")
+
+        # İpotekleri yazdır
+        report_lines.append("<b>MÜLKİYETE AİT REHİN BİLGİLERİ hanesinde;</b><br>")
+        if merged_ipoteks:
+            for key, data in merged_ipoteks.items():
+                line = self.format_ipotek(parsel_list[0], data['data'], None, data['ada_parseller'])
+                report_lines.append(f"{line}<br>")
+        else:
+            report_lines.append("- Herhangi bir ipotek bulunmamaktadır.<br>")
+
+        report_lines.extend([
+            "<br>",
+            "_" * 50,
+            "<br>"
+        ])
+        return report_lines
+
+    def bb_section_lines(self, ada_parsel, bb_list, header, merged_takyidats, merged_ipoteks):
+        """Bir ada/parseldeki bağımsız bölümlerin rapor bölümünün satırları"""
+        report_lines = []
+
+        # Sayısal sıralama yap ve string'e çevir
+        sorted_numbers = sorted(bb_list)
+        bb_list_str = [str(num) for num in sorted_numbers]
+
+        if len(bb_list_str) == 0:
+            bb_str = ""  # Varsayılan değer veya hata yönetimi
+        elif len(bb_list_str) == 1:
+            bb_str = bb_list_str[0]
+        elif len(bb_list_str) == 2:
+            bb_str = " ve ".join(bb_list_str)
+        else:
+            bb_str = ", ".join(bb_list_str[:-1]) + " ve " + bb_list_str[-1]
+
+        title = f"{ada_parsel} PARSEL {bb_str} NOLU BAĞIMSIZ BÖLÜM TAKYİDATLARI"
+    
+        report_lines.extend([
+            "<br>",
+            f"<b>{title}</b>",
+            "<br>",
+            header,
+            "<br>"
+        ])
+
+        # Takyidatları yazdır
+        if merged_takyidats:
+            for baslik, takyidatlar in merged_takyidats.items():
+                report_lines.append(f"<b>{baslik} hanesinde;</b><br>")
+                for key, data in takyidatlar.items():
+                    line = self.format_takyidat(
+                        data['content'], 
+                        data['bb_numbers'],  # bb_numbers
+                        None,  # ada_parseller
+                        data.get('extra_yevmiye')  # extra_yevmiye
+                    )
+                    report_lines.append(f"{line}<br>")
+                report_lines.append("<br>")
+
+        # İpotek bilgileri
+        report_lines.append("<b>MÜLKİYETE AİT REHİN BİLGİLERİ hanesinde;</b><br>")
+        if merged_ipoteks:
+            for key, data in merged_ipoteks.items():
+                line = self.format_ipotek(ada_parsel, data['data'], data['bb_numbers'])
+                report_lines.append(f"{line}<br>")
+        else:
+            report_lines.append("- Herhangi bir ipotek bulunmamaktadır.<br>")
+
+        report_lines.extend([
+            "<br>",
+            "_" * 50,
+            "<br>"
+        ])
+        return report_lines
 
     def save_report(self, filename=None):
         """Raporu dosyaya kaydeder"""
@@ -695,6 +831,120 @@ class CokluInceleme:
         
         return f"JSON dosyası oluşturuldu: {filename}"
 
+    def tasinmazlari_akit(self, conn):
+        """Taşınmazları ada/parsel sırasıyla birer birer üretir; imleçler satır satır okunur"""
+        kayitlar = self.toplu_kayitlari_getir(conn, sira="t.ada_parsel, t.id")
+        for tasinmaz_no, tasinmaz_data, takyidat_records, ipotek_records in kayitlar:
+            yield tasinmaz_no, self.create_tasinmaz_data(tasinmaz_data, takyidat_records, ipotek_records)
+
+    def json_girdisi_yaz(self, dosya, anahtar, veri, ilk, metin=None):
+        """
+        json.dump(..., indent=4) ile aynı biçimde tek bir üst düzey girdiyi yazar
+
+        metin verilirse verinin json.dumps(..., indent=4) çıktısıdır ve veri
+        yeniden kodlanmaz.
+        """
+        if metin is None:
+            metin = json.dumps(veri, ensure_ascii=False, indent=4)
+        metin = metin.replace("\n", "\n    ")
+        dosya.write(("{\n" if ilk else ",\n") + f"    {json.dumps(anahtar, ensure_ascii=False)}: {metin}")
+
+    def akis_raporu(self, filename=None, json_filename=None, donustur=None):
+        """
+        Çoklu raporu tüm veriyi belleğe almadan dosyaya yazar
+
+        Taşınmazlar ada/parsel sırasıyla tek tek okunur; her biri okunduğu anda
+        JSON dosyasına yazılır, raporda yalnızca birleştirilmiş takyidat/ipotek
+        kayıtları ve başlık metinleri tutulur. Bağımsız bölüm grupları bitince
+        geçici dosyaya yazılır; bağımsız bölüm olmayan parsellerin ortak bölümü
+        en başta yer aldığından sona kadar biriktirilir. donustur verilirse her
+        bölümün metni yazılmadan önce ondan geçirilir.
+        """
+        if filename is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f'takbis_rapor_{timestamp}.txt'
+        donustur = donustur or (lambda metin: metin)
+
+        bb_disi = {'parseller': [], 'basliklar': [], 'takyidatlar': {}, 'kumeler': {}, 'ipotekler': {}}
+        grup = None
+        grup_sayisi = 0
+        tasinmaz_sayisi = 0
+
+        conn = self.connect_db()
+        try:
+            with ExitStack() as yigin:
+                rapor = yigin.enter_context(open(filename, 'w', encoding='utf-8'))
+                gruplar = yigin.enter_context(tempfile.TemporaryFile('w+', encoding='utf-8'))
+                json_dosyasi = yigin.enter_context(open(json_filename, 'w', encoding='utf-8')) if json_filename else None
+
+                for tasinmaz_no, prop in self.tasinmazlari_akit(conn):
+                    if json_dosyasi:
+                        self.json_girdisi_yaz(json_dosyasi, f"Tasinmaz_{tasinmaz_no}", prop, tasinmaz_sayisi == 0)
+                    tasinmaz_sayisi += 1
+
+                    if not self.is_bb_property(prop):
+                        bb_disi['parseller'].append(prop['Taşınmaz Bölümü']['ada_parsel'])
+                        bb_disi['basliklar'].append(self.non_bb_header_part(prop))
+                        self.takyidat_ekle(bb_disi['takyidatlar'], bb_disi['kumeler'], prop, False)
+                        self.ipotek_ekle(bb_disi['ipotekler'], prop, False)
+                        continue
+
+                    # Sıralı okunduğundan aynı ada/parseldeki bağımsız bölümler art arda gelir
+                    ada_parsel = prop['Taşınmaz Bölümü']['ada_parsel']
+                    if grup is None or grup['ada_parsel'] != ada_parsel:
+                        if grup is not None:
+                            self.akis_grubunu_yaz(gruplar, grup, grup_sayisi, donustur)
+                            grup_sayisi += 1
+                        grup = {'ada_parsel': ada_parsel, 'bb_list': [], 'basliklar': [],
+                                'takyidatlar': {}, 'kumeler': {}, 'ipotekler': {}}
+
+                    bb_no = self.get_bb_no(prop)
+                    if bb_no:
+                        grup['bb_list'].append(bb_no)
+                    baslik = self.format_header_part(prop)
+                    if baslik:
+                        grup['basliklar'].append(baslik)
+                    self.takyidat_ekle(grup['takyidatlar'], grup['kumeler'], prop, True)
+                    self.ipotek_ekle(grup['ipotekler'], prop, True)
+
+                if grup is not None:
+                    self.akis_grubunu_yaz(gruplar, grup, grup_sayisi, donustur)
+                    grup_sayisi += 1
+
+                if json_dosyasi:
+                    json_dosyasi.write("\n}" if tasinmaz_sayisi else "{}")
+
+                if not tasinmaz_sayisi:
+                    rapor.write(donustur("Veri bulunamadı."))
+                else:
+                    if bb_disi['parseller']:
+                        rapor.write(donustur("\n".join(self.non_bb_section_lines(
+                            bb_disi['parseller'], bb_disi['basliklar'],
+                            bb_disi['takyidatlar'], bb_disi['ipotekler']
+                        ))))
+                        if grup_sayisi:
+                            rapor.write("\n")
+                    gruplar.seek(0)
+                    shutil.copyfileobj(gruplar, rapor)
+
+            logging.info(f"Akış raporu: {tasinmaz_sayisi} taşınmaz, {grup_sayisi} bağımsız bölüm grubu")
+            return f"Rapor başarıyla kaydedildi: {filename}"
+
+        finally:
+            conn.close()
+
+    def akis_grubunu_yaz(self, dosya, grup, sira, donustur):
+        """Tamamlanan bağımsız bölüm grubunun rapor bölümünü yazar"""
+        if sira:
+            dosya.write("\n")
+        dosya.write(donustur("\n".join(self.bb_section_lines(
+            grup['ada_parsel'],
+            grup['bb_list'],
+            self.format_header_text(grup['basliklar']),
+            grup['takyidatlar'],
+            grup['ipotekler']
+        ))))
+
     def takyidat_turu_belirle(self, takyidat):
         """
         Takyidat türünü hucreno_1 ve hucreno_2 içeriğine göre belirler
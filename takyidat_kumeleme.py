@@ -0,0 +1,92 @@
+"""
+Benzer takyidatları birleştirmek için kovalanmış eşleştirme
+
+İki takyidat; tarih ve lokasyonları aynıysa ve sadeleştirilmiş içeriklerinin
+konumsal benzerliği eşiği geçiyorsa birleşir. Kayıtlar (tarih, lokasyon)
+kovalarında, içeriğin 5 karakterlik bloklarıyla dizinlenir; karşılaştırma
+yalnızca en az bir bloğu aynı konumda birebir tutan adaylarla yapılır.
+"""
+
+BENZERLIK_ESIGI = 0.90
+ONEK_UZUNLUGU = 100
+BLOK_UZUNLUGU = 5
+
+
+def sadelestir(metin):
+    """Karşılaştırılan içerik: küçük harf, boşluksuz, ilk 100 karakter"""
+    return metin.lower().replace(" ", "")[:ONEK_UZUNLUGU]
+
+
+def benzerlik(a, b):
+    """Aynı konumdaki eşit karakterlerin uzun metne oranı"""
+    uzunluk = max(len(a), len(b))
+    if not uzunluk:
+        return 0
+    return sum(x == y for x, y in zip(a, b)) / uzunluk
+
+
+def parmak_izleri(sade):
+    """
+    Eşiği geçen her çiftin en az birini paylaştığı (konum, blok) anahtarları
+
+    Benzerlik 0.90'ı geçiyorsa kısa metnin uzunluğu k için kısa metin
+    içindeki farklı karakter sayısı k/10'dan azdır; k >= 5 iken tam blok
+    sayısı (k // 5) bundan büyük olduğundan en az bir blok iki metinde de
+    aynıdır. 5 karakterden kısa metinler ancak birebir aynı metinle eşleşir.
+    """
+    if len(sade) < BLOK_UZUNLUGU:
+        return [(-1, sade)]
+    return [
+        (sira, sade[sira * BLOK_UZUNLUGU:(sira + 1) * BLOK_UZUNLUGU])
+        for sira in range(len(sade) // BLOK_UZUNLUGU)
+    ]
+
+
+class TakyidatKumeleri:
+    """
+    Bir başlık altındaki birleştirilmiş takyidat kayıtlarının dizini
+
+    kayitlar sözlüğü (anahtar -> kayıt) dışarıyla paylaşılır ve ekleme
+    sırasını korur; bul() eski tam taramanın döndüreceği ilk anahtarı döndürür.
+    """
+
+    def __init__(self, kayitlar=None, esik=BENZERLIK_ESIGI):
+        self.kayitlar = {} if kayitlar is None else kayitlar
+        self.esik = esik
+        self.siralar = {}   # anahtar -> kayitlar içindeki sırası
+        self.sadeler = {}   # anahtar -> sadeleştirilmiş içerik
+        self.kovalar = {}   # (tarih, lokasyon) -> {parmak izi -> [anahtar]}
+
+    def bul(self, sade, tarih, lokasyon):
+        """Benzer ilk kaydın anahtarını, yoksa None döndürür"""
+        kova = self.kovalar.get((tarih, lokasyon))
+        if not kova or not sade:
+            return None
+
+        adaylar = set()
+        for iz in parmak_izleri(sade):
+            adaylar.update(kova.get(iz, ()))
+
+        for anahtar in sorted(adaylar, key=self.siralar.__getitem__):
+            if benzerlik(sade, self.sadeler[anahtar]) > self.esik:
+                return anahtar
+        return None
+
+    def ekle(self, anahtar, kayit, sade):
+        """Kaydı ekler; aynı anahtar varsa sözlükteki yerini koruyarak üzerine yazar"""
+        if anahtar in self.siralar:
+            self.cikar(anahtar)
+        else:
+            self.siralar[anahtar] = len(self.siralar)
+
+        self.kayitlar[anahtar] = kayit
+        self.sadeler[anahtar] = sade
+        kova = self.kovalar.setdefault((kayit['tarih'], kayit['lokasyon']), {})
+        for iz in parmak_izleri(sade):
+            kova.setdefault(iz, []).append(anahtar)
+
+    def cikar(self, anahtar):
+        eski = self.kayitlar[anahtar]
+        kova = self.kovalar[(eski['tarih'], eski['lokasyon'])]
+        for iz in parmak_izleri(self.sadeler[anahtar]):
+            kova[iz].remove(anahtar)
@@ -0,0 +1,408 @@
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+from takbis_belge import TakbisBelgesi
+from tablo_analiz import TableAnalyzer, tablo_satirlarini_cikar, KOORDINAT_EKLE_SQL, TAPU_EKLE_SQL, TAPU_KOLONLARI
+from ipotek_extractor import IpotekKoordinatExtractor, BANKA_DOSYASI
+from banka_cozucu import bankalari_ekle
+from basliklar import FitzTapuAnalyzer
+from takbisduzenle import TapuProcessor, TesisProcessor, baslik_siniflandirici
+from toplu_yazici import TopluYazici
+from is_birimi import IsBirimi
+from aktarim_manifest import AktarimManifest
+from rapor_onbellegi import surum_artir
+from sayfa_onbellegi import SayfaOnbellegi, varsayilan_onbellek_dizini
+
+
+def belge_ayristir(file_path, onbellek_dizini=None, ozet=None):
+    """
+    İşçi süreçte tek bir PDF'i ayrıştırır; veritabanına hiçbir şey yazmaz
+
+    onbellek_dizini verilirse sayfa düzeni analizi (kelimeler, tablolar, span'ler)
+    belge özetiyle diskten okunur, yoksa hesaplanıp oraya yazılır.
+    """
+    sonuc = {'dosya': file_path, 'hata': None}
+    try:
+        table_analyzer = TableAnalyzer()
+        onbellek = SayfaOnbellegi(onbellek_dizini) if onbellek_dizini else None
+
+        with TakbisBelgesi(file_path, onbellek, ozet) as belge:
+            text = belge.sayfalar[0].extract_text()
+
+            # Doğrulama işlemleri
+            if not table_analyzer.tapu_belgesi_kontrol(text):
+                raise ValueError("Geçerli bir tapu belgesi değil")
+
+            tasinmaz_no = table_analyzer.tasinmaz_kimlik_no_al(text)
+            if not tasinmaz_no:
+                raise ValueError("Taşınmaz Kimlik No bulunamadı")
+            sonuc['tasinmaz_no'] = tasinmaz_no
+
+            # Fitz koordinatları
+            try:
+                sonuc['koordinatlar'] = table_analyzer.fitz_koordinatlarini_cikar(belge, tasinmaz_no)
+            except Exception as e:
+                logging.error(f"Fitz koordinat çıkarma hatası: {str(e)}")
+                sonuc['koordinatlar'] = []
+
+            # İpotek verileri
+            ipotek_extractor = IpotekKoordinatExtractor()
+            try:
+                sonuc['ipotek'] = ipotek_extractor.veri_cikar(belge)
+            except Exception as e:
+                logging.error(f"PDF işleme hatası: {str(e)}")
+                sonuc['ipotek'] = None
+            sonuc['sayfa_istatistigi'] = ipotek_extractor.sayfa_istatistigi
+            # İşçiler banka dosyasına yazmaz; yeni bankalar yazıcıda kaydedilir
+            sonuc['yeni_bankalar'] = ipotek_extractor.banka_cozucu.yeni_bankalar
+
+            # Tablo satırları
+            try:
+                sonuc['tapu_satirlari'] = tablo_satirlarini_cikar(belge, tasinmaz_no)
+            except Exception as e:
+                logging.error(f"PDF analiz hatası: {str(e)}")
+                sonuc['tapu_satirlari'] = None
+
+            # Başlık analizi
+            fitz_analyzer = FitzTapuAnalyzer()
+            sonuc['baslik_analizi'] = fitz_analyzer.analyze_pdf(file_path, belge)
+            sonuc['baslik_kayitlari'] = fitz_analyzer.baslik_kayitlari
+
+    except Exception as e:
+        sonuc['hata'] = str(e)
+
+    return sonuc
+
+
+# Hazırlık kuyruğunda sonuçların bittiğini bildirir
+KUYRUK_SONU = None
+
+
+class TopluAktarim:
+    """
+    PDF ayrıştırmayı süreç havuzuna dağıtır, sonuçları tek yazıcı ile veritabanına uygular
+
+    Aşamalar sınırlı kuyruklarla bağlıdır: havuzda en fazla kuyruk_boyutu belge
+    ayrıştırılır, hazırlık iş parçacığı (yazıcı tamponu, başlık ön sınıflandırması)
+    en fazla kuyruk_boyutu sonucu yazıcıya bekletir. Yazıcı geride kalırsa önceki
+    aşamalar durur; böylece bellek kullanımı dosya sayısından bağımsız kalır.
+    """
+
+    def __init__(self, db_path="veritabani.db", isci_sayisi=None, onbellek_dizini=None, kuyruk_boyutu=None):
+        self.db_path = db_path
+        self.isci_sayisi = isci_sayisi or os.cpu_count() or 1
+        self.onbellek_dizini = onbellek_dizini or varsayilan_onbellek_dizini(db_path)
+        self.kuyruk_boyutu = max(1, kuyruk_boyutu or 2 * self.isci_sayisi)
+        self.table_analyzer = TableAnalyzer()
+        self.sayfa_istatistigi = None
+        self.hazirlik_hatasi = None
+
+    def calistir(self, dosyalar, ilerleme=None, detay=None, dosya_bitti=None, iptal=None):
+        """
+        Dosyaları içeri aktarır
+
+        Args:
+            dosyalar (list): PDF dosya yolları
+            ilerleme (callable): (dosya, sıra) ile her sonuç yazılmadan önce çağrılır
+            detay (callable): Kullanıcıya gösterilecek her mesaj için çağrılır
+            dosya_bitti (callable): Her dosyanın son işlemleri bittikten sonra çağrılır
+            iptal (callable): True dönerse kalan dosyalar işlenmez
+
+        Returns:
+            tuple: (başarılı dosyalar, [(başarısız dosya, hata)])
+        """
+        detay = detay or logging.info
+        successful_files = []
+        failed_files = []
+        self.sayfa_istatistigi = {'sayfa': 0, 'aday': 0, 'sure': 0.0}
+
+        # Ext koordinat tablosunu oluştur
+        self.table_analyzer.create_ext_koordinat_table(self.db_path)
+
+        # Daha önce aktarılmış ve değişmemiş dosyalar PDF açılmadan atlanır
+        manifest = AktarimManifest(self.db_path)
+        try:
+            bilinenler, yeni_dosyalar, ozetler = manifest.ayir(dosyalar)
+        except Exception as e:
+            logging.error(f"Aktarım manifesti okunamadı: {str(e)}")
+            bilinenler, yeni_dosyalar, ozetler = [], list(dosyalar), {}
+
+        for sira, (file_path, tasinmaz_no) in enumerate(bilinenler, 1):
+            if ilerleme:
+                ilerleme(file_path, sira)
+            detay(
+                f"ATLANDI - {os.path.basename(file_path)}: "
+                f"Bu taşınmaz (Kimlik No: {tasinmaz_no}) zaten kayıtlı"
+            )
+
+        # Ayrıştırma ve hazırlık ayrı iş parçacığında ilerler, yazma bu iş parçacığında kalır
+        kuyruk = queue.Queue(maxsize=self.kuyruk_boyutu)
+        durdur = threading.Event()
+        self.hazirlik_hatasi = None
+        hazirlayici = threading.Thread(
+            target=self.hazirla,
+            args=(self.sonuclari_uret(yeni_dosyalar, ozetler), kuyruk, durdur),
+            name="aktarim-hazirlik",
+            daemon=True,
+        )
+        hazirlayici.start()
+
+        sira = len(bilinenler)
+        try:
+            while True:
+                sonuc = kuyruk.get()
+                if sonuc is KUYRUK_SONU:
+                    break
+                sira += 1
+
+                if iptal and iptal():
+                    detay(f"İPTAL - {len(dosyalar) - sira + 1} dosya işlenmedi")
+                    break
+
+                file_path = sonuc['dosya']
+                if ilerleme:
+                    ilerleme(file_path, sira)
+
+                for anahtar, deger in (sonuc.get('sayfa_istatistigi') or {}).items():
+                    self.sayfa_istatistigi[anahtar] += deger
+
+                # Banka dosyasının tek yazıcısı burasıdır (işçi süreçler eşzamanlı yazmaz)
+                bankalari_ekle(BANKA_DOSYASI, sonuc.get('yeni_bankalar'))
+
+                try:
+                    # Belgenin satırları ve tüm düzenlemeleri tek işlemde yazılır;
+                    # hata olursa taşınmaz bütünüyle geri alınır
+                    with IsBirimi(self.db_path) as is_birimi:
+                        yazilan_tasinmaz = self.sonucu_yaz(sonuc, detay, is_birimi)
+
+                        # Son işlemler yalnızca yeni içeri aktarılan taşınmaza uygulanır;
+                        # daha önce tamamlanmış taşınmazlar yeniden taranmaz
+                        if yazilan_tasinmaz:
+                            self.son_islemler(yazilan_tasinmaz, detay, is_birimi)
+                            self.surumu_artir(yazilan_tasinmaz, is_birimi)
+
+                        # Yazılan veya zaten kayıtlı bulunan dosya bir sonraki seçimde atlanır
+                        manifest.kaydet(file_path, sonuc['tasinmaz_no'], ozetler.get(file_path), is_birimi)
+
+                    if yazilan_tasinmaz:
+                        successful_files.append(file_path)
+                except Exception as e:
+                    failed_files.append((file_path, str(e)))
+                    detay(f"HATA - {os.path.basename(file_path)}: {str(e)}")
+
+                if dosya_bitti:
+                    dosya_bitti()
+        finally:
+            # Erken çıkışta hazırlık aşaması kuyruğa yazmayı bırakır ve havuzu kapatır
+            durdur.set()
+            hazirlayici.join()
+
+        if self.hazirlik_hatasi is not None:
+            raise self.hazirlik_hatasi
+
+        # Başlıksız boş yevmiye satırları tüm dosyalar yazıldıktan sonra tek seferde silinir
+        if successful_files:
+            basarili, mesaj = TapuProcessor(self.db_path).delete_empty_cells_with_yevmiye()
+            if basarili:
+                logging.info(f"Boş yevmiye satırları temizlendi: {mesaj}")
+            else:
+                detay(f"HATA - Boş yevmiye satırları silinemedi: {mesaj}")
+
+        if self.sayfa_istatistigi['sure']:
+            logging.info(
+                f"İpotek sayfası sınıflandırma: {self.sayfa_istatistigi['sayfa']} sayfa, "
+                f"{self.sayfa_istatistigi['aday']} aday, "
+                f"{self.sayfa_istatistigi['sayfa'] / self.sayfa_istatistigi['sure']:.0f} sayfa/sn"
+            )
+
+        return successful_files, failed_files
+
+    def sonuclari_uret(self, dosyalar, ozetler=None):
+        """Ayrıştırma sonuçlarını tamamlanma sırasıyla üretir"""
+        ozetler = ozetler or {}
+        if self.isci_sayisi <= 1 or len(dosyalar) <= 1:
+            for file_path in dosyalar:
+                yield belge_ayristir(file_path, self.onbellek_dizini, ozetler.get(file_path))
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.isci_sayisi, len(dosyalar))) as havuz:
+            kalanlar = iter(dosyalar)
+            gorevler = {}
+            try:
+                while True:
+                    # Havuzda en fazla kuyruk_boyutu belge bekler; sonuçlar tüketilmedikçe yenisi verilmez
+                    for file_path in islice(kalanlar, self.kuyruk_boyutu - len(gorevler)):
+                        gorev = havuz.submit(belge_ayristir, file_path, self.onbellek_dizini, ozetler.get(file_path))
+                        gorevler[gorev] = file_path
+                    if not gorevler:
+                        break
+
+                    bitenler, _ = wait(gorevler, return_when=FIRST_COMPLETED)
+                    for gorev in bitenler:
+                        file_path = gorevler.pop(gorev)
+                        try:
+                            sonuc = gorev.result()
+                        except Exception as e:
+                            sonuc = {'dosya': file_path, 'hata': f"İşçi süreç hatası: {str(e)}"}
+                        yield sonuc
+            finally:
+                # Erken çıkışta (iptal) başlamamış görevleri beklemeden bırak
+                for gorev in gorevler:
+                    gorev.cancel()
+
+    def hazirla(self, sonuclar, kuyruk, durdur):
+        """Ayrıştırma sonuçlarını yazıma hazırlayıp sınırlı kuyruğa koyar (hazırlık iş parçacığı)"""
+        siniflandirici = baslik_siniflandirici().is_parcacigi_kopyasi()
+        try:
+            for sonuc in sonuclar:
+                if not self.kuyruga_koy(kuyruk, self.yazima_hazirla(sonuc, siniflandirici), durdur):
+                    break
+        except Exception as e:
+            logging.error(f"Aktarım hazırlık hatası: {str(e)}")
+            self.hazirlik_hatasi = e
+        finally:
+            sonuclar.close()
+            self.kuyruga_koy(kuyruk, KUYRUK_SONU, durdur)
+
+    def kuyruga_koy(self, kuyruk, oge, durdur):
+        """Kuyrukta yer açılana kadar bekler; yazıcı durduysa False döner"""
+        while not durdur.is_set():
+            try:
+                kuyruk.put(oge, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def yazima_hazirla(self, sonuc, siniflandirici=None):
+        """
+        Veritabanına dokunmadan yapılabilecek işleri yazıcıdan önce yapar
+
+        Koordinat ve tablo satırları yazıcı tamponuna alınır; satırlar başlık
+        sınıflandırıcısından geçirilerek TapuProcessor'ın yazma sırasındaki
+        başlık kontrolü önbellekten karşılanır.
+        """
+        if sonuc['hata'] or sonuc.get('tapu_satirlari') is None:
+            return sonuc
+
+        try:
+            (siniflandirici or baslik_siniflandirici()).satirlari_siniflandir(sonuc['tapu_satirlari'], TAPU_KOLONLARI)
+        except Exception as e:
+            logging.error(f"Başlık ön sınıflandırma hatası: {str(e)}")
+
+        sonuc['yazici'] = self.yazici_olustur(sonuc)
+        return sonuc
+
+    def yazici_olustur(self, sonuc):
+        """Belgenin koordinat ve tablo satırlarını tamponlayan yazıcıyı oluşturur"""
+        yazici = TopluYazici(self.db_path)
+        yazici.ekle_hepsi(KOORDINAT_EKLE_SQL, sonuc['koordinatlar'])
+        yazici.ekle_hepsi(TAPU_EKLE_SQL, sonuc['tapu_satirlari'])
+        return yazici
+
+    def sonucu_yaz(self, sonuc, detay, is_birimi=None):
+        """
+        Tek bir belgenin ayrıştırma sonucunu veritabanına uygular; yazılan taşınmaz kimliğini, atlanırsa None döner
+
+        is_birimi verilirse ipotek verileri, tablo satırları ve düzenleme işlemleri
+        onun işleminde yazılır ve herhangi bir adımdaki hata yükseltilir; çağıran
+        iş birimini geri alır. Kayıt kontrolü işlem başlamadan, kendi
+        bağlantısıyla yapılır.
+        """
+        file_path = sonuc['dosya']
+        dosya_adi = os.path.basename(file_path)
+
+        if sonuc['hata']:
+            raise ValueError(sonuc['hata'])
+
+        tasinmaz_no = sonuc['tasinmaz_no']
+        if self.table_analyzer.tasinmaz_kayit_kontrol(tasinmaz_no, self.db_path):
+            detay(
+                f"ATLANDI - {dosya_adi}: "
+                f"Bu taşınmaz (Kimlik No: {tasinmaz_no}) zaten kayıtlı"
+            )
+            return None
+
+        # İpotek verilerini kaydet
+        ipotek_sonuc = None
+        if sonuc['ipotek']:
+            ipotek_sonuc = IpotekKoordinatExtractor(self.db_path, is_birimi=is_birimi).kaydet(sonuc['ipotek'])
+
+        if sonuc['tapu_satirlari'] is None:
+            raise ValueError("PDF analizi başarısız oldu")
+
+        # Koordinatlar, tablo satırları ve başlıklar tek işlemde toplu yazılır
+        yazici = sonuc.get('yazici')
+        if yazici is None:
+            yazici = self.yazici_olustur(sonuc)
+
+        analysis_result = sonuc['baslik_analizi']
+        if analysis_result['status'] == 'success':
+            FitzTapuAnalyzer(self.db_path, tasinmaz_no).basliklari_kaydet(sonuc['baslik_kayitlari'], yazici)
+
+        try:
+            yazici.bosalt(is_birimi)
+        except Exception:
+            raise ValueError("PDF analizi başarısız oldu")
+
+        # Tapu düzenleme işlemleri
+        processor = TapuProcessor(self.db_path, tasinmaz_no, is_birimi)
+        if not processor.process_all():
+            raise ValueError("Veri işleme hatası")
+
+        # Tesis tarih işlemlerini yap; iş biriminde kısmi sonuç yazılmaz
+        tesis_sonuc = TesisProcessor(self.db_path, tasinmaz_no, is_birimi).process_all()
+        if not tesis_sonuc and is_birimi is not None:
+            raise ValueError("Tesis işleme hatası")
+
+        # Başlık analizi sonucu
+        if analysis_result['status'] == 'success':
+            detay(
+                f"BAŞLIK ANALİZİ - {dosya_adi}: "
+                f"{len(analysis_result['headers'])} başlık tespit edildi"
+            )
+        else:
+            detay(f"BAŞLIK ANALİZ UYARISI - {dosya_adi}: {analysis_result['message']}")
+
+        if tesis_sonuc:
+            if ipotek_sonuc:
+                success_message = f"BAŞARILI - {dosya_adi}: Veriler ve ipotek bilgileri kaydedildi. (Taşınmaz No: {tasinmaz_no})"
+            else:
+                success_message = f"BAŞARILI - {dosya_adi}: Veriler ve tesis bilgileri kaydedildi, ipotek bilgisi bulunamadı. (Taşınmaz No: {tasinmaz_no})"
+        else:
+            success_message = f"KISMEN BAŞARILI - {dosya_adi}: Veriler kaydedildi fakat tesis işlemleri başarısız. (Taşınmaz No: {tasinmaz_no})"
+
+        detay(success_message)
+        return tasinmaz_no
+
+    def surumu_artir(self, tasinmaz_no, is_birimi):
+        """Taşınmazın veri sürümünü aynı işlemde artırır; önbellekteki raporları yeniden üretilir"""
+        conn = is_birimi.baglanti()
+        try:
+            surum_artir(conn.cursor(), tasinmaz_no)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def son_islemler(self, tasinmaz_no, detay, is_birimi=None):
+        """Aktarılan taşınmazın başlık/koordinat eşleştirmelerini tamamlar"""
+        try:
+            processor = TapuProcessor(self.db_path, tasinmaz_no, is_birimi)
+            processor.add_baslik_deger_columns()
+            processor.update_missing_headers()
+
+            # Koordinat düzeltme işlemi
+            if processor.update_coordinate_assignments():
+                detay("\n✓")
+            else:
+                detay("\nUYARI - Koordinat düzeltme işleminde sorun oluştu")
+
+        except Exception as e:
+            # İş biriminde hata taşınmazın tüm yazımlarını geri aldırır
+            if is_birimi is not None:
+                raise
+            detay(f"\nHATA - Veritabanı temizliği sırasında: {str(e)}")
@@ -0,0 +1,51 @@
+import logging
+import sqlite3
+
+
+class TopluYazici:
+    """Bir belgenin satırlarını sorgu başına biriktirir, executemany ile tek işlemde yazar"""
+
+    def __init__(self, db_path="veritabani.db"):
+        self.db_path = db_path
+        self.tamponlar = {}  # sql -> satır listesi (ekleme sırası korunur)
+
+    def ekle(self, sql, satir):
+        """Tek satırı tampona ekler"""
+        self.tamponlar.setdefault(sql, []).append(satir)
+
+    def ekle_hepsi(self, sql, satirlar):
+        """Birden çok satırı tampona ekler"""
+        if satirlar:
+            self.tamponlar.setdefault(sql, []).extend(satirlar)
+
+    def __len__(self):
+        return sum(len(satirlar) for satirlar in self.tamponlar.values())
+
+    def bosalt(self, is_birimi=None):
+        """
+        Tamponlardaki tüm satırları tek bir işlemde yazar
+
+        Hata durumunda hiçbir satır yazılmaz ve hata yukarı iletilir. is_birimi
+        verilirse satırlar onun işleminde yazılır, COMMIT iş birimine kalır.
+
+        Returns:
+            int: Yazılan satır sayısı
+        """
+        if not self.tamponlar:
+            return 0
+
+        conn = is_birimi.baglanti() if is_birimi is not None else sqlite3.connect(self.db_path)
+        try:
+            yazilan = 0
+            with conn:
+                for sql, satirlar in self.tamponlar.items():
+                    conn.executemany(sql, satirlar)
+                    yazilan += len(satirlar)
+            self.tamponlar = {}
+            return yazilan
+
+        except Exception as e:
+            logging.error(f"Toplu yazma hatası: {str(e)}")
+            raise
+        finally:
+            conn.close()
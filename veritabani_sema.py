@@ -0,0 +1,300 @@
+import logging
+import re
+import sqlite3
+
+
+# Tablo tanımları; sütun sırası önemlidir (tapu_verileri konumsal INSERT ile doldurulur)
+TABLOLAR = {
+    'baslik_bilgileri': """
+        CREATE TABLE IF NOT EXISTS baslik_bilgileri (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tasinmaz_kimlik TEXT,
+            baslik TEXT,
+            sayfa_no INTEGER,
+            y_koordinat REAL,
+            auto_detected BOOLEAN DEFAULT FALSE,
+            tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            baslik_deger INTEGER
+        )
+    """,
+    'ipotek_verileri': """
+        CREATE TABLE IF NOT EXISTS ipotek_verileri (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tapu_tarih TEXT,
+            tasinmaz_kimlik TEXT,
+            sayfa_no INTEGER,
+            alacakli TEXT,
+            musterek_mi TEXT,
+            borc TEXT,
+            faiz TEXT,
+            derece_sira TEXT,
+            sure TEXT,
+            tesis_tarih TEXT,
+            tasinmaz TEXT,
+            hisse_pay_payda TEXT,
+            borclu_malik TEXT,
+            sn_bilgisi TEXT,
+            malik_borc TEXT,
+            tescil_tarih TEXT,
+            terkin TEXT
+        )
+    """,
+    'koordinat_bilgileri_ext': """
+        CREATE TABLE IF NOT EXISTS koordinat_bilgileri_ext (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tapu_rowid INTEGER,
+            hucreno_1_deger TEXT,
+            y_koordinat REAL,
+            tasinmaz_kimlik TEXT,
+            sayfano INTEGER,
+            satirno INTEGER,
+            baslik_deger INTEGER
+        )
+    """,
+    'takbis_tarih': """
+        CREATE TABLE IF NOT EXISTS takbis_tarih (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tapu_tarih TEXT,
+            tasinmaz_kimlik TEXT,
+            kayit_tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'tapu_verileri': """
+        CREATE TABLE IF NOT EXISTS tapu_verileri (
+            sayfano INTEGER NOT NULL,
+            satirno INTEGER NOT NULL,
+            hucreno_1 TEXT,
+            hucreno_2 TEXT,
+            hucreno_3 TEXT,
+            hucreno_4 TEXT,
+            hucreno_5 TEXT,
+            hucreno_6 TEXT,
+            hucreno_7 TEXT,
+            hucreno_8 TEXT,
+            hucreno_9 TEXT,
+            hucreno_10 TEXT,
+            hucreno_11 TEXT,
+            baslikontrol TEXT DEFAULT 'HAYIR',
+            tasinmaz_kimlik TEXT,
+            takyidat_baslik TEXT,
+            takyidat_1 TEXT,
+            takyidat_2 TEXT,
+            takyidat_3 TEXT,
+            y_koordinat REAL,
+            baslik_deger INTEGER
+        )
+    """,
+    'tasinmaz': """
+        CREATE TABLE IF NOT EXISTS tasinmaz (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tasinmaz_no TEXT UNIQUE,
+            zemintipi TEXT,
+            il_ilce TEXT,
+            kurum_adi TEXT,
+            mahalle TEXT,
+            mevki TEXT,
+            cilt_sayfa_no TEXT,
+            kayitdurumu TEXT,
+            ada_parsel TEXT,
+            at_yuzolcum TEXT,
+            bb_nitelik TEXT,
+            bb_brüt_yuzolcum TEXT,
+            bb_net_yuzolcum TEXT,
+            blok_kat_girisi_bbno TEXT,
+            arsa_pay_payda TEXT,
+            ana_tasinmaz_nitelik TEXT,
+            tapu_tarih TEXT,
+            baslik_islem_yapildi BOOLEAN DEFAULT FALSE
+        )
+    """,
+}
+
+# Eski sürümlerin oluşturduğu tablolarda eksik olabilecek kolonlar (ekleme sırasıyla)
+SONRADAN_EKLENEN_KOLONLAR = [
+    ('tapu_verileri', 'y_koordinat', 'REAL'),
+    ('tapu_verileri', 'baslik_deger', 'INTEGER'),
+    ('baslik_bilgileri', 'baslik_deger', 'INTEGER'),
+    ('koordinat_bilgileri_ext', 'baslik_deger', 'INTEGER'),
+]
+
+INDEKSLER = [
+    "CREATE INDEX IF NOT EXISTS ix_tapu_kimlik_sayfa ON tapu_verileri (tasinmaz_kimlik, sayfano, satirno)",
+    "CREATE INDEX IF NOT EXISTS ix_tapu_kimlik_baslik ON tapu_verileri (tasinmaz_kimlik, takyidat_baslik)",
+    "CREATE INDEX IF NOT EXISTS ix_tapu_kimlik_baslik_deger ON tapu_verileri (tasinmaz_kimlik, baslik_deger)",
+    "CREATE INDEX IF NOT EXISTS ix_koordinat_kimlik_deger ON koordinat_bilgileri_ext (tasinmaz_kimlik, hucreno_1_deger, sayfano)",
+    "CREATE INDEX IF NOT EXISTS ix_koordinat_kimlik_baslik_deger ON koordinat_bilgileri_ext (tasinmaz_kimlik, baslik_deger)",
+    "CREATE INDEX IF NOT EXISTS ix_koordinat_tapu_rowid ON koordinat_bilgileri_ext (tapu_rowid)",
+    "CREATE INDEX IF NOT EXISTS ix_baslik_kimlik_deger ON baslik_bilgileri (tasinmaz_kimlik, baslik_deger)",
+    "CREATE INDEX IF NOT EXISTS ix_ipotek_kimlik_sn ON ipotek_verileri (tasinmaz_kimlik, sn_bilgisi)",
+    "CREATE INDEX IF NOT EXISTS ix_takbis_tarih_kimlik ON takbis_tarih (tasinmaz_kimlik)",
+]
+
+
+def tablolari_olustur(cursor):
+    """Sürüm 1: tüm tabloları oluşturur, eski tablolardaki eksik kolonları tamamlar"""
+    for sql in TABLOLAR.values():
+        cursor.execute(sql)
+
+    for tablo, kolon, tip in SONRADAN_EKLENEN_KOLONLAR:
+        cursor.execute(f"PRAGMA table_info({tablo})")
+        if kolon not in [column[1] for column in cursor.fetchall()]:
+            cursor.execute(f"ALTER TABLE {tablo} ADD COLUMN {kolon} {tip}")
+
+
+def indeksleri_olustur(cursor):
+    """Sürüm 2: sık kullanılan filtreler için bileşik indeksler"""
+    for sql in INDEKSLER:
+        cursor.execute(sql)
+
+
+def manifest_tablosunu_olustur(cursor):
+    """Sürüm 3: içeri aktarılan dosyaların içerik özeti kayıtları"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS aktarim_manifest (
+            sha256 TEXT PRIMARY KEY,
+            dosya_yolu TEXT,
+            boyut INTEGER,
+            mtime_ns INTEGER,
+            tasinmaz_kimlik TEXT,
+            islem_surumu INTEGER,
+            aktarim_tarihi TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_manifest_dosya ON aktarim_manifest (dosya_yolu, boyut, mtime_ns)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_manifest_kimlik ON aktarim_manifest (tasinmaz_kimlik)")
+
+
+# Malik hücresindeki sıra numarası, ör. "(SN:12) AHMET YILMAZ"; LIKE gibi büyük/küçük harf duyarsız
+SN_DESENI = re.compile(r'\(SN:(\d+)\)', re.IGNORECASE)
+
+
+def malik_sn_dizinle(cursor, tasinmaz_kimlik=None):
+    """
+    tapu_verileri'ndeki malik SN numaralarını malik_sn tablosuna yazar
+
+    Her (taşınmaz, SN) için ilk eklenen (en küçük rowid'li) satır tutulur. Verilirse
+    yalnızca o taşınmazın kayıtları yeniden oluşturulur.
+
+    Returns:
+        int: Dizine eklenen SN sayısı
+    """
+    if tasinmaz_kimlik is None:
+        kosul, params = "", ()
+        cursor.execute("DELETE FROM malik_sn")
+    else:
+        kosul, params = " AND tasinmaz_kimlik = ?", (tasinmaz_kimlik,)
+        cursor.execute("DELETE FROM malik_sn WHERE tasinmaz_kimlik = ?", params)
+
+    cursor.execute(f"""
+        SELECT rowid, tasinmaz_kimlik, hucreno_2
+        FROM tapu_verileri
+        WHERE hucreno_2 LIKE '%(SN:%'{kosul}
+        ORDER BY tasinmaz_kimlik, rowid
+    """, params)
+
+    kayitlar = [
+        (kimlik, sn, rowid)
+        for rowid, kimlik, hucreno_2 in cursor.fetchall()
+        for sn in SN_DESENI.findall(hucreno_2)
+    ]
+    cursor.executemany(
+        "INSERT OR IGNORE INTO malik_sn (tasinmaz_kimlik, sn, tapu_rowid) VALUES (?, ?, ?)",
+        kayitlar
+    )
+    return len(kayitlar)
+
+
+def malik_sn_tablosunu_olustur(cursor):
+    """Sürüm 4: ipotek-malik eşleştirmesi için (taşınmaz, SN) -> tapu satırı dizini"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS malik_sn (
+            tasinmaz_kimlik TEXT NOT NULL,
+            sn TEXT NOT NULL,
+            tapu_rowid INTEGER NOT NULL,
+            PRIMARY KEY (tasinmaz_kimlik, sn)
+        )
+    """)
+    # Mevcut kayıtlar bir kez dizinlenir
+    malik_sn_dizinle(cursor)
+
+
+def rapor_onbellegi_tablolarini_olustur(cursor):
+    """Sürüm 5: taşınmaz veri sürümleri ve sürüme bağlı rapor önbelleği"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS veri_surumu (
+            tasinmaz_kimlik TEXT PRIMARY KEY,
+            surum INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rapor_onbellegi (
+            tasinmaz_kimlik TEXT NOT NULL,
+            tur TEXT NOT NULL,
+            surum INTEGER NOT NULL,
+            icerik TEXT,
+            PRIMARY KEY (tasinmaz_kimlik, tur)
+        )
+    """)
+    # Mevcut taşınmazlar ilk sürümle başlar
+    cursor.execute("""
+        INSERT OR IGNORE INTO veri_surumu (tasinmaz_kimlik, surum)
+        SELECT tasinmaz_no, 1 FROM tasinmaz WHERE tasinmaz_no IS NOT NULL
+    """)
+
+
+# Sıra değiştirilmez; yeni değişiklikler listenin sonuna eklenir
+GOCLER = [
+    tablolari_olustur,
+    indeksleri_olustur,
+    manifest_tablosunu_olustur,
+    malik_sn_tablosunu_olustur,
+    rapor_onbellegi_tablolarini_olustur,
+]
+
+SEMA_SURUMU = len(GOCLER)
+
+
+def sema_surumu(db_path):
+    """Veritabanında kayıtlı şema sürümünü döndürür"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def sema_guncelle(db_path="veritabani.db"):
+    """
+    Bekleyen göçleri tek işlemde uygular ve şema sürümünü PRAGMA user_version'a yazar
+
+    Returns:
+        bool: Şema güncel ise True
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    cursor = conn.cursor()
+    try:
+        # Arka planda yazılırken arayüzün okuyabilmesi için WAL günlüğü (kalıcı ayardır)
+        if cursor.execute("PRAGMA journal_mode").fetchone()[0] != 'wal':
+            cursor.execute("PRAGMA journal_mode=WAL")
+
+        surum = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if surum >= SEMA_SURUMU:
+            return True
+
+        cursor.execute("BEGIN IMMEDIATE")
+        # Başka bir bağlantı aynı anda güncellemiş olabilir
+        surum = cursor.execute("PRAGMA user_version").fetchone()[0]
+        for numara in range(surum, SEMA_SURUMU):
+            GOCLER[numara](cursor)
+            logging.info(f"Şema göçü uygulandı: {numara + 1}")
+        cursor.execute(f"PRAGMA user_version = {max(surum, SEMA_SURUMU)}")
+        cursor.execute("COMMIT")
+        return True
+
+    except Exception as e:
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        logging.error(f"Şema güncelleme hatası: {str(e)}")
+        return False
+    finally:
+        conn.close()